@@ -0,0 +1,98 @@
+"""Local mock of the Enea portal serving realistic month payloads, with configurable latency and size."""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from calendar import monthrange
+from datetime import date
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from pytest_httpserver import HTTPServer
+from werkzeug import Response
+
+from benchmarks.sanitizer import HEADER
+from enea_client.client import DATA_PATH, LOGIN_PATH
+
+if TYPE_CHECKING:
+    from werkzeug import Request
+
+class MockPortal:
+    """Serves the login pages and CSV data of every requested month or day after latency seconds.
+
+    Payloads hold every hour of the requested period, repeated scale times for larger responses.
+    Requests are handled in parallel, like by the real portal.
+    """
+
+    def __init__(self, latency: float = 0.0, scale: int = 1) -> None:
+        self.latency = latency
+        self.scale = scale
+        self.server = HTTPServer(threaded=True)
+        self._payloads: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return self.server.url_for("").rstrip("/")
+
+    def start(self) -> None:
+        # Access logs of every request would distort timings
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        self.server.expect_request(LOGIN_PATH, method="GET").respond_with_handler(self._login_page)
+        self.server.expect_request(LOGIN_PATH, method="POST").respond_with_handler(self._sign_in)
+        self.server.expect_request(DATA_PATH, method="POST").respond_with_handler(self._data)
+        self.server.start()
+
+    def stop(self) -> None:
+        self.server.clear()
+
+        if self.server.is_running():
+            self.server.stop()
+
+    def payload(self, date_label: str) -> bytes:
+        """JSON response for a month (MM.YYYY) or a day (DD.MM.YYYY), built once and kept for later requests."""
+        with self._lock:
+            if date_label not in self._payloads:
+                data = self.raw_data(date_label, self.scale)
+                self._payloads[date_label] = json.dumps({"success": 1, "data": data}).encode()
+
+            return self._payloads[date_label]
+
+    @staticmethod
+    def raw_data(date_label: str, scale: int = 1) -> str:
+        """Raw portal CSV with every hour of the period, without the extra hour of DST changes."""
+        parts = [int(part) for part in date_label.split(".")]
+
+        if len(parts) == 3: # noqa: PLR2004
+            days = [date(parts[2], parts[1], parts[0])]
+        else:
+            days = [date(parts[1], parts[0], day) for day in range(1, monthrange(parts[1], parts[0])[1] + 1)]
+
+        rows = [
+            f'\u0000"=""{day.isoformat()} {hour:02d}:59"""\u0000;"0,{(day.day * 24 + hour) % 1000:03d}";"0";'
+            f'"0,{(day.day * 24 + hour) % 997:03d}";"1,25"\n'
+            for day in days
+            for hour in range(24)
+        ]
+
+        return HEADER + "".join(rows * scale)
+
+    def _login_page(self, _request: Request) -> Response:
+        time.sleep(self.latency)
+
+        return Response(
+            '<input type="hidden" name="token" value="token-123">',
+            headers={"Set-Cookie": "SESSION=unsigned; Path=/; HttpOnly"},
+        )
+
+    def _sign_in(self, _request: Request) -> Response:
+        time.sleep(self.latency)
+
+        return Response("", status=HTTPStatus.FOUND, headers={"Set-Cookie": "SESSION=signed; Path=/; HttpOnly"})
+
+    def _data(self, request: Request) -> Response:
+        time.sleep(self.latency)
+
+        return Response(self.payload(request.form["date"]), content_type="application/json")
@@ -0,0 +1,173 @@
+"""Benchmark the download pipeline and its stages against a local mock portal.
+
+Run with: python -m benchmarks.pipeline [--latency 0.05] [--scale 1] [--output results.json] [--compare baseline.json]
+
+Results are JSON with the best time and the peak traced memory of every benchmark, so results of two versions
+can be compared. Peak memory includes the mock portal, which runs in the same process.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+from dataclasses import replace
+from datetime import datetime, timezone
+from functools import partial
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks.mock_portal import MockPortal
+from benchmarks.sanitizer import measure
+from enea_client.app import App
+from enea_client.batch import Batch
+from enea_client.config import Config
+from enea_client.utils.file_store import FileStore
+from enea_client.utils.parser import Parser
+from enea_client.utils.sanitizer import Sanitizer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DATE = "01.2025"
+DATES = [f"{month:02d}.2025" for month in range(1, 13)]
+PODS = [f"pod-guid-{number}" for number in range(1, 5)]
+
+def package_version() -> str:
+    try:
+        return version("enea-client")
+    except PackageNotFoundError:
+        return "unknown"
+
+def in_output_dir(config: Config, run: Callable[[Config], None]) -> None:
+    """Run with a fresh output directory, so every repetition writes all files."""
+    with tempfile.TemporaryDirectory() as directory:
+        run(replace(config, output_dir=directory))
+
+def run_app(config: Config) -> None:
+    App(config).call()
+
+def run_batch(config: Config) -> None:
+    pod_configs = []
+
+    for pod_guid in PODS:
+        output_dir = Path(config.output_dir) / pod_guid
+        output_dir.mkdir()
+        pod_configs.append(replace(config, enea_pod_guid=pod_guid, output_dir=str(output_dir)))
+
+    Batch([pod_configs[:2], pod_configs[2:]], parallelism=2).call()
+
+def benchmarks(config: Config, portal: MockPortal) -> dict[str, tuple[Callable[[], object], int]]:
+    """Benchmarks with the number of bytes processed by a single run, received from the portal or in memory."""
+    raw_data = portal.raw_data(DATE, portal.scale)
+    sanitized_data = Sanitizer.call(raw_data)
+    # Repeated hours of scaled payloads would be parsed as DST changes
+    parser_data = Sanitizer.call(portal.raw_data(DATE))
+    month_bytes = len(portal.payload(DATE))
+    year_bytes = sum(len(portal.payload(date)) for date in DATES)
+
+    def store_file() -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            FileStore.call(replace(config, output_dir=directory), DATE, sanitized_data)
+
+    return {
+        "sanitizer_call": (partial(Sanitizer.call, raw_data), len(raw_data.encode())),
+        "parser_call": (partial(Parser.call, parser_data, config.enea_timezone), len(parser_data.encode())),
+        "file_store_call": (store_file, len(sanitized_data.encode())),
+        "app_call": (partial(in_output_dir, replace(config, dates=[DATE]), run_app), month_bytes),
+        "app_call_dates": (partial(in_output_dir, config, run_app), year_bytes),
+        "app_call_dates_concurrent": (partial(in_output_dir, replace(config, concurrency=4), run_app), year_bytes),
+        "app_call_dates_stream": (partial(in_output_dir, replace(config, stream=True), run_app), year_bytes),
+        "batch_pods": (
+            partial(in_output_dir, replace(config, dates=DATES[:3]), run_batch),
+            len(PODS) * sum(len(portal.payload(date)) for date in DATES[:3]),
+        ),
+    }
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+    """Ratios of the results to the baseline, above 1 where this version is slower or uses more memory."""
+    return {
+        name: {
+            "seconds_ratio": result["seconds"] / baseline[name]["seconds"],
+            "peak_bytes_ratio": result["peak_bytes"] / baseline[name]["peak_bytes"],
+        }
+        for name, result in results.items()
+        if name in baseline and baseline[name]["seconds"] and baseline[name]["peak_bytes"]
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the download pipeline against a local mock portal")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock portal waits before responding")
+    parser.add_argument("--scale", type=int, default=1, help="Number of times every month payload is repeated")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of every benchmark")
+    parser.add_argument("--output", help="File to write the results to instead of standard output")
+    parser.add_argument("--compare", help="Results of a previous version to compare with")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        help="Exit with an error if any time or peak memory grew by more than this fraction of the baseline",
+    )
+    args = parser.parse_args()
+
+    portal = MockPortal(latency=args.latency, scale=args.scale)
+    portal.start()
+
+    try:
+        config = Config(
+            dates=DATES,
+            enea_login="benchmark@example.com",
+            enea_password="benchmark", # noqa: S106
+            enea_pod_guid=PODS[0],
+            enea_url=portal.url,
+            output_dir="",
+            retries=0,
+        )
+        results = {}
+
+        for name, (function, received_bytes) in benchmarks(config, portal).items():
+            result = measure(function, args.repeat)
+            result["bytes_per_second"] = received_bytes / result["seconds"]
+            results[name] = result
+    finally:
+        portal.stop()
+
+    report: dict[str, object] = {
+        "version": package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "parameters": {"latency": args.latency, "scale": args.scale},
+        "results": results,
+    }
+    regressions = []
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+
+        if baseline["parameters"] != report["parameters"]:
+            sys.exit(f"Baseline parameters differ: {baseline['parameters']}")
+
+        comparison = compare(results, baseline["results"])
+        report["comparison"] = comparison
+
+        if args.max_regression is not None:
+            regressions = [
+                name for name, ratios in comparison.items()
+                if max(ratios.values()) > 1 + args.max_regression
+            ]
+
+    output = json.dumps(report, indent=2) + "\n"
+
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        sys.stdout.write(output)
+
+    if regressions:
+        sys.exit(f"Regressions: {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare the streaming sanitizer with the previous three pass regex implementation.
+
+Run with: python -m benchmarks.sanitizer
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from enea_client.utils.sanitizer import Sanitizer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+HEADER = (
+    'Data;"Wolumen energii elektrycznej pobranej z\n'
+    'sieci przed bilansowaniem godzinowym";'
+    '"Wolumen energii elektrycznej oddanej\n'
+    'do sieci przed bilansowaniem godzinowym";'
+    '"Wolumen energii elektrycznej pobranej z\n'
+    'sieci po bilansowaniu godzinowym";'
+    '"Wolumen energii elektrycznej oddanej\n'
+    'do sieci po bilansowaniu godzinowym"\n'
+)
+
+def legacy_sanitizer(data: str) -> str:
+    data = re.sub(r'^.*"---".*\n?', "", data, flags=re.MULTILINE)
+    data = re.sub(r'(\u0000|"="|""\u0000)', "", data)
+    return re.sub(r"(?<=\d),(?=\d)", ".", data)
+
+def legacy_file(input_path: Path, output_path: Path) -> None:
+    output_path.write_text(legacy_sanitizer(input_path.read_text(encoding="utf-8")), encoding="utf-8")
+
+def streaming_file(input_path: Path, output_path: Path) -> None:
+    with input_path.open(encoding="utf-8", newline="\n") as input_file, \
+            output_path.open("w", encoding="utf-8", newline="\n") as output_file:
+        Sanitizer.write(input_file, output_file)
+
+def synthetic_data(years: int) -> str:
+    """Raw portal CSV with hourly rows, including placeholder rows for the last day."""
+    start = datetime(2020, 1, 1) # noqa: DTZ001
+    hours = years * 365 * 24
+    rows = [HEADER]
+
+    for hour in range(hours):
+        timestamp = (start + timedelta(hours=hour)).strftime("%Y-%m-%d %H:59")
+
+        if hour >= hours - 24:
+            rows.append(f'\u0000"=""{timestamp}"""\u0000;"---";"---";"---";"---"\n')
+        else:
+            rows.append(f'\u0000"=""{timestamp}"""\u0000;"0,{hour % 1000:03d}";"0";"0,{hour % 997:03d}";"1,25"\n')
+
+    return "".join(rows)
+
+def measure(function: Callable[[], object], repeat: int) -> dict[str, float]:
+    timings = []
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_bytes": peak}
+
+def main() -> None:
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = Path(directory) / "input.csv"
+        legacy_path = Path(directory) / "legacy.csv"
+        streaming_path = Path(directory) / "streaming.csv"
+
+        for years in (1, 3, 5):
+            data = synthetic_data(years)
+            input_path.write_text(data, encoding="utf-8")
+
+            result = {
+                "years": years,
+                "input_bytes": input_path.stat().st_size,
+                "in_memory": {
+                    "legacy": measure(partial(legacy_sanitizer, data), repeat=5),
+                    "streaming": measure(partial(Sanitizer.call, data), repeat=5),
+                },
+                "file_to_file": {
+                    "legacy": measure(lambda: legacy_file(input_path, legacy_path), repeat=5),
+                    "streaming": measure(lambda: streaming_file(input_path, streaming_path), repeat=5),
+                },
+            }
+
+            if legacy_path.read_bytes() != streaming_path.read_bytes():
+                sys.exit(f"Output mismatch for {years} years of data")
+
+            results.append(result)
+
+    sys.stdout.write(json.dumps(results, indent=2) + "\n")
+
+if __name__ == "__main__":
+    main()
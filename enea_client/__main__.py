@@ -1,13 +1,16 @@
+# Only modules needed to parse arguments are imported here, the application is imported once they are valid,
+# so --help and invalid arguments return quickly and every run imports only the modules of its stages
 import argparse
-import logging
 import os
 import sys
+from typing import TYPE_CHECKING
 
-from enea_client.app import App
-from enea_client.config import Config
+from enea_client.choices import COMPACT_GROUPS, OUTPUT_STORES
 
+if TYPE_CHECKING:
+    from enea_client.config import Config
 
-def main() -> None:
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Fetch CSV from enea portal")
     parser.add_argument(
         "--enea-login",
@@ -32,18 +35,213 @@ def main() -> None:
     parser.add_argument(
         "--dates",
         default=os.getenv("ENEA_CLIENT_DATE"),
-        help="Dates in format MM.YYYY, separated by commas (env: ENEA_CLIENT_DATE)",
+        help="Comma-separated months: MM.YYYY, MM.YYYY..MM.YYYY, last:N, since:YYYY-MM-DD (env: ENEA_CLIENT_DATE)",
     )
     parser.add_argument(
         "--post-process-script",
         default=os.getenv("ENEA_CLIENT_POST_PROCESS_SCRIPT"),
         help="Path to post-processing script (env: ENEA_CLIENT_POST_PROCESS_SCRIPT)",
     )
+    parser.add_argument(
+        "--plugins",
+        default=os.getenv("ENEA_CLIENT_PLUGINS", ""),
+        help="Comma-separated post-processing plugins, entry point names or module:attribute paths "
+        "(env: ENEA_CLIENT_PLUGINS)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=os.getenv("ENEA_CLIENT_CONCURRENCY", "1"),
+        help="Number of months downloaded in parallel (env: ENEA_CLIENT_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=os.getenv("ENEA_CLIENT_RETRIES", "3"),
+        help="Number of retries of a failed request, with exponential backoff (env: ENEA_CLIENT_RETRIES)",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=os.getenv("ENEA_CLIENT_REQUESTS_PER_SECOND", "0"),
+        help="Maximum number of requests per second, 0 for no limit (env: ENEA_CLIENT_REQUESTS_PER_SECOND)",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="For the current month download only days after the last stored hour",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream responses through the sanitizer into the output files with flat memory usage",
+    )
+    parser.add_argument(
+        "--normalize-timestamps",
+        action="store_true",
+        help="Add a column with the ISO 8601 start of every hour, including its UTC offset",
+    )
+    parser.add_argument(
+        "--session-cache",
+        default=os.getenv("ENEA_CLIENT_SESSION_CACHE"),
+        help="File to keep the signed session in between runs, to skip logging in (env: ENEA_CLIENT_SESSION_CACHE)",
+    )
+    parser.add_argument(
+        "--fsync",
+        action="store_true",
+        help="Flush every written file to disk before moving it into place",
+    )
+    parser.add_argument(
+        "--response-cache",
+        default=os.getenv("ENEA_CLIENT_RESPONSE_CACHE"),
+        help="Directory to keep compressed portal responses in, responses of periods past the settle window are "
+        "read from it instead of the portal (env: ENEA_CLIENT_RESPONSE_CACHE)",
+    )
+    parser.add_argument(
+        "--settle-days",
+        type=int,
+        default=os.getenv("ENEA_CLIENT_SETTLE_DAYS", "14"),
+        help="Days after the end of a month or day before its data is treated as final and served from the "
+        "response cache (env: ENEA_CLIENT_SETTLE_DAYS)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Read all responses from the response cache without connecting to the portal, requires "
+        "--response-cache",
+    )
+    parser.add_argument(
+        "--output-format",
+        default=os.getenv("ENEA_CLIENT_OUTPUT_FORMAT", "csv"),
+        help=f"Comma-separated output formats, CSV files are always written: csv, {', '.join(OUTPUT_STORES)} "
+        "(env: ENEA_CLIENT_OUTPUT_FORMAT)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=os.getenv("ENEA_CLIENT_METRICS_FILE"),
+        help="File to save the JSON summary of stage timings, bytes and rows to (env: ENEA_CLIENT_METRICS_FILE)",
+    )
+    parser.add_argument(
+        "--prometheus-file",
+        default=os.getenv("ENEA_CLIENT_PROMETHEUS_FILE"),
+        help="File to save metrics to for the Prometheus textfile collector (env: ENEA_CLIENT_PROMETHEUS_FILE)",
+    )
+    parser.add_argument(
+        "--home-assistant-config-dir",
+        default=os.getenv("ENEA_CLIENT_HOME_ASSISTANT_CONFIG_DIR"),
+        help="Home Assistant config directory to save the import file to (env: ENEA_CLIENT_HOME_ASSISTANT_CONFIG_DIR)",
+    )
+    parser.add_argument(
+        "--home-assistant-file-name",
+        default=os.getenv("ENEA_CLIENT_HOME_ASSISTANT_FILE_NAME", "enea_client.csv"),
+        help="Name of the Home Assistant import file (env: ENEA_CLIENT_HOME_ASSISTANT_FILE_NAME)",
+    )
+    parser.add_argument(
+        "--home-assistant-url",
+        default=os.getenv("ENEA_CLIENT_HOME_ASSISTANT_URL"),
+        help="Home Assistant URL used to trigger the import (env: ENEA_CLIENT_HOME_ASSISTANT_URL)",
+    )
+    parser.add_argument(
+        "--home-assistant-token",
+        default=os.getenv("ENEA_CLIENT_HOME_ASSISTANT_TOKEN"),
+        help="Home Assistant long-lived access token (env: ENEA_CLIENT_HOME_ASSISTANT_TOKEN)",
+    )
+    parser.add_argument(
+        "--home-assistant-import-sensor",
+        default=os.getenv("ENEA_CLIENT_HOME_ASSISTANT_IMPORT_SENSOR", "sensor.grid_import_energy"),
+        help="Statistic id for imported energy (env: ENEA_CLIENT_HOME_ASSISTANT_IMPORT_SENSOR)",
+    )
+    parser.add_argument(
+        "--home-assistant-export-sensor",
+        default=os.getenv("ENEA_CLIENT_HOME_ASSISTANT_EXPORT_SENSOR", "sensor.grid_export_energy"),
+        help="Statistic id for exported energy (env: ENEA_CLIENT_HOME_ASSISTANT_EXPORT_SENSOR)",
+    )
+    parser.add_argument(
+        "--batch-config",
+        default=os.getenv("ENEA_CLIENT_BATCH_CONFIG"),
+        help="Path to JSON file with many accounts and PODs (env: ENEA_CLIENT_BATCH_CONFIG)",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Skip complete months already on disk and pass only changed files to post-processing",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Print daily and monthly totals of the stored months as JSON instead of downloading, "
+        "all stored months without --dates",
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Print present, placeholder, missing and pending hours of the downloaded months as JSON instead of "
+        "downloading, all downloaded months without --dates",
+    )
+    parser.add_argument(
+        "--compact",
+        choices=COMPACT_GROUPS,
+        help="Merge the stored month files into a file per year (compacted/YYYY.csv) or a file of the POD "
+        "(compacted/POD_GUID.csv) instead of downloading",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay resident and poll the previous and the current month in sync mode",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=int,
+        default=os.getenv("ENEA_CLIENT_POLL_INTERVAL", "3600"),
+        help="Seconds between polls in daemon mode (env: ENEA_CLIENT_POLL_INTERVAL)",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
 
+    return parser
+
+def report(config: "Config", *, status: bool) -> str:
+    """Completeness status or daily and monthly totals of the stored months, as JSON."""
+    if status:
+        from datetime import datetime
+
+        from enea_client.utils.completeness_index import CompletenessIndex
+
+        return CompletenessIndex.report(config, datetime.now(config.enea_timezone).date())
+
+    from enea_client.utils.rollup_store import RollupStore
+
+    return RollupStore.summary(config)
+
+def print_report(parser: argparse.ArgumentParser, args: argparse.Namespace, config: "Config") -> None:
+    """Print the report of the POD, or the reports of every POD of a batch keyed by POD GUID."""
+    if not args.batch_config:
+        sys.stdout.write(report(config, status=args.status) + "\n")
+        return
+
+    import json
+
+    reports = {
+        pod_config.enea_pod_guid: json.loads(report(pod_config, status=args.status))
+        for pod_config in batch_pod_configs(parser, args, config)
+    }
+    sys.stdout.write(json.dumps(reports, indent=2) + "\n")
+
+def batch_pod_configs(parser: argparse.ArgumentParser, args: argparse.Namespace, config: "Config") -> list["Config"]:
+    """Config of every POD of the batch config, each with its own subdirectory of the output dir."""
+    from enea_client.batch import Batch
+
+    try:
+        batch = Batch.load(args.batch_config, config, require_dates=False)
+    except ValueError as error:
+        parser.error(str(error))
+
+    return [pod_config for account in batch.accounts for pod_config in account]
+
+def main() -> None:
+    parser = build_parser()
     args = parser.parse_args()
 
-    # Validate required fields
+    # Validate required fields, a batch config provides credentials and may provide dates and output dir
     required_fields = {
         "dates": args.dates,
         "output_dir": args.output_dir,
@@ -51,26 +249,134 @@ def main() -> None:
         "enea_password": args.enea_password,
         "enea_pod_guid": args.enea_pod_guid,
     }
+    # Daemon mode computes its own month window
+    if args.daemon:
+        del required_fields["dates"]
+
+    # Offline runs read responses from the cache only
+    if args.offline:
+        required_fields["response_cache"] = args.response_cache
+        del required_fields["enea_login"], required_fields["enea_password"]
+
+    # The summary, the status and compaction read only stored files
+    if args.summary or args.status or args.compact:
+        required_fields = {"output_dir": args.output_dir, "enea_pod_guid": args.enea_pod_guid}
+
     missing = [name for name, value in required_fields.items() if not value]
-    if missing:
+    if missing and not args.batch_config:
         parser.error(f"Missing required arguments: {', '.join(missing)}")
 
+    # PODs of a batch share one post-processing script run, plugins would be created for every POD
+    if args.batch_config and args.plugins:
+        parser.error("--plugins cannot be used with --batch-config, use --post-process-script instead")
+
+    # The daemon polls a single POD, a batch runs once
+    if args.batch_config and args.daemon:
+        parser.error("--daemon cannot be used with --batch-config, run a daemon per POD instead")
+
+    output_formats = [output_format for output_format in args.output_format.split(",") if output_format != "csv"]
+    unknown_formats = [output_format for output_format in output_formats if output_format not in OUTPUT_STORES]
+    if unknown_formats:
+        parser.error(f"Unknown output formats: {', '.join(unknown_formats)}")
+
+    import logging
+    from datetime import datetime
+
+    from enea_client.config import Config
+    from enea_client.utils.month import plan_dates
+
     # Create a config object
     config = Config(
         dates=args.dates.split(",") if args.dates else [],
-        output_dir=args.output_dir,
-        enea_login=args.enea_login,
-        enea_password=args.enea_password,
-        enea_pod_guid=args.enea_pod_guid,
+        output_dir=args.output_dir or "",
+        enea_login=args.enea_login or "",
+        enea_password=args.enea_password or "",
+        enea_pod_guid=args.enea_pod_guid or "",
         post_process_script=args.post_process_script,
+        plugins=[plugin for plugin in args.plugins.split(",") if plugin],
+        concurrency=args.concurrency,
+        retries=args.retries,
+        requests_per_second=args.requests_per_second,
+        sync=args.sync,
+        delta=args.delta,
+        stream=args.stream,
+        normalize_timestamps=args.normalize_timestamps,
+        fsync=args.fsync,
+        session_cache=args.session_cache,
+        response_cache=args.response_cache,
+        settle_days=args.settle_days,
+        offline=args.offline,
+        output_formats=output_formats,
+        metrics_file=args.metrics_file,
+        prometheus_file=args.prometheus_file,
+        home_assistant_config_dir=args.home_assistant_config_dir,
+        home_assistant_file_name=args.home_assistant_file_name,
+        home_assistant_url=args.home_assistant_url,
+        home_assistant_token=args.home_assistant_token,
+        home_assistant_import_sensor=args.home_assistant_import_sensor,
+        home_assistant_export_sensor=args.home_assistant_export_sensor,
+        poll_interval=args.poll_interval,
     )
 
+    # Expand date expressions into the months to download
+    try:
+        config.dates = plan_dates(config.dates, datetime.now(config.enea_timezone).date())
+    except ValueError as error:
+        parser.error(str(error))
+
     # Set up logging
     logging.basicConfig(
         stream=sys.stdout,
         level=logging.DEBUG if args.verbose else logging.INFO,
     )
 
+    run(parser, args, config)
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace, config: "Config") -> None:
+    """Run the mode selected by the arguments."""
+    if args.summary or args.status:
+        print_report(parser, args, config)
+        return
+
+    if args.compact:
+        from enea_client.utils.compactor import Compactor
+
+        for pod_config in batch_pod_configs(parser, args, config) if args.batch_config else [config]:
+            Compactor.call(pod_config, args.compact)
+        return
+
+    if config.plugins:
+        from enea_client.utils.plugins import load_plugin
+
+        try:
+            for name in config.plugins:
+                load_plugin(name)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.batch_config:
+        from enea_client.batch import Batch
+
+        try:
+            batch = Batch.load(args.batch_config, config)
+        except ValueError as error:
+            parser.error(str(error))
+
+        batch.call()
+        return
+
+    if args.daemon:
+        import signal
+
+        from enea_client.daemon import Daemon
+
+        daemon = Daemon(config)
+        signal.signal(signal.SIGTERM, lambda _signal, _frame: daemon.stop())
+        daemon.call()
+        return
+
+    from enea_client.app import App
+
     app = App(config)
     app.call()
 
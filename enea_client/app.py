@@ -1,48 +1,379 @@
 from __future__ import annotations
 
+import http.client as http_client
 import logging
-import subprocess
+from dataclasses import dataclass
+from datetime import date as date_type
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
-from enea_client.client import Client
+from enea_client.choices import OUTPUT_STORES
+from enea_client.client import Client, ResponseError
+from enea_client.utils.completeness_index import CompletenessBuilder, CompletenessIndex
 from enea_client.utils.file_store import FileStore
+from enea_client.utils.metrics import ROW_PATTERN, Metrics
+from enea_client.utils.month import is_closed, last_hour
+from enea_client.utils.month_merger import MonthMerger
+from enea_client.utils.parser import HourlyData, Parser
+from enea_client.utils.rollup_store import RollupStore
 from enea_client.utils.sanitizer import Sanitizer
+from enea_client.utils.state_store import MonthStateBuilder, StateStore
+from enea_client.utils.time_normalizer import TimeNormalizer
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
     from enea_client.config import Config
+    from enea_client.utils.file_store import StoreResult
+    from enea_client.utils.plugins import Plugin
+    from enea_client.utils.state_store import MonthState
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class DateResult:
+    date: str
+    file_path: Path | None = None
+    changed: bool = False
+    hourly_data: HourlyData | None = None
+
 class App:
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, metrics: Metrics | None = None) -> None:
         self.config = config
+        self.metrics = metrics or Metrics()
+        self.state_store: StateStore | None = None
+        self.completeness_index: CompletenessIndex | None = None
+        self.plugins: list[Plugin] = []
+
+        if config.post_process_script or config.plugins:
+            from enea_client.utils.plugins import load_plugins
+
+            self.plugins = load_plugins(config)
 
     def call(self) -> None:
-        client = Client(self.config)
+        client = Client(self.config, metrics=self.metrics)
+
+        try:
+            if not client.authenticate():
+                logger.error("Authentication failed")
+                return
+
+            self.process(client)
+        finally:
+            client.close()
+
+    def process(self, client: Client) -> None:
+        """Download the configured dates with an authenticated client, then export them.
+
+        Plugins post-process every downloaded month while the next ones download. The metrics of the run are
+        saved at the end if a metrics or Prometheus file is configured.
+        """
+        if self.plugins:
+            from enea_client.utils.plugins import PluginRunner
+
+            plugin_runner = PluginRunner(self.plugins, self.metrics)
+
+            try:
+                results = self.download(client, plugin_runner.put)
+            finally:
+                plugin_runner.close()
+        else:
+            results = self.download(client)
+
+        if self.config.home_assistant_config_dir and results:
+            self.export_home_assistant(results)
+
+        self.metrics.save(self.config.metrics_file, self.config.prometheus_file)
+
+    def download(
+        self,
+        client: Client,
+        on_result: Callable[[DateResult], None] | None = None,
+    ) -> list[DateResult]:
+        """Download all configured dates and return results of files that changed.
+
+        Results of downloaded dates are passed to on_result in the order of config.dates as soon as they are ready.
+        """
+        # The sync state and the completeness index drive later sync runs, other runs neither read nor write them
+        if self.config.sync:
+            self.state_store = StateStore(self.config.output_dir)
+            self.completeness_index = CompletenessIndex(self.config.output_dir)
+
+        # Dates are independent, so they can be fetched in parallel. Results keep the order of config.dates.
+        if self.config.concurrency > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=self.config.concurrency) as executor:
+                results = self._collect(
+                    executor.map(lambda date: self._process_date(client, date), self.config.dates), on_result,
+                )
+        else:
+            results = self._collect((self._process_date(client, date) for date in self.config.dates), on_result)
+
+        if self.state_store is not None and self.completeness_index is not None:
+            self.state_store.save()
+            self.completeness_index.save()
+            self._update_rollups(results)
+
+        failed_dates = [result.date for result in results if result.file_path is None]
+
+        if failed_dates:
+            logger.error("Failed dates: %s", ", ".join(failed_dates))
+
+        return [result for result in results if result.file_path is not None and result.changed]
+
+    def export_home_assistant(self, results: list[DateResult]) -> None:
+        from enea_client.utils.home_assistant import HomeAssistant
+
+        home_assistant = HomeAssistant(self.config)
+
+        try:
+            if not home_assistant.call(result.hourly_data for result in results if result.hourly_data is not None):
+                logger.error("Home Assistant import failed")
+        finally:
+            home_assistant.close()
+
+    @staticmethod
+    def _collect(
+        results: Iterable[DateResult],
+        on_result: Callable[[DateResult], None] | None,
+    ) -> list[DateResult]:
+        collected_results = []
+
+        for result in results:
+            collected_results.append(result)
+
+            if on_result is not None and result.file_path is not None:
+                on_result(result)
+
+        return collected_results
+
+    def _process_date(self, client: Client, date: str) -> DateResult:
+        file_path = FileStore.path(self.config, date)
+
+        if self._is_complete(date, file_path):
+            logger.info("Skipping complete month: %s", date)
+            return DateResult(date, file_path)
+
+        self._evict_incomplete(client, date)
+
+        if self.config.stream and not self._use_delta(date, file_path):
+            return self._stream_date(client, date)
+
+        completeness_builder = CompletenessBuilder(date, self.config.enea_timezone)
+
+        try:
+            sanitized_data = self._fetch(client, date, file_path, completeness_builder)
+        except (OSError, http_client.HTTPException, ValueError) as error:
+            logger.error("Failed to retrieve data for date: %s, error - %s", date, error)
+            return DateResult(date)
+
+        if sanitized_data is None:
+            logger.error("Failed to retrieve data for date: %s", date)
+            return DateResult(date)
+
+        self.metrics.add("rows", len(ROW_PATTERN.findall(sanitized_data)), self.config.enea_pod_guid, date)
+        completeness_builder.scan(sanitized_data)
+        self._update_completeness(date, completeness_builder)
+
+        if self.state_store is not None:
+            changed = self._update_state(date, StateStore.month_state(sanitized_data))
+
+            if not changed and file_path.exists():
+                logger.info("File unchanged: %s", file_path)
+                return DateResult(date, file_path)
+
+        with self.metrics.stage("write"):
+            store_result = FileStore.call(self.config, date, sanitized_data)
+
+        hourly_data = Parser.call(sanitized_data, self.config.enea_timezone) if self._parse_data() else None
+        changed = self._changed(store_result)
+
+        if changed:
+            self._save_outputs(date, hourly_data)
+
+        return DateResult(date, store_result.path, changed=changed, hourly_data=hourly_data)
 
-        if not client.authenticate():
-            logger.error("Authentication failed")
+    def _stream_date(self, client: Client, date: str) -> DateResult:
+        """Pipe the response through the sanitizer into the output file, without holding the whole month.
+
+        Stages run interleaved, so the write stage covers the whole pipeline after reading the body.
+        """
+        month_state_builder = MonthStateBuilder()
+        completeness_builder = CompletenessBuilder(date, self.config.enea_timezone)
+        hourly_data = HourlyData(self.config.enea_timezone) if self._parse_data() else None
+
+        try:
+            with client.open_data(date, self.config.enea_pod_guid) as chunks:
+                if chunks is None:
+                    logger.error("Failed to retrieve data for date: %s", date)
+                    return DateResult(date)
+
+                pieces = Sanitizer.stream(completeness_builder.tap_raw(Sanitizer.align(chunks)), block_size=1)
+
+                if self.config.normalize_timestamps:
+                    pieces = TimeNormalizer(self.config.enea_timezone).stream(pieces)
+
+                if hourly_data is not None:
+                    pieces = Parser.tap(pieces, hourly_data)
+
+                pieces = completeness_builder.tap(self.metrics.count_rows(pieces, self.config.enea_pod_guid, date))
+
+                with self.metrics.stage("write"):
+                    store_result = FileStore.write_stream(self.config, date, month_state_builder.tap(pieces))
+        except (OSError, http_client.HTTPException, ValueError, ResponseError) as error:
+            logger.error("Failed to retrieve data for date: %s, error - %s", date, error)
+            return DateResult(date)
+
+        self._update_state(date, month_state_builder.month_state())
+        self._update_completeness(date, completeness_builder)
+        changed = self._changed(store_result)
+
+        if changed:
+            self._save_outputs(date, hourly_data)
+
+        return DateResult(date, store_result.path, changed=changed, hourly_data=hourly_data)
+
+    def _update_completeness(self, date: str, completeness_builder: CompletenessBuilder) -> None:
+        if self.completeness_index is not None:
+            self.completeness_index.set(self.config.enea_pod_guid, date, completeness_builder.month_completeness())
+
+    def _update_rollups(self, results: list[DateResult]) -> None:
+        """In sync mode, update rollups of months parsed for an exporter anyway. --summary computes the others."""
+        hourly_data = {result.date: result.hourly_data for result in results if result.hourly_data is not None}
+
+        if hourly_data:
+            RollupStore(self.config.output_dir).refresh(self.config, list(hourly_data), hourly_data)
+
+    def _parse_data(self) -> bool:
+        """Whether any configured exporter or plugin needs the parsed data."""
+        return bool(
+            self.config.home_assistant_config_dir
+            or self.config.output_formats
+            or any(plugin.parsed for plugin in self.plugins),
+        )
+
+    def _save_outputs(self, date: str, hourly_data: HourlyData | None) -> None:
+        if hourly_data is None:
             return
 
-        file_paths = []
+        for output_format in self.config.output_formats:
+            self._save_output(output_format, date, hourly_data)
+
+    def _save_output(self, output_format: str, date: str, hourly_data: HourlyData) -> None:
+        import importlib
+        import sqlite3
+
+        module_name, _, class_name = OUTPUT_STORES[output_format].partition(":")
+
+        try:
+            getattr(importlib.import_module(module_name), class_name).call(self.config, hourly_data)
+        except (OSError, sqlite3.Error) as error:
+            logger.error("Failed to save %s output for date: %s, error - %s", output_format, date, error)
+
+    def _changed(self, store_result: StoreResult) -> bool:
+        """In sync mode only files whose content changed are passed on, otherwise every downloaded file is."""
+        return store_result.changed or self.state_store is None
+
+    def _update_state(self, date: str, month_state: MonthState) -> bool:
+        """Store the month state in sync mode and return whether the content changed."""
+        if self.state_store is None:
+            return True
+
+        previous_state = self.state_store.get(self.config.enea_pod_guid, date)
+        self.state_store.set(self.config.enea_pod_guid, date, month_state)
 
-        for date in self.config.dates:
-            data = client.get_data(date)
+        return previous_state is None or previous_state["sha256"] != month_state["sha256"]
+
+    def _use_delta(self, date: str, file_path: Path) -> bool:
+        return self.config.delta and file_path.exists() and not is_closed(date, self._today())
+
+    def _fetch(
+        self,
+        client: Client,
+        date: str,
+        file_path: Path,
+        completeness_builder: CompletenessBuilder,
+    ) -> str | None:
+        if self._use_delta(date, file_path):
+            merged_data = self._fetch_days(client, file_path.read_text(encoding="utf-8"), completeness_builder)
+
+            if merged_data is not None:
+                return merged_data
+
+            logger.info("Falling back to full month download for date: %s", date)
+
+        data = client.get_data(date, self.config.enea_pod_guid)
+
+        return None if data is None else self._sanitize(data, completeness_builder)
+
+    def _fetch_days(self, client: Client, month_data: str, completeness_builder: CompletenessBuilder) -> str | None:
+        """Download only the days after the last stored hour and merge them into the month data."""
+        last_timestamp = StateStore.last_timestamp(month_data)
+
+        if not last_timestamp:
+            return None
+
+        # A partially stored day is downloaded again
+        day = date_type.fromisoformat(last_timestamp[:10])
+        if last_timestamp.endswith("23:59"):
+            day += timedelta(days=1)
+
+        days_data = []
+
+        while day <= self._today():
+            data = client.get_data(day.strftime("%d.%m.%Y"), self.config.enea_pod_guid, duration="day")
 
             if data is None:
-                logger.error("Failed to retrieve data")
-                return
+                return None
+
+            days_data.append(self._sanitize(data, completeness_builder))
+            day += timedelta(days=1)
+
+        return MonthMerger.call(month_data, days_data, self.config.enea_timezone)
+
+    def _sanitize(self, data: str, completeness_builder: CompletenessBuilder) -> str:
+        """Sanitize raw portal data, recording its placeholder hours."""
+        completeness_builder.scan_raw(data)
 
+        with self.metrics.stage("sanitize"):
             sanitized_data = Sanitizer.call(data)
 
-            file_path = FileStore.call(self.config, date, sanitized_data)
+            if self.config.normalize_timestamps:
+                time_normalizer = TimeNormalizer(self.config.enea_timezone)
+                sanitized_data = "".join(time_normalizer.stream(Sanitizer.chunks(sanitized_data)))
 
-            file_paths.append(file_path)
+        return sanitized_data
+
+    def _is_complete(self, date: str, file_path: Path) -> bool:
+        if self.state_store is None:
+            return False
+
+        month_state = self.state_store.get(self.config.enea_pod_guid, date)
+
+        # Months with gaps are downloaded again, months downloaded before the index existed are trusted
+        return (
+            month_state is not None
+            and month_state["last_timestamp"] == last_hour(date)
+            and is_closed(date, self._today())
+            and file_path.exists()
+            and (self.completeness_index is None
+                 or self.completeness_index.is_complete(self.config.enea_pod_guid, date) is not False)
+        )
+
+    def _evict_incomplete(self, client: Client, date: str) -> None:
+        """Drop the cached response of a month with gaps, so it is downloaded again instead of replayed."""
+        if (
+            client.response_cache is None
+            or self.config.offline
+            or self.completeness_index is None
+            or self.completeness_index.is_complete(self.config.enea_pod_guid, date) is not False
+        ):
+            return
 
-        # Run post-processing script if configured and data was processed
-        if self.config.post_process_script:
-            logger.info(
-                "Running post-processing script: %s, with %s files", self.config.post_process_script, file_paths,
-            )
+        logger.debug("Dropping cached response of incomplete month: %s", date)
+        client.response_cache.delete(self.config.enea_pod_guid, "month", date)
 
-            subprocess.run([self.config.post_process_script, *map(str, file_paths)], check=True) # noqa: S603
+    def _today(self) -> date_type:
+        return datetime.now(self.config.enea_timezone).date()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import urllib.parse
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from enea_client.client import DATA_PATH, LOGIN_PATH, TOKEN_PATTERN, Client
+from enea_client.utils.async_session import AsyncSession
+from enea_client.utils.request_scheduler import RequestScheduler
+
+if TYPE_CHECKING:
+    from enea_client.client import Response
+    from enea_client.config import Config
+    from enea_client.utils.async_session import AsyncResponse
+
+logger = logging.getLogger(__name__)
+
+class AsyncClient:
+    """Client with the semantics of Client for asyncio applications.
+
+    Concurrent get_data calls share a pool of pool_size keep-alive connections.
+    """
+
+    def __init__(self, config: Config, pool_size: int = 4, scheduler: RequestScheduler | None = None) -> None:
+        self.config = config
+        self.signed_cookie: str = ""
+        self.session = AsyncSession(
+            config.enea_url,
+            config.connection_timeout,
+            pool_size,
+            scheduler or RequestScheduler.from_config(config),
+        )
+        # Created on first use, so it belongs to the running event loop
+        self._authentication_lock: asyncio.Lock | None = None
+
+    async def authenticate(self) -> bool:
+        logger.info("Authenticating")
+
+        response = await self.session.request("GET", LOGIN_PATH)
+
+        if response.status != HTTPStatus.OK:
+            self._log_error(response)
+            return False
+
+        cookie = response.getheader("Set-Cookie")
+        tokens = TOKEN_PATTERN.findall(response.body.decode())
+
+        if cookie is None or not tokens:
+            logger.error("Error: No cookie")
+            return False
+
+        response = await self.session.request(
+            "POST",
+            LOGIN_PATH,
+            body=urllib.parse.urlencode({
+                "email": self.config.enea_login,
+                "password": self.config.enea_password,
+                "token": tokens[0],
+            }),
+            headers={
+                "Content-type": "application/x-www-form-urlencoded",
+                "Cookie": cookie,
+            },
+        )
+        signed_cookie = response.getheader("Set-Cookie")
+
+        if response.status != HTTPStatus.FOUND or signed_cookie is None:
+            self._log_error(response)
+            return False
+
+        self.signed_cookie = signed_cookie
+
+        return True
+
+    async def close(self) -> None:
+        await self.session.close()
+
+    async def get_data(self, date: str, pod_guid: str | None = None, duration: str = "month") -> str | None:
+        """Get CSV data for a month (date as MM.YYYY) or a single day (duration "day", date as DD.MM.YYYY)."""
+        logger.info("Getting data for date: %s", date)
+
+        signed_cookie = self.signed_cookie
+        response = await self._request_data(date, pod_guid, duration)
+
+        if response.status in Client.EXPIRED_STATUSES:
+            logger.info("Session expired, authenticating again")
+            await self._reauthenticate(signed_cookie)
+            response = await self._request_data(date, pod_guid, duration)
+
+        if response.status != HTTPStatus.OK:
+            self._log_error(response)
+            return None
+
+        parsed_body: Response = json.loads(response.body.decode())
+
+        if parsed_body.get("success") != 1:
+            logger.error("Error: message - %s", parsed_body)
+            return None
+
+        return parsed_body.get("data")
+
+    async def _reauthenticate(self, expired_cookie: str) -> None:
+        if self._authentication_lock is None:
+            self._authentication_lock = asyncio.Lock()
+
+        async with self._authentication_lock:
+            # Another task may have authenticated already
+            if self.signed_cookie == expired_cookie:
+                await self.authenticate()
+
+    async def _request_data(self, date: str, pod_guid: str | None, duration: str) -> AsyncResponse:
+        return await self.session.request(
+            "POST",
+            DATA_PATH,
+            body=urllib.parse.urlencode({
+                "duration": duration,
+                "date": date,
+                "pointOfDeliveryId": pod_guid or self.config.enea_pod_guid,
+            }),
+            headers={
+                "Content-type": "application/x-www-form-urlencoded",
+                "Cookie": self.signed_cookie,
+            },
+        )
+
+    @staticmethod
+    def _log_error(response: AsyncResponse) -> None:
+        logger.error("Error: status - %s, reason - %s", response.status, response.reason)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from enea_client.app import App
+from enea_client.client import Client
+from enea_client.utils.metrics import Metrics
+from enea_client.utils.month import plan_dates
+from enea_client.utils.plugins import ScriptPlugin
+from enea_client.utils.request_scheduler import RequestScheduler
+
+if TYPE_CHECKING:
+    from enea_client.config import Config
+
+logger = logging.getLogger(__name__)
+
+class Batch:
+    """Runs many accounts and PODs in one process, authenticating every account once."""
+
+    def __init__(
+        self,
+        accounts: list[list[Config]],
+        parallelism: int = 1,
+        post_process_script: str | None = None,
+    ) -> None:
+        self.accounts = accounts
+        self.parallelism = parallelism
+        self.post_process_script = post_process_script
+
+    @staticmethod
+    def load(path: str, config: Config, *, require_dates: bool = True) -> Batch:
+        """Build a batch from a JSON file. Values given on the command line in config take precedence over the file.
+
+        Expected format::
+
+            {
+                "output_dir": "/var/lib/enea_client",
+                "dates": ["12.2025", "since:2026-01-01"],
+                "parallelism": 2,
+                "post_process_script": "scripts/post_process_script.sh",
+                "accounts": [
+                    {"login": "first@example.com", "password": "secret", "pods": ["pod-guid-1", "pod-guid-2"]}
+                ]
+            }
+
+        Every POD is saved to its own subdirectory of output_dir. Modes reading only stored files pass
+        require_dates=False.
+        """
+        try:
+            batch_config = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as error:
+            msg = f"Cannot read batch config {path}: {error}"
+            raise ValueError(msg) from error
+
+        output_dir = config.output_dir or batch_config.get("output_dir")
+        dates = config.dates or batch_config.get("dates", [])
+        parallelism = batch_config.get("parallelism", 1)
+
+        if not output_dir or (require_dates and not dates):
+            msg = f"Batch config {path} requires output_dir and dates"
+            raise ValueError(msg)
+
+        # bool is a subclass of int, but true is no thread count
+        if not isinstance(parallelism, int) or isinstance(parallelism, bool) or parallelism < 1:
+            msg = f"Batch config {path} requires parallelism to be a positive integer, got {parallelism!r}"
+            raise ValueError(msg)
+
+        dates = plan_dates(dates, datetime.now(config.enea_timezone).date())
+
+        accounts = []
+
+        for account in batch_config.get("accounts", []):
+            if not account.get("login") or not account.get("password") or not account.get("pods"):
+                msg = f"Batch config {path} requires login, password and pods for every account"
+                raise ValueError(msg)
+
+            accounts.append([
+                replace(
+                    config,
+                    dates=dates,
+                    enea_login=account["login"],
+                    enea_password=account["password"],
+                    enea_pod_guid=pod_guid,
+                    output_dir=str(Path(output_dir) / pod_guid),
+                    post_process_script=None,
+                    home_assistant_config_dir=None,
+                )
+                for pod_guid in account["pods"]
+            ])
+
+        return Batch(
+            accounts,
+            parallelism=parallelism,
+            post_process_script=config.post_process_script or batch_config.get("post_process_script"),
+        )
+
+    def call(self) -> None:
+        # One scheduler for all accounts, so the rate limit applies to the whole batch
+        scheduler = RequestScheduler.from_config(self.accounts[0][0]) if self.accounts else None
+        metrics = Metrics()
+
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            results = list(executor.map(
+                partial(self._process_account, scheduler=scheduler, metrics=metrics), self.accounts,
+            ))
+
+        file_paths = [file_path for account_file_paths in results for file_path in account_file_paths]
+
+        # Run post-processing script once for all accounts and PODs
+        if self.post_process_script and file_paths:
+            with metrics.stage("post_process"):
+                ScriptPlugin.run(self.post_process_script, file_paths)
+
+        if self.accounts:
+            metrics.save(self.accounts[0][0].metrics_file, self.accounts[0][0].prometheus_file)
+
+    @staticmethod
+    def _process_account(
+        pod_configs: list[Config],
+        scheduler: RequestScheduler | None = None,
+        metrics: Metrics | None = None,
+    ) -> list[Path]:
+        client = Client(pod_configs[0], scheduler, metrics)
+
+        try:
+            if not client.authenticate():
+                logger.error("Authentication failed for: %s", pod_configs[0].enea_login)
+                return []
+
+            file_paths: list[Path] = []
+
+            for pod_config in pod_configs:
+                logger.info("Processing POD: %s", pod_config.enea_pod_guid)
+
+                Path(pod_config.output_dir).mkdir(parents=True, exist_ok=True)
+                results = App(pod_config, client.metrics).download(client)
+                file_paths.extend(result.file_path for result in results if result.file_path is not None)
+
+            return file_paths
+        finally:
+            client.close()
@@ -0,0 +1,12 @@
+# Choices of command line options, shared by the entry point and the modules implementing them. Kept free of
+# imports, so the entry point can validate arguments without importing the application
+
+# Output formats written alongside the CSV files, from the parsed hourly data, with the module:class of the
+# store writing each of them. Stores are imported on first use
+OUTPUT_STORES = {
+    "sqlite": "enea_client.utils.sqlite_store:SqliteStore",
+    "binary": "enea_client.utils.binary_store:BinaryStore",
+}
+
+# Groups of month files to compact into one file
+COMPACT_GROUPS = ("year", "pod")
@@ -1,29 +1,103 @@
 from __future__ import annotations
 
+import io
 import json
 import logging
 import re
+import threading
 import urllib.parse
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
 from http import HTTPStatus
 from typing import TYPE_CHECKING, TypedDict
 
-from enea_client.utils.connection import open_connection
+from enea_client.utils.json_stream import JsonStream
+from enea_client.utils.metrics import Metrics
+from enea_client.utils.request_scheduler import RequestScheduler
+from enea_client.utils.response_cache import RecordingReader, ResponseCache
+from enea_client.utils.session import Session
+from enea_client.utils.session_cache import SessionCache
 
 if TYPE_CHECKING:
+    import http.client as http_client
+    from collections.abc import Generator, Iterator
+    from contextlib import AbstractContextManager
+    from datetime import date as date_type
+
     from enea_client.config import Config
 
 logger = logging.getLogger(__name__)
 
+LOGIN_PATH = "/logowanie"
+DATA_PATH = "/meter/summaryBalancingChart/csv"
+TOKEN_PATTERN = re.compile(r'name="token" value="([^"]+)"')
+
 class Response(TypedDict, total=False):
     success: int
     data: str
 
+class ResponseError(Exception):
+    pass
+
 class Client:
-    def __init__(self, config: Config) -> None:
+    # Cheap page used to check if a cached session is still signed in, the portal redirects to login otherwise
+    VALIDATION_PATH = "/"
+    # Responses of data requests made with an expired session
+    EXPIRED_STATUSES = frozenset({HTTPStatus.FOUND, HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN})
+
+    def __init__(
+        self,
+        config: Config,
+        scheduler: RequestScheduler | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
         self.config = config
         self.signed_cookie: str = ""
+        self.metrics = metrics or Metrics()
+        self.session_cache = SessionCache(config.session_cache) if config.session_cache else None
+        self.response_cache = ResponseCache(config.response_cache) if config.response_cache else None
+
+        # A scheduler may be shared by many clients to apply one rate limit to all of them
+        self.scheduler = scheduler or RequestScheduler.from_config(config)
+        self._authentication_lock = threading.Lock()
+
+        # http.client connections are not thread-safe, so every worker thread gets its own session
+        self._local = threading.local()
+        self._sessions: list[Session] = []
+        self._sessions_lock = threading.Lock()
+
+    @property
+    def session(self) -> Session:
+        session: Session | None = getattr(self._local, "session", None)
+
+        if session is None:
+            session = Session(self.config.enea_url, self.config.connection_timeout, self.scheduler, self.metrics)
+            self._local.session = session
+
+            with self._sessions_lock:
+                self._sessions.append(session)
+
+        return session
 
     def authenticate(self) -> bool:
+        with self.metrics.stage("auth"):
+            return self._authenticate()
+
+    def close(self) -> None:
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+
+    def _authenticate(self) -> bool:
+        if self.config.offline:
+            logger.info("Offline, responses are read from the cache")
+            return True
+
+        if self._restore_session():
+            logger.info("Reusing cached session")
+            return True
+
         logger.info("Authenticating")
 
         session = self._create_session()
@@ -40,46 +114,221 @@ class Client:
 
         self.signed_cookie = signed_cookie
 
+        if self.session_cache is not None:
+            self.session_cache.set(self._session_cache_key(), signed_cookie)
+
         return True
 
-    def get_data(self, date: str) -> str | None:
+    def get_data(self, date: str, pod_guid: str | None = None, duration: str = "month") -> str | None:
+        """Get CSV data for a month (date as MM.YYYY) or a single day (duration "day", date as DD.MM.YYYY).
+
+        Raise ValueError if the response is not valid JSON.
+        """
         logger.info("Getting data for date: %s", date)
 
-        with open_connection(self.config.enea_url, self.config.connection_timeout) as connection:
-            connection.request(
-                "POST",
-                "/meter/summaryBalancingChart/csv",
-                body=urllib.parse.urlencode({
-                    "duration": "month",
-                    "date": date,
-                    "pointOfDeliveryId": self.config.enea_pod_guid,
-                }),
-                headers={
-                    "Content-type": "application/x-www-form-urlencoded",
-                    "Cookie": self.signed_cookie,
-                },
-            )
-
-            response = connection.getresponse()
+        pod_guid = pod_guid or self.config.enea_pod_guid
+        cached_body = self._cached_response(date, pod_guid, duration)
+        body = cached_body if cached_body is not None else self._read_data(date, pod_guid, duration)
 
+        if body is None:
+            return None
+
+        with self.metrics.stage("json_decode"):
+            parsed_body: Response = json.loads(body.decode())
+
+        if parsed_body.get("success") != 1:
+            logger.error("Error: message - %s", parsed_body)
+            return None
+
+        if cached_body is None and self.response_cache is not None:
+            self.response_cache.set(pod_guid, duration, date, zlib.compress(body))
+
+        return parsed_body.get("data")
+
+    @contextmanager
+    def open_data(
+        self,
+        date: str,
+        pod_guid: str | None = None,
+        duration: str = "month",
+    ) -> Generator[Iterator[str] | None, None, None]:
+        """Like get_data, but yield the CSV in chunks decoded straight from the socket.
+
+        The iterator raises ResponseError at the end if the portal reported a failure, and ValueError
+        if the response is not valid JSON.
+        """
+        logger.info("Streaming data for date: %s", date)
+
+        pod_guid = pod_guid or self.config.enea_pod_guid
+        cached_body = self._cached_response(date, pod_guid, duration)
+
+        if cached_body is not None:
+            yield self._stream_data(JsonStream(io.BytesIO(cached_body)), pod_guid, date, received=False)
+            return
+
+        if self.config.offline:
+            logger.error("Response not cached for date: %s", date)
+            yield None
+            return
+
+        with self._request_data(date, pod_guid, duration) as response:
             if response.status != HTTPStatus.OK:
                 logger.error("Error: status - %s, reason - %s", response.status, response.reason)
-                return None
+                yield None
+                return
 
-            body = response.read().decode()
-            parsed_body: Response = json.loads(body)
+            if self.response_cache is None:
+                yield self._stream_data(JsonStream(response), pod_guid, date)
+                return
+
+            reader = RecordingReader(response)
+            chunks = self._stream_data(JsonStream(reader), pod_guid, date)
+            yield self._cache_stream(chunks, reader, self.response_cache, (pod_guid, duration, date))
+
+    def _stream_data(
+        self,
+        json_stream: JsonStream,
+        pod_guid: str,
+        date: str,
+        *,
+        received: bool = True,
+    ) -> Iterator[str]:
+        """Yield the streamed CSV chunks, counting the bytes of responses received from the portal."""
+        yield from self.metrics.timed("body_read", json_stream)
+
+        if received:
+            self.metrics.add("bytes", json_stream.bytes_read, pod_guid, date)
+
+        if json_stream.values.get("success") != 1:
+            msg = f"Error: message - {json_stream.values}"
+            raise ResponseError(msg)
+
+    @staticmethod
+    def _cache_stream(
+        chunks: Iterator[str],
+        reader: RecordingReader,
+        response_cache: ResponseCache,
+        key: tuple[str, str, str],
+    ) -> Iterator[str]:
+        """Pass chunks through, caching the raw response once all of it was read without errors."""
+        yield from chunks
 
-            if parsed_body.get("success") != 1:
-                logger.error("Error: message - %s", parsed_body)
+        response_cache.set(*key, reader.compressed())
+
+    def _cached_response(self, date: str, pod_guid: str, duration: str) -> bytes | None:
+        """Cached raw response of a period past the settle window, of any period in offline mode."""
+        if self.response_cache is None:
+            return None
+
+        if not self.config.offline and not ResponseCache.is_settled(
+            duration, date, self._today(), self.config.settle_days,
+        ):
+            return None
+
+        body = self.response_cache.get(pod_guid, duration, date)
+
+        if body is not None:
+            logger.info("Using cached response for date: %s", date)
+
+        return body
+
+    def _read_data(self, date: str, pod_guid: str, duration: str) -> bytes | None:
+        if self.config.offline:
+            logger.error("Response not cached for date: %s", date)
+            return None
+
+        with self._request_data(date, pod_guid, duration) as response:
+            if response.status != HTTPStatus.OK:
+                logger.error("Error: status - %s, reason - %s", response.status, response.reason)
                 return None
 
-            return parsed_body.get("data")
+            with self.metrics.stage("body_read"):
+                body = response.read()
 
-    def _create_session(self) -> tuple[str, str] | None:
-        with open_connection(self.config.enea_url, self.config.connection_timeout) as connection:
-            connection.request("GET", "/logowanie")
-            response = connection.getresponse()
+        self.metrics.add("bytes", len(body), pod_guid, date)
+
+        return body
+
+    def _today(self) -> date_type:
+        return datetime.now(self.config.enea_timezone).date()
+
+    @contextmanager
+    def _request_data(
+        self,
+        date: str,
+        pod_guid: str | None,
+        duration: str,
+    ) -> Generator[http_client.HTTPResponse, None, None]:
+        """Request data, authenticating again once if the session has expired meanwhile."""
+        signed_cookie = self.signed_cookie
+
+        with self._send_data_request(date, pod_guid, duration) as response:
+            if response.status not in self.EXPIRED_STATUSES:
+                yield response
+                return
+
+        logger.info("Session expired, authenticating again")
+        self._reauthenticate(signed_cookie)
+
+        with self._send_data_request(date, pod_guid, duration) as response:
+            yield response
+
+    def _reauthenticate(self, expired_cookie: str) -> None:
+        with self._authentication_lock:
+            # Another thread may have authenticated already
+            if self.signed_cookie != expired_cookie:
+                return
 
+            if self.session_cache is not None:
+                self.session_cache.delete(self._session_cache_key())
+
+            self.authenticate()
+
+    def _send_data_request(
+        self,
+        date: str,
+        pod_guid: str | None,
+        duration: str,
+    ) -> AbstractContextManager[http_client.HTTPResponse]:
+        return self.session.request(
+            "POST",
+            DATA_PATH,
+            body=urllib.parse.urlencode({
+                "duration": duration,
+                "date": date,
+                "pointOfDeliveryId": pod_guid or self.config.enea_pod_guid,
+            }),
+            headers={
+                "Content-type": "application/x-www-form-urlencoded",
+                "Cookie": self.signed_cookie,
+            },
+        )
+
+    def _restore_session(self) -> bool:
+        """Use the cached signed cookie if the portal still accepts it."""
+        if self.session_cache is None:
+            return False
+
+        cookie = self.session_cache.get(self._session_cache_key())
+
+        if cookie is None:
+            return False
+
+        with self.session.request("GET", self.VALIDATION_PATH, headers={"Cookie": cookie}) as response:
+            if response.status != HTTPStatus.OK:
+                logger.info("Cached session rejected: status - %s", response.status)
+                self.session_cache.delete(self._session_cache_key())
+                return False
+
+        self.signed_cookie = cookie
+
+        return True
+
+    def _session_cache_key(self) -> str:
+        return f"{self.config.enea_login} {self.config.enea_url}"
+
+    def _create_session(self) -> tuple[str, str] | None:
+        with self.session.request("GET", LOGIN_PATH) as response:
             if response.status != HTTPStatus.OK:
                 logger.error("Error: status - %s, reason - %s", response.status, response.reason)
                 return None
@@ -91,27 +340,24 @@ class Client:
                 return None
 
             body = response.read().decode()
-            token = re.findall(r'name="token" value="([^"]+)"', body)[0]
+            token = TOKEN_PATTERN.findall(body)[0]
 
             return cookie, token
 
     def _sign_session(self, cookie: str, token: str) -> str | None:
-        with open_connection(self.config.enea_url, self.config.connection_timeout) as connection:
-            connection.request(
-                "POST",
-                "/logowanie",
-                body=urllib.parse.urlencode({
-                    "email": self.config.enea_login,
-                    "password": self.config.enea_password,
-                    "token": token,
-                }),
-                headers={
-                    "Content-type": "application/x-www-form-urlencoded",
-                    "Cookie": cookie,
-                },
-            )
-            response = connection.getresponse()
-
+        with self.session.request(
+            "POST",
+            LOGIN_PATH,
+            body=urllib.parse.urlencode({
+                "email": self.config.enea_login,
+                "password": self.config.enea_password,
+                "token": token,
+            }),
+            headers={
+                "Content-type": "application/x-www-form-urlencoded",
+                "Cookie": cookie,
+            },
+        ) as response:
             if response.status != HTTPStatus.FOUND:
                 logger.error("Error: status - %s, reason - %s", response.status, response.reason)
                 return None
@@ -12,7 +12,32 @@ class Config:
     enea_pod_guid: str
     output_dir: str
     post_process_script: str | None = None
+    sync: bool = False
+    delta: bool = False
+    stream: bool = False
+    normalize_timestamps: bool = False
+    fsync: bool = False
+    session_cache: str | None = None
+    response_cache: str | None = None
+    settle_days: int = 14
+    offline: bool = False
+    output_formats: list[str] = field(default_factory=list)
+    plugins: list[str] = field(default_factory=list)
+    metrics_file: str | None = None
+    prometheus_file: str | None = None
 
+    home_assistant_config_dir: str | None = None
+    home_assistant_file_name: str = "enea_client.csv"
+    home_assistant_url: str | None = None
+    home_assistant_token: str | None = None
+    home_assistant_import_sensor: str = "sensor.grid_import_energy"
+    home_assistant_export_sensor: str = "sensor.grid_export_energy"
+
+    concurrency: int = 1
+    poll_interval: int = 3600
     connection_timeout: int = 60
+    retries: int = 3
+    retry_backoff: float = 1.0
+    requests_per_second: float = 0.0
     enea_url: str = "https://ebok.enea.pl"
     enea_timezone: ZoneInfo = field(default_factory=lambda: ZoneInfo("Europe/Warsaw"))
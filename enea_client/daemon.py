@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import replace
+from datetime import date as date_type
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from enea_client.app import App
+from enea_client.client import Client
+from enea_client.utils.completeness_index import CompletenessIndex
+from enea_client.utils.metrics import Metrics
+from enea_client.utils.month import format_month, last_hour, parse_month
+from enea_client.utils.state_store import StateStore
+
+if TYPE_CHECKING:
+    from enea_client.config import Config
+
+logger = logging.getLogger(__name__)
+
+class Daemon:
+    """Stays resident and polls the previous and the current month in sync mode every poll interval.
+
+    The client, with its session and keep-alive connection, is kept between polls, and a poll is skipped
+    without any request while all hours the portal can have published are already stored. Metrics
+    files describe the last poll.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = replace(config, sync=True)
+        self.metrics = Metrics()
+        self._stopped = threading.Event()
+
+    def call(self) -> None:
+        client = Client(self.config, metrics=self.metrics)
+
+        logger.info("Polling every %s seconds", self.config.poll_interval)
+
+        try:
+            while True:
+                # A failed poll, like a portal outage or a full disk, is retried in the next interval
+                try:
+                    self.poll(client)
+                except Exception:
+                    logger.exception("Poll failed")
+
+                if self._stopped.wait(self.config.poll_interval):
+                    return
+        finally:
+            client.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def poll(self, client: Client) -> None:
+        self.metrics.reset()
+        dates = self.pending_dates()
+
+        if not dates:
+            logger.info("No new hours expected")
+            return
+
+        if not client.signed_cookie and not client.authenticate():
+            logger.error("Authentication failed")
+            return
+
+        App(replace(self.config, dates=dates), self.metrics).process(client)
+
+    def pending_dates(self) -> list[str]:
+        """Months of the window with hours published by the portal but not stored yet.
+
+        The portal publishes whole days, so hours up to the end of yesterday are expected. Months with
+        missing or placeholder hours in the completeness index are pending too, until the portal fills the gaps.
+        """
+        today = self._today()
+        state_store = StateStore(self.config.output_dir)
+        completeness_index = CompletenessIndex(self.config.output_dir)
+        expected_timestamp = (
+            datetime.combine(today, datetime.min.time()) - timedelta(minutes=1)
+        ).strftime("%Y-%m-%d %H:%M")
+        pending_dates = []
+
+        for date in self.window(today):
+            year, month = parse_month(date)
+            month_state = state_store.get(self.config.enea_pod_guid, date)
+            last_timestamp = month_state["last_timestamp"] if month_state is not None else ""
+
+            # Nothing of the month can be published before its first day is over
+            if expected_timestamp < f"{year}-{month:02d}-01 23:59":
+                continue
+
+            month_status = completeness_index.status(
+                self.config.enea_pod_guid, date, self.config.enea_timezone, today,
+            )
+
+            gaps = month_status["missing"] + month_status["placeholder"] if month_status is not None else 0
+
+            if last_timestamp < min(expected_timestamp, last_hour(date)) or gaps:
+                pending_dates.append(date)
+
+        return pending_dates
+
+    @staticmethod
+    def window(today: date_type) -> list[str]:
+        """The previous and the current month."""
+        previous_month = today.replace(day=1) - timedelta(days=1)
+
+        return [format_month(previous_month.year, previous_month.month), format_month(today.year, today.month)]
+
+    def _today(self) -> date_type:
+        return datetime.now(self.config.enea_timezone).date()
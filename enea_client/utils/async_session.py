@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import http.client as http_client
+import io
+import logging
+import ssl
+import time
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from enea_client.utils.session import MAX_TIMINGS, RequestTiming
+
+if TYPE_CHECKING:
+    from enea_client.utils.request_scheduler import RequestScheduler
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class AsyncResponse:
+    status: int
+    reason: str
+    headers: http_client.HTTPMessage
+    body: bytes
+
+    def getheader(self, name: str) -> str | None:
+        return self.headers.get(name)
+
+@dataclass
+class _Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    def close(self) -> None:
+        self.writer.close()
+
+class AsyncSession:
+    """Pool of keep-alive HTTP/1.1 connections on asyncio streams, shared by concurrent requests.
+
+    At most pool_size requests are sent at a time, idle connections are reused by the next request.
+    Response bodies are read whole.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: int,
+        pool_size: int = 4,
+        scheduler: RequestScheduler | None = None,
+    ) -> None:
+        parsed_url = urlparse(url)
+
+        self.url = url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.scheduler = scheduler
+        self.timings: deque[RequestTiming] = deque(maxlen=MAX_TIMINGS)
+        self._host = str(parsed_url.hostname)
+        self._port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+        self._ssl = ssl.create_default_context() if parsed_url.scheme == "https" else None
+        self._idle: list[_Connection] = []
+        # Created on first use, so it belongs to the running event loop
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> AsyncResponse:
+        started_at = time.perf_counter()
+        response = await self._schedule(method, path, body.encode() if body is not None else b"", headers or {})
+
+        timing = RequestTiming(method, path, response.status, time.perf_counter() - started_at)
+        self.timings.append(timing)
+        logger.debug("Request %s %s: status - %s, time - %.3fs", method, path, timing.status, timing.elapsed)
+
+        return response
+
+    async def close(self) -> None:
+        connections, self._idle = self._idle, []
+
+        for connection in connections:
+            connection.close()
+
+            with suppress(OSError):
+                await connection.writer.wait_closed()
+
+    async def _schedule(self, method: str, path: str, body: bytes, headers: dict[str, str]) -> AsyncResponse:
+        if self.scheduler is None:
+            return await self._send(method, path, body, headers)
+
+        delays = self.scheduler.delays()
+
+        while True:
+            await asyncio.sleep(self.scheduler.reserve())
+
+            try:
+                response = await self._send(method, path, body, headers)
+            except (OSError, asyncio.TimeoutError, http_client.HTTPException) as error:
+                delay = next(delays, None)
+
+                if delay is None:
+                    raise
+
+                logger.warning("Request %s %s failed: %r, retrying in %.1fs", method, path, error, delay)
+            else:
+                delay = next(delays, None) if self.scheduler.should_retry(response.status) else None
+
+                if delay is None:
+                    return response
+
+                logger.warning(
+                    "Request %s %s failed: status - %s, retrying in %.1fs", method, path, response.status, delay,
+                )
+
+            await asyncio.sleep(delay)
+
+    async def _send(self, method: str, path: str, body: bytes, headers: dict[str, str]) -> AsyncResponse:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.pool_size)
+
+        async with self._semaphore:
+            while self._idle:
+                response = await self._reuse(self._idle.pop(), method, path, body, headers)
+
+                if response is not None:
+                    return response
+
+            connection = await asyncio.wait_for(self._connect(), self.timeout)
+
+            return await self._exchange(connection, method, path, body, headers)
+
+    async def _reuse(
+        self,
+        connection: _Connection,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+    ) -> AsyncResponse | None:
+        try:
+            return await self._exchange(connection, method, path, body, headers)
+        except (OSError, http_client.HTTPException):
+            # The server may have dropped the idle connection meanwhile
+            logger.debug("Connection closed by server, reconnecting")
+            return None
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+
+        return _Connection(reader, writer)
+
+    async def _exchange(
+        self,
+        connection: _Connection,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+    ) -> AsyncResponse:
+        """Send a request over the connection, which is put back to the pool or closed afterwards."""
+        try:
+            response = await asyncio.wait_for(
+                self._write_and_read(connection, method, path, body, headers), self.timeout,
+            )
+        except asyncio.IncompleteReadError as error:
+            connection.close()
+            raise http_client.IncompleteRead(error.partial) from error
+        except BaseException:
+            connection.close()
+            raise
+
+        if (response.getheader("Connection") or "").lower() == "close":
+            connection.close()
+        else:
+            self._idle.append(connection)
+
+        return response
+
+    async def _write_and_read(
+        self,
+        connection: _Connection,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+    ) -> AsyncResponse:
+        request_headers = {"Host": self._host, "Accept-Encoding": "identity", **headers}
+
+        if body or method in {"POST", "PUT"}:
+            request_headers["Content-Length"] = str(len(body))
+
+        head = "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+        connection.writer.write(f"{method} {path} HTTP/1.1\r\n{head}\r\n".encode("latin-1") + body)
+        await connection.writer.drain()
+
+        return await self._read_response(connection.reader, method)
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader, method: str) -> AsyncResponse:
+        status_line = (await reader.readline()).decode("latin-1")
+
+        _, _, status_and_reason = status_line.rstrip("\r\n").partition(" ")
+        status, _, reason = status_and_reason.partition(" ")
+
+        try:
+            status_code = int(status)
+        except ValueError as error:
+            raise http_client.BadStatusLine(status_line) from error
+
+        header_lines = []
+
+        while (line := await reader.readline()).strip():
+            header_lines.append(line)
+
+        headers = http_client.parse_headers(io.BytesIO(b"".join(header_lines) + b"\r\n"))
+
+        if method == "HEAD" or status_code in {204, 304} or status_code < 200: # noqa: PLR2004
+            body = b""
+        elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = await AsyncSession._read_chunked(reader)
+        elif headers.get("Content-Length") is not None:
+            body = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            # Without a length the body ends with the connection
+            body = await reader.read()
+            headers["Connection"] = "close"
+
+        return AsyncResponse(status_code, reason, headers, body)
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        chunks: list[bytes] = []
+
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+
+            if size == 0:
+                # Skip trailers up to the final empty line
+                while (await reader.readline()).strip():
+                    pass
+
+                return b"".join(chunks)
+
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import struct
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from enea_client.utils.parser import HourlyData, Volumes
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import tzinfo
+
+    from enea_client.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Timestamp of the start of the hour (epoch seconds) followed by the four volumes, little-endian
+RECORD = struct.Struct("<q4d")
+TIMESTAMP = struct.Struct("<q")
+
+class BinaryStore:
+    """Hourly data of a POD in a file of fixed-width records sorted by timestamp.
+
+    The file can be memory-mapped and searched by timestamp without parsing. Hours after the last stored one
+    are appended, any other save merges the records by timestamp and replaces the file.
+    """
+
+    _lock = threading.Lock()
+
+    @staticmethod
+    def call(config: Config, hourly_data: HourlyData) -> Path:
+        path = BinaryStore.path(config)
+
+        logger.info("Saving %s hours to: %s", len(hourly_data), path)
+
+        if not hourly_data:
+            return path
+
+        with BinaryStore._lock:
+            last_timestamp = BinaryStore.last_timestamp(path)
+
+            if last_timestamp is None or hourly_data.timestamps[0] > last_timestamp:
+                BinaryStore._append(path, hourly_data)
+            else:
+                BinaryStore._merge(path, hourly_data)
+
+        return path
+
+    @staticmethod
+    def read(path: Path, timezone: tzinfo, start: int | None = None, end: int | None = None) -> HourlyData:
+        """Hours starting in [start, end), found by binary search over the memory-mapped records."""
+        hourly_data = HourlyData(timezone)
+
+        if BinaryStore._count(path) == 0:
+            return hourly_data
+
+        with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as records:
+            count = len(records) // RECORD.size
+            start_index = 0 if start is None else BinaryStore._search(records, count, start)
+            end_index = count if end is None else BinaryStore._search(records, count, end)
+
+            for timestamp, *volumes in RECORD.iter_unpack(records[start_index * RECORD.size:end_index * RECORD.size]):
+                hourly_data.append(timestamp, (volumes[0], volumes[1], volumes[2], volumes[3]))
+
+        return hourly_data
+
+    @staticmethod
+    def last_timestamp(path: Path) -> int | None:
+        count = BinaryStore._count(path)
+
+        if count == 0:
+            return None
+
+        with path.open("rb") as file:
+            file.seek((count - 1) * RECORD.size)
+            timestamp: int = TIMESTAMP.unpack(file.read(TIMESTAMP.size))[0]
+
+        return timestamp
+
+    @staticmethod
+    def path(config: Config) -> Path:
+        return Path(config.output_dir) / f"{config.enea_pod_guid}.bin"
+
+    @staticmethod
+    def _append(path: Path, hourly_data: HourlyData) -> None:
+        with path.open("ab") as file:
+            # Drop a record torn by an interrupted append, so new records stay aligned
+            file.truncate(BinaryStore._count(path) * RECORD.size)
+            file.write(BinaryStore._pack(hourly_data.timestamps, map(hourly_data.volumes, range(len(hourly_data)))))
+
+    @staticmethod
+    def _merge(path: Path, hourly_data: HourlyData) -> None:
+        stored = BinaryStore.read(path, hourly_data.timezone)
+        records = dict(zip(stored.timestamps, map(stored.volumes, range(len(stored)))))
+        records.update(zip(hourly_data.timestamps, map(hourly_data.volumes, range(len(hourly_data)))))
+        timestamps = sorted(records)
+
+        temporary_path = path.with_name(f".{path.name}.tmp")
+        temporary_path.write_bytes(BinaryStore._pack(timestamps, map(records.__getitem__, timestamps)))
+        temporary_path.replace(path)
+
+    @staticmethod
+    def _pack(timestamps: Iterable[int], volumes: Iterable[Volumes]) -> bytes:
+        return b"".join(RECORD.pack(timestamp, *hour_volumes) for timestamp, hour_volumes in zip(timestamps, volumes))
+
+    @staticmethod
+    def _search(records: mmap.mmap, count: int, timestamp: int) -> int:
+        """Index of the first record starting at or after timestamp."""
+        low, high = 0, count
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if TIMESTAMP.unpack_from(records, middle * RECORD.size)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    @staticmethod
+    def _count(path: Path) -> int:
+        """Number of whole records in the file."""
+        return path.stat().st_size // RECORD.size if path.exists() else 0
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+
+from enea_client.utils.file_store import FileStore
+from enea_client.utils.month import format_month
+from enea_client.utils.rollup_store import RollupStore
+from enea_client.utils.state_store import TIMESTAMP_PATTERN
+from enea_client.utils.time_normalizer import TimeNormalizer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import tzinfo
+    from typing import TextIO
+
+    from enea_client.config import Config
+
+logger = logging.getLogger(__name__)
+
+class MonthRange(TypedDict):
+    first_timestamp: str
+    last_timestamp: str
+    # Byte offset and length of the rows of the month in the compacted file
+    offset: int
+    length: int
+    rows: int
+
+class CompactedFile(TypedDict):
+    # Size and modification time of every month file the compacted file was merged from
+    sources: dict[str, list[int]]
+    months: dict[str, MonthRange]
+
+class Compactor:
+    """Merge month files into yearly files, or one file of the POD, in the compacted subdirectory of output_dir.
+
+    Month files hold disjoint months, so they are concatenated in order, one open file at a time, skipping
+    rows of hours already written. The manifest maps every month to the byte range of its rows, so readers
+    can seek straight to it, and lets later runs skip compacted files whose month files have not changed.
+    """
+
+    DIRECTORY_NAME = "compacted"
+    MANIFEST_FILE_NAME = ".enea_client_manifest.json"
+
+    @staticmethod
+    def call(config: Config, group: str) -> list[Path]:
+        """Compact the stored month files by year or into one file named after the POD, return compacted files."""
+        compacted_config = Compactor.compacted_config(config)
+        Path(compacted_config.output_dir).mkdir(exist_ok=True)
+        manifest = Compactor.load_manifest(compacted_config.output_dir)
+        groups: dict[str, list[str]] = {}
+
+        for date in RollupStore.stored_dates(config.output_dir):
+            name = date[3:] if group == "year" else config.enea_pod_guid
+            groups.setdefault(name, []).append(date)
+
+        paths = []
+
+        for name, dates in groups.items():
+            path = FileStore.path(compacted_config, name)
+            sources = {date: Compactor._stat(FileStore.path(config, date)) for date in dates}
+            compacted_file = manifest.get(path.name)
+
+            if path.exists() and compacted_file is not None and compacted_file["sources"] == sources:
+                logger.info("Compacted file up to date: %s", path)
+            else:
+                manifest[path.name] = CompactedFile(sources=sources, months=Compactor.compact(config, name, dates))
+
+            paths.append(path)
+
+        Compactor._save_manifest(compacted_config.output_dir, manifest)
+
+        return paths
+
+    @staticmethod
+    def compacted_config(config: Config) -> Config:
+        """Config writing to the compacted subdirectory, kept apart from the month files."""
+        return replace(config, output_dir=str(Path(config.output_dir) / Compactor.DIRECTORY_NAME))
+
+    @staticmethod
+    def compact(config: Config, name: str, dates: list[str]) -> dict[str, MonthRange]:
+        """Concatenate the month files of dates, in order, into the compacted file of name.
+
+        Return the byte ranges of its months.
+        """
+        months: dict[str, MonthRange] = {}
+        header = Compactor._header(FileStore.path(config, dates[0]))
+        rows = Compactor._month_rows(config, dates)
+        FileStore.write_stream(Compactor.compacted_config(config), name, Compactor._pieces(header, rows, months))
+
+        return months
+
+    @staticmethod
+    def read_month(path: Path, date: str) -> str | None:
+        """Rows of the month (MM.YYYY) in a compacted file, read from its byte range in the manifest."""
+        compacted_file = Compactor.load_manifest(str(path.parent)).get(path.name)
+        month_range = compacted_file["months"].get(date) if compacted_file is not None else None
+
+        if month_range is None:
+            return None
+
+        with path.open("rb") as file:
+            file.seek(month_range["offset"])
+
+            return file.read(month_range["length"]).decode("utf-8")
+
+    @staticmethod
+    def load_manifest(output_dir: str) -> dict[str, CompactedFile]:
+        path = Path(output_dir) / Compactor.MANIFEST_FILE_NAME
+
+        if not path.exists():
+            return {}
+
+        try:
+            manifest: dict[str, CompactedFile] = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            logger.warning("Ignoring corrupted manifest: %s", path)
+            return {}
+
+        return manifest
+
+    @staticmethod
+    def _save_manifest(output_dir: str, manifest: dict[str, CompactedFile]) -> None:
+        path = Path(output_dir) / Compactor.MANIFEST_FILE_NAME
+        temporary_path = path.with_name(f"{path.name}.tmp")
+        temporary_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+        temporary_path.replace(path)
+
+    @staticmethod
+    def _header(path: Path) -> str:
+        """Lines before the first row."""
+        header = []
+
+        with path.open(encoding="utf-8", newline="\n") as header_file:
+            for line in header_file:
+                if TIMESTAMP_PATTERN.match(line):
+                    break
+
+                header.append(line)
+
+        return "".join(header)
+
+    @staticmethod
+    def _month_rows(config: Config, dates: list[str]) -> Iterator[tuple[int, str, str]]:
+        """Rows of the month files of dates, opening the next file only once the previous one is read."""
+        for date in dates:
+            with FileStore.path(config, date).open(encoding="utf-8", newline="\n") as file:
+                yield from Compactor._rows(file, config.enea_timezone)
+
+    @staticmethod
+    def _rows(file: TextIO, timezone: tzinfo) -> Iterator[tuple[int, str, str]]:
+        """(epoch seconds of the start of the hour, timestamp, line) of every row of a month file, in order.
+
+        Epoch seconds tell apart the two hours of a DST change that share a timestamp.
+        """
+        time_normalizer = TimeNormalizer(timezone)
+
+        for line in file:
+            match = TIMESTAMP_PATTERN.match(line)
+
+            if match is None:
+                continue
+
+            normalized = time_normalizer.normalize(match.group(1))
+
+            if normalized is None:
+                logger.warning("Skipping row of a nonexistent hour: %s", match.group(1))
+                continue
+
+            yield normalized[0], match.group(1), line if line.endswith("\n") else f"{line}\n"
+
+    @staticmethod
+    def _pieces(header: str, rows: Iterable[tuple[int, str, str]], months: dict[str, MonthRange]) -> Iterator[str]:
+        """Header and rows of hours after the last written one, recording the byte range of every month into months.
+
+        A row of an hour already written, like the last hour of the previous month repeated at the start of a
+        month file, is skipped, keeping the row of the earlier month.
+        """
+        offset = len(header.encode("utf-8"))
+        previous_hour = None
+
+        yield header
+
+        for hour, timestamp, line in rows:
+            if previous_hour is not None and hour <= previous_hour:
+                logger.debug("Skipping row of an hour already written: %s", timestamp)
+                continue
+
+            previous_hour = hour
+            date = format_month(int(timestamp[:4]), int(timestamp[5:7]))
+            size = len(line.encode("utf-8"))
+
+            if date not in months:
+                months[date] = MonthRange(
+                    first_timestamp=timestamp, last_timestamp=timestamp, offset=offset, length=0, rows=0,
+                )
+
+            month_range = months[date]
+            month_range["last_timestamp"] = timestamp
+            month_range["length"] += size
+            month_range["rows"] += 1
+            offset += size
+
+            yield line
+
+    @staticmethod
+    def _stat(path: Path) -> list[int]:
+        stat = path.stat()
+
+        return [stat.st_size, stat.st_mtime_ns]
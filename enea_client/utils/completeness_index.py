@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import re
+import threading
+from datetime import date as date_type
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+
+from enea_client.utils.month import parse_month
+from enea_client.utils.sanitizer import PLACEHOLDER
+from enea_client.utils.time_normalizer import HOUR, TimeNormalizer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import tzinfo
+
+    from enea_client.config import Config
+
+logger = logging.getLogger(__name__)
+
+ROW_LABEL_PATTERN = re.compile(r'^"?(\d{4}-\d{2}-\d{2} \d{2}:\d{2})', re.MULTILINE)
+# Raw rows look like \u0000"=""2025-09-01 00:59"""\u0000;"---";...
+PLACEHOLDER_LABEL_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2})[^\n]*"---"')
+
+class MonthCompleteness(TypedDict):
+    # Hours of the month, 743 or 745 in months with a DST change
+    hours: int
+    # Base64 bitmaps with one bit per hour of the month, in order
+    present: str
+    placeholder: str
+
+class MonthStatus(TypedDict):
+    hours: int
+    present: int
+    placeholder: int
+    missing: int
+    pending: int
+    coverage: float
+    incomplete_days: list[str]
+
+class CompletenessBuilder:
+    """Records which hours of a month have values and which were placeholders, from data passing through."""
+
+    def __init__(self, date: str, timezone: tzinfo) -> None:
+        self.start, self.hours = month_hours(date, timezone)
+        self.present = bytearray((self.hours + 7) // 8)
+        self.placeholder = bytearray((self.hours + 7) // 8)
+        self._time_normalizer = TimeNormalizer(timezone)
+        self._placeholder_time_normalizer = TimeNormalizer(timezone)
+
+    def tap(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Pass through sanitized pieces ending with full lines, recording hours with values."""
+        for piece in pieces:
+            self.scan(piece)
+
+            yield piece
+
+    def tap_raw(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Pass through raw portal pieces ending with full lines, recording placeholder hours."""
+        for piece in pieces:
+            self.scan_raw(piece)
+
+            yield piece
+
+    def scan(self, data: str) -> None:
+        for label in ROW_LABEL_PATTERN.findall(data):
+            self._set(self.present, self._time_normalizer, label)
+
+    def scan_raw(self, data: str) -> None:
+        if PLACEHOLDER not in data:
+            return
+
+        for label in PLACEHOLDER_LABEL_PATTERN.findall(data):
+            self._set(self.placeholder, self._placeholder_time_normalizer, label)
+
+    def month_completeness(self) -> MonthCompleteness:
+        return MonthCompleteness(
+            hours=self.hours,
+            present=base64.b64encode(self.present).decode(),
+            placeholder=base64.b64encode(self.placeholder).decode(),
+        )
+
+    def _set(self, bitmap: bytearray, time_normalizer: TimeNormalizer, label: str) -> None:
+        normalized = time_normalizer.normalize(label)
+
+        if normalized is None:
+            return
+
+        index = (normalized[0] - self.start) // HOUR
+
+        if 0 <= index < self.hours:
+            bitmap[index >> 3] |= 1 << (index & 7)
+
+class CompletenessIndex:
+    """Bitmaps of hours with values and of placeholder hours of every downloaded month, kept per POD.
+
+    Hours without values up to the end of yesterday are missing, later ones are pending publication.
+    """
+
+    FILE_NAME = ".enea_client_completeness.json"
+
+    def __init__(self, output_dir: str) -> None:
+        self.path = Path(output_dir) / self.FILE_NAME
+        self._lock = threading.Lock()
+        self._index: dict[str, dict[str, MonthCompleteness]] = {}
+        self._changed = False
+
+        if self.path.exists():
+            try:
+                self._index = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring corrupted completeness index: %s", self.path)
+
+    def get(self, pod_guid: str, date: str) -> MonthCompleteness | None:
+        with self._lock:
+            return self._index.get(pod_guid, {}).get(date)
+
+    def set(self, pod_guid: str, date: str, month_completeness: MonthCompleteness) -> None:
+        with self._lock:
+            if self._index.get(pod_guid, {}).get(date) != month_completeness:
+                self._index.setdefault(pod_guid, {})[date] = month_completeness
+                self._changed = True
+
+    def dates(self, pod_guid: str) -> list[str]:
+        with self._lock:
+            return sorted(self._index.get(pod_guid, {}), key=parse_month)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._changed:
+                return
+
+            temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+            temporary_path.write_text(json.dumps(self._index, indent=2, sort_keys=True), encoding="utf-8")
+            temporary_path.replace(self.path)
+            self._changed = False
+
+    def is_complete(self, pod_guid: str, date: str) -> bool | None:
+        """Whether every hour of the month has values, None for months not in the index."""
+        month_completeness = self.get(pod_guid, date)
+
+        if month_completeness is None:
+            return None
+
+        return count_bits(base64.b64decode(month_completeness["present"])) == month_completeness["hours"]
+
+    def status(self, pod_guid: str, date: str, timezone: tzinfo, today: date_type) -> MonthStatus | None:
+        month_completeness = self.get(pod_guid, date)
+
+        if month_completeness is None:
+            return None
+
+        start, hours = month_hours(date, timezone)
+        present = base64.b64decode(month_completeness["present"])
+        placeholder = base64.b64decode(month_completeness["placeholder"])
+        today_start = int(datetime.combine(today, datetime.min.time(), timezone).timestamp())
+        published_hours = min(hours, max(0, (today_start - start) // HOUR))
+        counts = {"present": 0, "placeholder": 0, "missing": 0}
+        incomplete_days = set()
+
+        for index in range(published_hours):
+            if present[index >> 3] >> (index & 7) & 1:
+                counts["present"] += 1
+                continue
+
+            counts["placeholder" if placeholder[index >> 3] >> (index & 7) & 1 else "missing"] += 1
+            incomplete_days.add(datetime.fromtimestamp(start + index * HOUR, timezone).date().isoformat())
+
+        return MonthStatus(
+            hours=hours,
+            present=count_bits(present),
+            placeholder=counts["placeholder"],
+            missing=counts["missing"],
+            pending=hours - published_hours,
+            coverage=round(counts["present"] / published_hours, 4) if published_hours else 1.0,
+            incomplete_days=sorted(incomplete_days),
+        )
+
+    @staticmethod
+    def report(config: Config, today: date_type) -> str:
+        """Status of the configured months, or of all indexed months without dates, as JSON."""
+        completeness_index = CompletenessIndex(config.output_dir)
+        dates = config.dates or completeness_index.dates(config.enea_pod_guid)
+        statuses = {}
+
+        for date in dates:
+            month_status = completeness_index.status(config.enea_pod_guid, date, config.enea_timezone, today)
+
+            if month_status is None:
+                logger.warning("Month not in the completeness index: %s", date)
+                continue
+
+            statuses[date] = month_status
+
+        return json.dumps(statuses, indent=2)
+
+def month_hours(date: str, timezone: tzinfo) -> tuple[int, int]:
+    """Epoch seconds of the start of the month (MM.YYYY) and its number of hours."""
+    year, month = parse_month(date)
+    first_day = date_type(year, month, 1)
+    next_month = (first_day + timedelta(days=32)).replace(day=1)
+    start = int(datetime.combine(first_day, datetime.min.time(), timezone).timestamp())
+    end = int(datetime.combine(next_month, datetime.min.time(), timezone).timestamp())
+
+    return start, (end - start) // HOUR
+
+def count_bits(bitmap: bytes | bytearray) -> int:
+    return bin(int.from_bytes(bitmap, "little")).count("1")
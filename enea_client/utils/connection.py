@@ -2,22 +2,46 @@ from __future__ import annotations
 
 import http.client as http_client
 import logging
-from contextlib import contextmanager
+import time
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from enea_client.utils.metrics import Metrics
 
 logger = logging.getLogger(__name__)
 
-@contextmanager
-def open_connection(url: str, timeout: int) -> Generator[http_client.HTTPConnection, None, None]:
+class TimedHTTPConnection(http_client.HTTPConnection):
+    """Connection recording the time of opening the TCP connection as the connect stage."""
+
+    metrics: Metrics
+
+    def connect(self) -> None:
+        started_at = time.perf_counter()
+        super().connect()
+        self.connect_seconds = time.perf_counter() - started_at
+        self.metrics.record("connect", self.connect_seconds)
+
+class TimedHTTPSConnection(http_client.HTTPSConnection, TimedHTTPConnection):
+    """Connection recording the TLS handshake as the tls stage, apart from the connect stage.
+
+    HTTPSConnection.connect opens the TCP connection through TimedHTTPConnection.connect before the handshake.
+    """
+
+    def connect(self) -> None:
+        started_at = time.perf_counter()
+        super().connect()
+        self.metrics.record("tls", time.perf_counter() - started_at - self.connect_seconds)
+
+def create_connection(url: str, timeout: int, metrics: Metrics | None = None) -> http_client.HTTPConnection:
     parsed_url = urlparse(url)
 
-    connection_class = (
-        http_client.HTTPSConnection if parsed_url.scheme == "https" else http_client.HTTPConnection
-    )
+    if metrics is None:
+        connection_class = (
+            http_client.HTTPSConnection if parsed_url.scheme == "https" else http_client.HTTPConnection
+        )
+    else:
+        connection_class = TimedHTTPSConnection if parsed_url.scheme == "https" else TimedHTTPConnection
 
     connection = connection_class(
         host=str(parsed_url.hostname),
@@ -25,11 +49,11 @@ def open_connection(url: str, timeout: int) -> Generator[http_client.HTTPConnect
         timeout=timeout,
     )
 
+    if isinstance(connection, TimedHTTPConnection) and metrics is not None:
+        connection.metrics = metrics
+
     connection.set_debuglevel(
         1 if logger.getEffectiveLevel() < logging.INFO else 0,
     )
 
-    try:
-        yield connection
-    finally:
-        connection.close()
+    return connection
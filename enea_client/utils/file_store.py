@@ -1,20 +1,150 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
 import logging
+import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from enea_client.config import Config
 
 logger = logging.getLogger(__name__)
 
+BLOCK_SIZE = 65536
+
+@dataclass
+class StoreResult:
+    path: Path
+    changed: bool
+
 class FileStore:
+    """Month files are written to a temporary file and renamed into place, so a killed process never leaves
+    a truncated file behind. A file with identical content is not written again.
+    """
+
+    @staticmethod
+    def call(config: Config, date: str, data: str) -> StoreResult:
+        output_file_path = FileStore.path(config, date)
+        encoded_data = data.encode("utf-8")
+
+        if FileStore._matches(output_file_path, len(encoded_data), hashlib.sha256(encoded_data).digest()):
+            logger.info("File unchanged: %s", output_file_path)
+            return StoreResult(output_file_path, changed=False)
+
+        return FileStore._write(config, output_file_path, 0, iter([encoded_data]))
+
+    @staticmethod
+    def write_stream(config: Config, date: str, pieces: Iterable[str]) -> StoreResult:
+        """Write pieces to a temporary file and move it into place only if the whole stream was consumed.
+
+        Pieces are compared with the existing file as they come, the temporary file is opened only at the
+        first difference and starts with a copy of the matching part.
+        """
+        output_file_path = FileStore.path(config, date)
+        remaining = FileStore._skip_unchanged(output_file_path, (piece.encode("utf-8") for piece in pieces))
+
+        if remaining is None:
+            logger.info("File unchanged: %s", output_file_path)
+            return StoreResult(output_file_path, changed=False)
+
+        return FileStore._write(config, output_file_path, *remaining)
+
     @staticmethod
-    def call(config: Config, date: str, data: str) -> None | Path:
-        output_file_path = Path(f"{config.output_dir}/{date}.csv")
+    def path(config: Config, date: str) -> Path:
+        return Path(f"{config.output_dir}/{date}.csv")
+
+    @staticmethod
+    def _matches(path: Path, size: int, digest: bytes) -> bool:
+        """Whether the file has the given size and SHA-256 digest, hashing it only when the size matches."""
+        try:
+            if path.stat().st_size != size:
+                return False
+
+            sha256 = hashlib.sha256()
+
+            with path.open("rb") as file:
+                for block in iter(lambda: file.read(BLOCK_SIZE), b""):
+                    sha256.update(block)
+        except FileNotFoundError:
+            return False
+
+        return sha256.digest() == digest
+
+    @staticmethod
+    def _skip_unchanged(path: Path, encoded_pieces: Iterator[bytes]) -> tuple[int, Iterator[bytes]] | None:
+        """Consume pieces while they match the start of the file at path.
+
+        Return None when the pieces equal the whole file, otherwise the size of the matching part and the
+        remaining pieces, starting with the first differing one.
+        """
+        try:
+            file = path.open("rb")
+        except FileNotFoundError:
+            return 0, encoded_pieces
+
+        matched_size = 0
+
+        with file:
+            for encoded_piece in encoded_pieces:
+                if file.read(len(encoded_piece)) != encoded_piece:
+                    return matched_size, itertools.chain([encoded_piece], encoded_pieces)
+
+                matched_size += len(encoded_piece)
+
+            # The file is longer than the pieces
+            if file.read(1):
+                return matched_size, iter([])
+
+        return None
+
+    @staticmethod
+    def _write(
+        config: Config, output_file_path: Path, matched_size: int, encoded_pieces: Iterator[bytes],
+    ) -> StoreResult:
+        """Write the first matched_size bytes of the existing file and the pieces to a temporary file, then move
+        it into place.
+        """
+        temporary_file_path = output_file_path.with_name(f".{output_file_path.name}.tmp")
+
+        try:
+            with temporary_file_path.open("wb") as output_file:
+                if matched_size:
+                    with output_file_path.open("rb") as file:
+                        while matched_size:
+                            block = file.read(min(matched_size, BLOCK_SIZE))
+                            output_file.write(block)
+                            matched_size -= len(block)
+
+                for encoded_piece in encoded_pieces:
+                    output_file.write(encoded_piece)
+
+                if config.fsync:
+                    output_file.flush()
+                    os.fsync(output_file.fileno())
+        except BaseException:
+            # The temporary file does not exist when opening it failed
+            temporary_file_path.unlink(missing_ok=True)
+            raise
 
         logger.info("Saving file to: %s", output_file_path)
-        output_file_path.write_text(data, encoding="utf-8")
+        temporary_file_path.replace(output_file_path)
+
+        if config.fsync:
+            FileStore._fsync_directory(output_file_path.parent)
+
+        return StoreResult(output_file_path, changed=True)
+
+    @staticmethod
+    def _fsync_directory(path: Path) -> None:
+        """Persist the rename itself, not only the file content."""
+        descriptor = os.open(path, os.O_RDONLY)
 
-        return output_file_path
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import http.client as http_client
+import json
+import logging
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from enea_client.utils.session import Session
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from enea_client.config import Config
+    from enea_client.utils.parser import HourlyData
+
+logger = logging.getLogger(__name__)
+
+class HomeAssistant:
+    """Export hourly data to the Home Assistant Statistics integration (import_statistics).
+
+    Rows use UTC start times, so the repeated DST hour is imported without ambiguity.
+    """
+
+    IMPORT_PATH = "/api/services/import_statistics/import_from_file"
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.session: Session | None = None
+
+        if config.home_assistant_url:
+            self.session = Session(config.home_assistant_url, config.connection_timeout)
+
+    def call(self, hourly_datas: Iterable[HourlyData]) -> bool:
+        """Write the import file and, if a Home Assistant URL is configured, trigger the import."""
+        file_path = self.write(hourly_datas)
+
+        if self.session is None:
+            return True
+
+        return self._upload(self.session, file_path.name)
+
+    def write(self, hourly_datas: Iterable[HourlyData]) -> Path:
+        file_path = Path(str(self.config.home_assistant_config_dir)) / self.config.home_assistant_file_name
+        import_sensor = self.config.home_assistant_import_sensor
+        export_sensor = self.config.home_assistant_export_sensor
+
+        logger.info("Saving Home Assistant import file to: %s", file_path)
+
+        with file_path.open("w", encoding="utf-8") as output_file:
+            output_file.write("statistic_id,unit,start,delta\n")
+
+            for hourly_data in hourly_datas:
+                for timestamp, imported, exported in zip(
+                    hourly_data.timestamps, hourly_data.import_after, hourly_data.export_after,
+                ):
+                    start = time.strftime("%Y-%m-%d %H:%M", time.gmtime(timestamp))
+                    output_file.write(f"{import_sensor},kWh,{start},{imported}\n")
+                    output_file.write(f"{export_sensor},kWh,{start},{exported}\n")
+
+        return file_path
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
+
+    def _upload(self, session: Session, file_name: str) -> bool:
+        logger.info("Importing %s into Home Assistant", file_name)
+
+        try:
+            with session.request(
+                "POST",
+                self.IMPORT_PATH,
+                body=json.dumps({
+                    "filename": file_name,
+                    "timezone_identifier": "UTC",
+                    "delimiter": ",",
+                    "decimal": False,
+                    "datetime_format": "%Y-%m-%d %H:%M",
+                    "unit_from_entity": False,
+                }),
+                headers={
+                    "Authorization": f"Bearer {self.config.home_assistant_token}",
+                    "Content-Type": "application/json",
+                },
+            ) as response:
+                if response.status != HTTPStatus.OK:
+                    logger.error("Error: status - %s, reason - %s", response.status, response.reason)
+                    return False
+
+                return True
+        except (OSError, http_client.HTTPException) as error:
+            # Home Assistant being down fails the import, not the run
+            logger.error("Cannot connect to Home Assistant, error - %s", error)
+            return False
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+WHITESPACE = " \t\n\r"
+DELIMITERS = f"{WHITESPACE},:}}]"
+STRING_CONTENT_PATTERN = re.compile(r'(?:[^"\\]+|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*')
+HIGH_SURROGATE_PATTERN = re.compile(r"\\u[dD][89abAB][0-9a-fA-F]{2}$")
+DECODER = json.JSONDecoder()
+
+class Readable(Protocol):
+    def read(self, amt: int) -> bytes: ...
+
+class JsonStream:
+    """Incremental reader of a JSON object that streams one string field instead of loading it at once.
+
+    Iterating yields decoded chunks of the streamed field. All other top level fields are available in
+    values once iteration is finished. Invalid JSON raises ValueError.
+    """
+
+    def __init__(self, source: Readable, field: str = "data", chunk_size: int = 65536) -> None:
+        self.source = source
+        self.field = field
+        self.chunk_size = chunk_size
+        self.values: dict[str, Any] = {}
+        self.bytes_read = 0
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[str]:
+        self._expect("{")
+
+        if self._peek() == "}":
+            self._position += 1
+            return
+
+        while True:
+            key = self._value()
+
+            if not isinstance(key, str):
+                msg = f"Invalid JSON key: {key!r}"
+                raise ValueError(msg) # noqa: TRY004
+
+            self._expect(":")
+
+            if key == self.field and self._peek() == '"':
+                self._position += 1
+                yield from self._string()
+            else:
+                self.values[key] = self._value()
+
+            separator = self._next()
+
+            if separator == "}":
+                return
+
+            if separator != ",":
+                msg = "Expected ',' in JSON"
+                raise ValueError(msg)
+
+    def _string(self) -> Iterator[str]:
+        """Yield the decoded content of a string whose opening quote was already consumed."""
+        while True:
+            match = STRING_CONTENT_PATTERN.match(self._buffer, self._position)
+            end = match.end() if match else self._position
+            closed = end < len(self._buffer) and self._buffer[end] == '"'
+
+            # Matching stops only before a quote or an escape, which is at most 6 characters long
+            if not closed and len(self._buffer) - end >= 6: # noqa: PLR2004
+                msg = f"Invalid JSON string escape at: {self._buffer[end:end + 6]!r}"
+                raise ValueError(msg)
+
+            # Keep an unpaired high surrogate until its low surrogate arrives
+            segment_end = end
+            if not closed and HIGH_SURROGATE_PATTERN.search(self._buffer, self._position, end):
+                segment_end = end - 6
+
+            if segment_end > self._position:
+                yield json.loads(f'"{self._buffer[self._position:segment_end]}"')
+                self._position = segment_end
+
+            if closed:
+                self._position = end + 1
+                return
+
+            if not self._fill():
+                msg = "Unterminated JSON string"
+                raise ValueError(msg)
+
+    def _value(self) -> Any: # noqa: ANN401
+        self._peek()
+
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                value, end = None, None
+
+            # A value not followed by a delimiter (e.g. a number) may continue in the next chunk
+            if end is not None and (self._eof or (end < len(self._buffer) and self._buffer[end] in DELIMITERS)):
+                self._position = end
+                return value
+
+            if not self._fill():
+                msg = f"Invalid JSON value at: {self._buffer[self._position:self._position + 10]!r}"
+                raise ValueError(msg)
+
+    def _expect(self, character: str) -> None:
+        if self._next() != character:
+            msg = f"Expected {character!r} in JSON"
+            raise ValueError(msg)
+
+    def _next(self) -> str:
+        character = self._peek()
+        self._position += 1
+
+        return character
+
+    def _peek(self) -> str:
+        """Return the next non whitespace character, reading more data if needed."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in WHITESPACE:
+                self._position += 1
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._fill():
+                return ""
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        chunk = self.source.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        self._eof = not chunk
+
+        # Drop the consumed part, so only the unread part of the current chunk is kept in memory
+        self._buffer = self._buffer[self._position:] + self._decoder.decode(chunk, final=self._eof)
+        self._position = 0
+
+        return not self._eof or bool(self._buffer)
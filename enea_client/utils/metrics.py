@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+ROW_PATTERN = re.compile(r'^"?\d{4}-\d{2}-\d{2} \d{2}:\d{2}', re.MULTILINE)
+
+class StageMetrics(TypedDict):
+    count: int
+    seconds: float
+
+class RunSummary(TypedDict):
+    started_at: float
+    seconds: float
+    stages: dict[str, StageMetrics]
+    # Amounts per POD GUID and month
+    dates: dict[str, dict[str, dict[str, float]]]
+
+class Metrics:
+    """Time spent per stage of a run and amounts per downloaded month, safe to share between threads.
+
+    Stages: connect, tls, auth, request (until response headers), body_read, json_decode, sanitize, write,
+    post_process. Amounts per POD and month: bytes of the response and rows of the saved file.
+    """
+
+    PREFIX = "enea_client"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self.stages: dict[str, StageMetrics] = {}
+            self.dates: dict[str, dict[str, dict[str, float]]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stage = self.stages.setdefault(name, StageMetrics(count=0, seconds=0.0))
+            stage["count"] += 1
+            stage["seconds"] += seconds
+
+    def timed(self, name: str, items: Iterable[str]) -> Iterator[str]:
+        """Pass through items, recording the time spent producing them but not the time of the consumer."""
+        iterator = iter(items)
+        seconds = 0.0
+
+        try:
+            while True:
+                started_at = time.perf_counter()
+
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += time.perf_counter() - started_at
+
+                yield item
+        finally:
+            self.record(name, seconds)
+
+    def add(self, name: str, value: float, pod_guid: str, date: str) -> None:
+        with self._lock:
+            date_metrics = self.dates.setdefault(pod_guid, {}).setdefault(date, {})
+            date_metrics[name] = date_metrics.get(name, 0) + value
+
+    def count_rows(self, pieces: Iterable[str], pod_guid: str, date: str) -> Iterator[str]:
+        """Pass through pieces ending with full lines, counting hourly rows on the way."""
+        rows = 0
+
+        for piece in pieces:
+            rows += len(ROW_PATTERN.findall(piece))
+            yield piece
+
+        self.add("rows", rows, pod_guid, date)
+
+    def summary(self) -> RunSummary:
+        with self._lock:
+            return RunSummary(
+                started_at=self.started_at,
+                seconds=time.time() - self.started_at,
+                stages={name: StageMetrics(**stage) for name, stage in sorted(self.stages.items())},
+                dates={
+                    pod_guid: {date: dict(date_metrics) for date, date_metrics in sorted(dates.items())}
+                    for pod_guid, dates in sorted(self.dates.items())
+                },
+            )
+
+    def save(self, summary_file: str | None, prometheus_file: str | None) -> None:
+        summary = self.summary()
+
+        if summary_file:
+            logger.info("Saving run summary to: %s", summary_file)
+            self._write(Path(summary_file), json.dumps(summary, indent=2))
+
+        if prometheus_file:
+            logger.info("Saving metrics to: %s", prometheus_file)
+            self._write(Path(prometheus_file), self.prometheus(summary))
+
+    def prometheus(self, summary: RunSummary) -> str:
+        """Summary in the Prometheus text format, for the node exporter textfile collector."""
+        stages = summary["stages"]
+        dates = summary["dates"]
+        lines = [
+            f"# HELP {self.PREFIX}_run_timestamp_seconds Start of the last run.",
+            f"# TYPE {self.PREFIX}_run_timestamp_seconds gauge",
+            f"{self.PREFIX}_run_timestamp_seconds {summary['started_at']}",
+            f"# HELP {self.PREFIX}_run_duration_seconds Duration of the last run.",
+            f"# TYPE {self.PREFIX}_run_duration_seconds gauge",
+            f"{self.PREFIX}_run_duration_seconds {summary['seconds']}",
+            f"# HELP {self.PREFIX}_stage_duration_seconds Time spent per stage in the last run.",
+            f"# TYPE {self.PREFIX}_stage_duration_seconds gauge",
+            *(
+                f'{self.PREFIX}_stage_duration_seconds{{stage="{name}"}} {stage["seconds"]}'
+                for name, stage in stages.items()
+            ),
+            f"# HELP {self.PREFIX}_stage_count Number of times every stage ran in the last run.",
+            f"# TYPE {self.PREFIX}_stage_count gauge",
+            *(f'{self.PREFIX}_stage_count{{stage="{name}"}} {stage["count"]}' for name, stage in stages.items()),
+        ]
+
+        for name in ("bytes", "rows"):
+            lines.append(f"# HELP {self.PREFIX}_month_{name} {name.capitalize()} per POD and month in the last run.")
+            lines.append(f"# TYPE {self.PREFIX}_month_{name} gauge")
+            lines.extend(
+                f'{self.PREFIX}_month_{name}{{pod="{pod_guid}",date="{date}"}} {date_metrics[name]}'
+                for pod_guid, pod_dates in dates.items()
+                for date, date_metrics in pod_dates.items()
+                if name in date_metrics
+            )
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _write(path: Path, content: str) -> None:
+        # Collectors must never read a partially written file
+        temporary_path = path.with_name(f".{path.name}.tmp")
+        temporary_path.write_text(content, encoding="utf-8")
+        temporary_path.replace(path)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import calendar
+import logging
+import re
+from datetime import date as date_type
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+MONTH_PATTERN = re.compile(r"(0[1-9]|1[0-2])\.(\d{4})")
+LAST_PREFIX = "last:"
+SINCE_PREFIX = "since:"
+RANGE_SEPARATOR = ".."
+# A hundred years, far more than the portal keeps, and well within the years date supports
+MAX_LAST_MONTHS = 1200
+
+def parse_month(date: str) -> tuple[int, int]:
+    """Split a MM.YYYY date into (year, month)."""
+    month, year = date.split(".")
+
+    return int(year), int(month)
+
+def format_month(year: int, month: int) -> str:
+    return f"{month:02d}.{year}"
+
+def is_closed(date: str, today: date_type) -> bool:
+    """Whether the month is over, so the portal will not publish any more hours for it."""
+    return parse_month(date) < (today.year, today.month)
+
+def last_hour(date: str) -> str:
+    """Timestamp of the last hourly row of the month, as written in the CSV files."""
+    year, month = parse_month(date)
+    last_day = calendar.monthrange(year, month)[1]
+
+    return f"{year}-{month:02d}-{last_day:02d} 23:59"
+
+def plan_dates(expressions: Iterable[str], today: date_type) -> list[str]:
+    """Expand date expressions into sorted, unique MM.YYYY months, without months after the current one.
+
+    Supported expressions: MM.YYYY, a range MM.YYYY..MM.YYYY, last:N (the current month and N - 1 before it,
+    with N up to MAX_LAST_MONTHS) and since:YYYY-MM-DD (the month of the date up to the current month).
+    Invalid expressions raise ValueError.
+    """
+    current_month = (today.year, today.month)
+    months = {month for expression in expressions for month in _expand(expression.strip(), current_month)}
+    future_months = sorted(month for month in months if month > current_month)
+
+    if future_months:
+        logger.info("Skipping future months: %s", ", ".join(format_month(*month) for month in future_months))
+
+    return [format_month(*month) for month in sorted(months) if month <= current_month]
+
+def _expand(expression: str, current_month: tuple[int, int]) -> Iterator[tuple[int, int]]:
+    if expression.startswith(LAST_PREFIX):
+        count = expression[len(LAST_PREFIX):]
+
+        if not count.isdigit() or not 1 <= int(count) <= MAX_LAST_MONTHS:
+            msg = f"Invalid date expression: {expression}, expected last:N with N from 1 to {MAX_LAST_MONTHS}"
+            raise ValueError(msg)
+
+        current_index = _index(*current_month)
+
+        return _months(current_index - int(count) + 1, current_index)
+
+    if expression.startswith(SINCE_PREFIX):
+        try:
+            since = date_type.fromisoformat(expression[len(SINCE_PREFIX):])
+        except ValueError as error:
+            msg = f"Invalid date expression: {expression}, expected since:YYYY-MM-DD"
+            raise ValueError(msg) from error
+
+        if (since.year, since.month) > current_month:
+            msg = f"Invalid date expression: {expression}, the date is after the current month"
+            raise ValueError(msg)
+
+        return _months(_index(since.year, since.month), _index(*current_month))
+
+    start, separator, end = expression.partition(RANGE_SEPARATOR)
+    start_index = _month_index(start, expression)
+    end_index = _month_index(end, expression) if separator else start_index
+
+    if start_index > end_index:
+        msg = f"Invalid date expression: {expression}, the range ends before it starts"
+        raise ValueError(msg)
+
+    return _months(start_index, end_index)
+
+def _month_index(date: str, expression: str) -> int:
+    if not MONTH_PATTERN.fullmatch(date):
+        msg = f"Invalid date expression: {expression}, expected MM.YYYY"
+        raise ValueError(msg)
+
+    return _index(*parse_month(date))
+
+def _index(year: int, month: int) -> int:
+    """Months counted from year 0, so ranges can be computed with plain arithmetic."""
+    return year * 12 + month - 1
+
+def _months(start_index: int, end_index: int) -> Iterator[tuple[int, int]]:
+    for index in range(start_index, end_index + 1):
+        yield index // 12, index % 12 + 1
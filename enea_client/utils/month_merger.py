@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import logging
+from datetime import date as date_type
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from enea_client.utils.state_store import TIMESTAMP_PATTERN
+
+if TYPE_CHECKING:
+    from datetime import tzinfo
+
+logger = logging.getLogger(__name__)
+
+class MonthMerger:
+    """Merge sanitized single day downloads into a sanitized month file."""
+
+    @staticmethod
+    def call(month_data: str, days_data: list[str], timezone: tzinfo) -> str | None:
+        """Replace the days present in days_data and return None when the result has missing hours.
+
+        Lines after the rows, like a footer, are kept from the newest download that has them.
+        """
+        header, rows, footer = MonthMerger._split(month_data)
+
+        for day_data in days_data:
+            _, day_rows, day_footer = MonthMerger._split(day_data)
+            rows.update(day_rows)
+            footer = day_footer or footer
+
+        days = sorted(rows)
+
+        if days and not MonthMerger._is_contiguous(days, rows, timezone):
+            return None
+
+        lines = header + [row for day in days for row in rows[day]] + footer
+        merged_data = "\n".join(lines)
+
+        return f"{merged_data}\n" if month_data.endswith("\n") else merged_data
+
+    @staticmethod
+    def hours_in_day(day: date_type, timezone: tzinfo) -> int:
+        start = datetime(day.year, day.month, day.day, tzinfo=timezone)
+        end = datetime.combine(day + timedelta(days=1), start.time(), tzinfo=timezone)
+
+        return int(end.timestamp() - start.timestamp()) // 3600
+
+    @staticmethod
+    def _split(data: str) -> tuple[list[str], dict[str, list[str]], list[str]]:
+        header: list[str] = []
+        rows: dict[str, list[str]] = {}
+        footer: list[str] = []
+
+        for line in data.splitlines():
+            match = TIMESTAMP_PATTERN.match(line)
+
+            if match:
+                rows.setdefault(match.group(1)[:10], []).append(line)
+            elif line:
+                (footer if rows else header).append(line)
+
+        return header, rows, footer
+
+    @staticmethod
+    def _is_contiguous(days: list[str], rows: dict[str, list[str]], timezone: tzinfo) -> bool:
+        expected_day = date_type.fromisoformat(days[0]).replace(day=1)
+
+        for index, day in enumerate(days):
+            current_day = date_type.fromisoformat(day)
+            hours = MonthMerger.hours_in_day(current_day, timezone)
+            is_newest = index == len(days) - 1
+
+            # Every day up to the newest one has to be complete, the newest one may still be filling up
+            if current_day != expected_day or len(rows[day]) > hours or (not is_newest and len(rows[day]) < hours):
+                logger.info("Missing hours detected on: %s", day)
+                return False
+
+            expected_day += timedelta(days=1)
+
+        return True
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+from array import array
+from bisect import bisect_left
+from datetime import date as date_type
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from enea_client.utils.state_store import TIMESTAMP_PATTERN
+from enea_client.utils.time_normalizer import HOUR, TimeNormalizer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from datetime import tzinfo
+
+logger = logging.getLogger(__name__)
+
+Volumes = tuple[float, float, float, float]
+
+class HourlyData:
+    """Columnar hourly data. Timestamps are epoch seconds of the start of every hour, sorted ascending.
+
+    Volume columns, in the order of the CSV file: energy imported and exported before hourly balancing,
+    energy imported and exported after hourly balancing.
+    """
+
+    COLUMNS = ("import_before", "export_before", "import_after", "export_after")
+
+    def __init__(self, timezone: tzinfo) -> None:
+        self.timezone = timezone
+        self.timestamps = array("q")
+        self.import_before = array("d")
+        self.export_before = array("d")
+        self.import_after = array("d")
+        self.export_after = array("d")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, timestamp: int, volumes: Volumes) -> None:
+        self.timestamps.append(timestamp)
+
+        for column, volume in zip(self.columns(), volumes):
+            column.append(volume)
+
+    def extend(self, other: HourlyData) -> None:
+        self.timestamps.extend(other.timestamps)
+
+        for column, other_column in zip(self.columns(), other.columns()):
+            column.extend(other_column)
+
+    def columns(self) -> tuple[array[float], array[float], array[float], array[float]]:
+        return self.import_before, self.export_before, self.import_after, self.export_after
+
+    def volumes(self, index: int) -> Volumes:
+        return self.import_before[index], self.export_before[index], self.import_after[index], self.export_after[index]
+
+    def index(self, timestamp: int) -> int | None:
+        """Position of the hour starting at timestamp, in constant time when there are no gaps before it."""
+        if not self.timestamps:
+            return None
+
+        index = (timestamp - self.timestamps[0]) // HOUR
+
+        if 0 <= index < len(self.timestamps) and self.timestamps[index] == timestamp:
+            return index
+
+        index = bisect_left(self.timestamps, timestamp)
+
+        return index if index < len(self.timestamps) and self.timestamps[index] == timestamp else None
+
+    def slice(self, start: int, end: int) -> HourlyData:
+        """Hours starting in [start, end)."""
+        start_index = bisect_left(self.timestamps, start)
+        end_index = bisect_left(self.timestamps, end)
+
+        result = HourlyData(self.timezone)
+        result.timestamps = self.timestamps[start_index:end_index]
+        (
+            result.import_before,
+            result.export_before,
+            result.import_after,
+            result.export_after,
+        ) = (column[start_index:end_index] for column in self.columns())
+
+        return result
+
+    def sum_by_day(self) -> dict[str, Volumes]:
+        """Volumes summed per local day, keyed by YYYY-MM-DD."""
+        return self._sum_by(lambda day: day.isoformat())
+
+    def sum_by_month(self) -> dict[str, Volumes]:
+        """Volumes summed per local month, keyed by MM.YYYY."""
+        return self._sum_by(lambda day: f"{day.month:02d}.{day.year}")
+
+    def days(self) -> Iterator[tuple[str, int, int]]:
+        """Local days as (YYYY-MM-DD, start index, end index), converting timestamps to local time once per day."""
+        index = 0
+
+        while index < len(self.timestamps):
+            day = datetime.fromtimestamp(self.timestamps[index], self.timezone).date()
+            next_day = datetime.combine(day + timedelta(days=1), datetime.min.time(), self.timezone)
+            next_day_start = int(next_day.timestamp())
+            end_index = bisect_left(self.timestamps, next_day_start, index)
+
+            yield day.isoformat(), index, end_index
+
+            index = end_index
+
+    def _sum_by(self, key: Callable[[date_type], str]) -> dict[str, Volumes]:
+        sums: dict[str, list[float]] = {}
+
+        for day, start_index, end_index in self.days():
+            day_sums = sums.setdefault(key(date_type.fromisoformat(day)), [0.0, 0.0, 0.0, 0.0])
+
+            for position, column in enumerate(self.columns()):
+                day_sums[position] += sum(column[start_index:end_index])
+
+        return {name: (values[0], values[1], values[2], values[3]) for name, values in sums.items()}
+
+class Parser:
+    @staticmethod
+    def call(data: str | Iterable[str], timezone: tzinfo) -> HourlyData:
+        """Parse sanitized CSV, given as a string or as lines, into columnar hourly data."""
+        hourly_data = HourlyData(timezone)
+        lines = data.splitlines() if isinstance(data, str) else data
+
+        Parser._parse(lines, hourly_data, TimeNormalizer(timezone))
+
+        return hourly_data
+
+    @staticmethod
+    def tap(pieces: Iterable[str], hourly_data: HourlyData) -> Iterator[str]:
+        """Pass through pieces ending with full lines, parsing them into hourly_data on the way."""
+        time_normalizer = TimeNormalizer(hourly_data.timezone)
+
+        for piece in pieces:
+            Parser._parse(piece.split("\n"), hourly_data, time_normalizer)
+
+            yield piece
+
+    @staticmethod
+    def _parse(lines: Iterable[str], hourly_data: HourlyData, time_normalizer: TimeNormalizer) -> None:
+        for line in lines:
+            match = TIMESTAMP_PATTERN.match(line)
+
+            if not match:
+                continue
+
+            fields = [field.strip('"') for field in line.rstrip("\n").split(";")]
+
+            try:
+                volumes = (float(fields[1]), float(fields[2]), float(fields[3]), float(fields[4]))
+            except (IndexError, ValueError):
+                logger.warning("Skipping invalid row: %s", line.rstrip("\n"))
+                continue
+
+            normalized = time_normalizer.normalize(match.group(1))
+
+            if normalized is None:
+                logger.warning("Skipping row with nonexistent local hour: %s", line.rstrip("\n"))
+                continue
+
+            hourly_data.append(normalized[0], volumes)
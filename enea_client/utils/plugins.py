@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from enea_client.app import DateResult
+    from enea_client.config import Config
+    from enea_client.utils.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "enea_client.plugins"
+
+class Plugin(ABC):
+    """Base of post-processing plugins, created with the config of a run.
+
+    call receives the downloaded months in the order of config.dates while later months are still
+    downloading, and returns once the iterator is exhausted at the end of the downloads.
+    """
+
+    # Whether the plugin reads hourly_data of the months, months are parsed only if some plugin does
+    parsed = True
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+
+    @abstractmethod
+    def call(self, results: Iterator[DateResult]) -> None: ...
+
+class ScriptPlugin(Plugin):
+    """Run the post-processing script once with the paths of all changed files."""
+
+    parsed = False
+
+    def call(self, results: Iterator[DateResult]) -> None:
+        file_paths = [result.file_path for result in results if result.file_path is not None and result.changed]
+
+        if self.config.post_process_script and file_paths:
+            self.run(self.config.post_process_script, file_paths)
+
+    @staticmethod
+    def run(script: str, file_paths: list[Path]) -> None:
+        import subprocess
+
+        logger.info("Running post-processing script: %s, with %s files", script, file_paths)
+
+        subprocess.run([script, *map(str, file_paths)], check=True) # noqa: S603
+
+class PluginRunner:
+    """Run every plugin in its own thread, feeding it results as they come.
+
+    The first error of a plugin is raised by close, once all plugins are done.
+    """
+
+    def __init__(self, plugins: list[Plugin], metrics: Metrics) -> None:
+        self.metrics = metrics
+        self._queues: list[queue.Queue[DateResult | None]] = []
+        self._threads: list[threading.Thread] = []
+        self._errors: list[Exception] = []
+
+        for plugin in plugins:
+            results: queue.Queue[DateResult | None] = queue.Queue()
+            thread = threading.Thread(target=self._run, args=(plugin, results), name=type(plugin).__name__)
+            thread.start()
+            self._queues.append(results)
+            self._threads.append(thread)
+
+    def put(self, result: DateResult) -> None:
+        for results in self._queues:
+            results.put(result)
+
+    def close(self) -> None:
+        for results in self._queues:
+            results.put(None)
+
+        for thread in self._threads:
+            thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+    def _run(self, plugin: Plugin, results: queue.Queue[DateResult | None]) -> None:
+        waiting_seconds = 0.0
+
+        def receive() -> Iterator[DateResult]:
+            nonlocal waiting_seconds
+
+            while True:
+                started_at = time.perf_counter()
+                result = results.get()
+                waiting_seconds += time.perf_counter() - started_at
+
+                if result is None:
+                    return
+
+                yield result
+
+        started_at = time.perf_counter()
+
+        try:
+            plugin.call(receive())
+        except Exception as error: # noqa: BLE001
+            logger.error("Plugin failed: %s, error - %s", type(plugin).__name__, error)
+            self._errors.append(error)
+        finally:
+            # Time spent waiting for downloads is not post-processing
+            self.metrics.record("post_process", time.perf_counter() - started_at - waiting_seconds)
+
+def load_plugins(config: Config) -> list[Plugin]:
+    """Plugins of the run: the post-processing script, then config.plugins in order.
+
+    A plugin is an entry point name in the enea_client.plugins group or a module:attribute path, naming a
+    Plugin subclass or another callable that takes the config and returns a plugin.
+    """
+    plugins: list[Plugin] = [ScriptPlugin(config)] if config.post_process_script else []
+    plugins.extend(load_plugin(name)(config) for name in config.plugins)
+
+    return plugins
+
+def load_plugin(name: str) -> type[Plugin]:
+    if ":" in name:
+        module_name, _, attribute = name.partition(":")
+
+        try:
+            plugin_class: type[Plugin] = getattr(importlib.import_module(module_name), attribute)
+        except (ImportError, AttributeError) as error:
+            msg = f"Cannot load plugin {name}: {error}"
+            raise ValueError(msg) from error
+
+        return plugin_class
+
+    from importlib.metadata import distributions
+
+    # Entry points of every distribution, the same on all supported Python versions unlike entry_points()
+    for distribution in distributions():
+        for entry_point in distribution.entry_points:
+            if entry_point.group == ENTRY_POINT_GROUP and entry_point.name == name:
+                return cast("type[Plugin]", entry_point.load())
+
+    msg = f"Unknown plugin: {name}, expected an entry point of {ENTRY_POINT_GROUP} or module:attribute"
+    raise ValueError(msg)
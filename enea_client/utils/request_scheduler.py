@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from enea_client.config import Config
+
+class RequestScheduler:
+    """Retries with exponential backoff and full jitter, and a requests-per-second cap shared by all sessions
+    using the scheduler.
+    """
+
+    RETRY_STATUSES = frozenset({
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    })
+
+    def __init__(
+        self,
+        retries: int = 0,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        requests_per_second: float = 0.0,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.interval = 1 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    @staticmethod
+    def from_config(config: Config) -> RequestScheduler:
+        return RequestScheduler(
+            retries=config.retries,
+            backoff=config.retry_backoff,
+            requests_per_second=config.requests_per_second,
+        )
+
+    def wait(self) -> None:
+        """Block until the next request slot, reserving it for the caller."""
+        delay = self.reserve()
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def reserve(self) -> float:
+        """Reserve the next request slot and return the time to wait for it, for callers that cannot block."""
+        if not self.interval:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        return slot - now
+
+    def delays(self) -> Iterator[float]:
+        """Delays before every retry of a request."""
+        for attempt in range(self.retries):
+            yield random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)) # noqa: S311
+
+    def should_retry(self, status: int) -> bool:
+        return status in self.RETRY_STATUSES
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import calendar
+import logging
+import zlib
+from datetime import date as date_type
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from enea_client.utils.month import parse_month
+
+if TYPE_CHECKING:
+    from enea_client.utils.json_stream import Readable
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Raw portal responses of data requests, zlib-compressed in one file per POD, duration and date.
+
+    Responses are cached as downloaded, periods past the settle window are served from the cache instead
+    of the portal, and all cached periods in offline mode.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+    def get(self, pod_guid: str, duration: str, date: str) -> bytes | None:
+        file_path = self.file_path(pod_guid, duration, date)
+
+        try:
+            return zlib.decompress(file_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except zlib.error:
+            logger.warning("Ignoring corrupted cached response: %s", file_path)
+            return None
+
+    def set(self, pod_guid: str, duration: str, date: str, compressed_body: bytes) -> None:
+        file_path = self.file_path(pod_guid, duration, date)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        temporary_path = file_path.with_name(f".{file_path.name}.tmp")
+        temporary_path.write_bytes(compressed_body)
+        temporary_path.replace(file_path)
+
+    def delete(self, pod_guid: str, duration: str, date: str) -> None:
+        self.file_path(pod_guid, duration, date).unlink(missing_ok=True)
+
+    def file_path(self, pod_guid: str, duration: str, date: str) -> Path:
+        return self.path / pod_guid / f"{duration}-{date}.json.zz"
+
+    @staticmethod
+    def is_settled(duration: str, date: str, today: date_type, settle_days: int) -> bool:
+        """Whether the month (MM.YYYY) or day (DD.MM.YYYY) ended more than settle_days before today."""
+        if duration == "day":
+            last_day = datetime.strptime(date, "%d.%m.%Y").date() # noqa: DTZ007
+        else:
+            year, month = parse_month(date)
+            last_day = date_type(year, month, calendar.monthrange(year, month)[1])
+
+        return (today - last_day).days > settle_days
+
+class RecordingReader:
+    """Pass reads of a response through, compressing everything read for the cache."""
+
+    def __init__(self, source: Readable) -> None:
+        self.source = source
+        self._compressor = zlib.compressobj()
+        self._compressed_chunks: list[bytes] = []
+
+    def read(self, amt: int) -> bytes:
+        data = self.source.read(amt)
+        self._compressed_chunks.append(self._compressor.compress(data))
+
+        return data
+
+    def compressed(self) -> bytes:
+        return b"".join(self._compressed_chunks) + self._compressor.flush()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+
+from enea_client.utils.file_store import FileStore
+from enea_client.utils.month import MONTH_PATTERN, parse_month
+from enea_client.utils.parser import HourlyData, Parser
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from enea_client.config import Config
+
+logger = logging.getLogger(__name__)
+
+class Totals(TypedDict):
+    hours: int
+    import_before: float
+    export_before: float
+    import_after: float
+    export_after: float
+    # Energy imported minus energy exported after hourly balancing, negative for a surplus
+    net_after: float
+
+class MonthRollup(TypedDict):
+    # Size and modification time of the month file the rollup was computed from
+    size: int
+    mtime_ns: int
+    total: Totals
+    days: dict[str, Totals]
+
+class RollupStore:
+    """Daily and monthly totals of the month files, kept per POD next to them.
+
+    A rollup is valid while its month file keeps its size and modification time, unchanged files are
+    never rewritten, so only months whose content changed are parsed again.
+    """
+
+    FILE_NAME = ".enea_client_rollups.json"
+
+    def __init__(self, output_dir: str) -> None:
+        self.path = Path(output_dir) / self.FILE_NAME
+        self._lock = threading.Lock()
+        self._rollups: dict[str, dict[str, MonthRollup]] = {}
+        self._changed = False
+
+        if self.path.exists():
+            try:
+                self._rollups = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring corrupted rollups file: %s", self.path)
+
+    def get(self, pod_guid: str, date: str, file_path: Path) -> MonthRollup | None:
+        """Rollup of the month, if the month file has not changed since it was computed."""
+        with self._lock:
+            month_rollup = self._rollups.get(pod_guid, {}).get(date)
+
+        if month_rollup is None:
+            return None
+
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return None
+
+        if (month_rollup["size"], month_rollup["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            return None
+
+        return month_rollup
+
+    def set(self, pod_guid: str, date: str, file_path: Path, hourly_data: HourlyData) -> MonthRollup:
+        stat = file_path.stat()
+        total, days = self.rollup(hourly_data)
+        month_rollup = MonthRollup(size=stat.st_size, mtime_ns=stat.st_mtime_ns, total=total, days=days)
+
+        with self._lock:
+            self._rollups.setdefault(pod_guid, {})[date] = month_rollup
+            self._changed = True
+
+        return month_rollup
+
+    def refresh(
+        self,
+        config: Config,
+        dates: list[str],
+        hourly_data: dict[str, HourlyData] | None = None,
+    ) -> dict[str, MonthRollup]:
+        """Rollups of the stored months among dates, computing only missing and outdated ones, then save them.
+
+        Parsed hourly data of a month is used if given, otherwise the month file is parsed.
+        """
+        month_rollups = {}
+
+        for date in dates:
+            file_path = FileStore.path(config, date)
+
+            if not file_path.exists():
+                continue
+
+            month_rollup = self.get(config.enea_pod_guid, date, file_path)
+
+            if month_rollup is None:
+                month_data = (hourly_data or {}).get(date)
+
+                if month_data is None:
+                    with file_path.open(encoding="utf-8", newline="\n") as month_file:
+                        month_data = Parser.call(month_file, config.enea_timezone)
+
+                month_rollup = self.set(config.enea_pod_guid, date, file_path, month_data)
+
+            month_rollups[date] = month_rollup
+
+        if self._changed:
+            self.save()
+
+        return month_rollups
+
+    def save(self) -> None:
+        with self._lock:
+            temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+            temporary_path.write_text(json.dumps(self._rollups, indent=2, sort_keys=True), encoding="utf-8")
+            temporary_path.replace(self.path)
+            self._changed = False
+
+    @staticmethod
+    def summary(config: Config) -> str:
+        """Rollups of the configured months, or of all stored months without dates, as JSON."""
+        rollup_store = RollupStore(config.output_dir)
+        dates = config.dates or RollupStore.stored_dates(config.output_dir)
+        month_rollups = rollup_store.refresh(config, dates)
+
+        return json.dumps({
+            date: {"total": month_rollup["total"], "days": month_rollup["days"]}
+            for date, month_rollup in month_rollups.items()
+        }, indent=2)
+
+    @staticmethod
+    def stored_dates(output_dir: str) -> list[str]:
+        dates = [path.stem for path in Path(output_dir).glob("*.csv") if MONTH_PATTERN.fullmatch(path.stem)]
+
+        return sorted(dates, key=parse_month)
+
+    @staticmethod
+    def rollup(hourly_data: HourlyData) -> tuple[Totals, dict[str, Totals]]:
+        """Daily totals and the monthly total from them."""
+        day_sums = hourly_data.sum_by_day()
+        days = {
+            day: RollupStore._totals(end_index - start_index, day_sums[day])
+            for day, start_index, end_index in hourly_data.days()
+        }
+        total = [sum(sums[position] for sums in day_sums.values()) for position in range(len(HourlyData.COLUMNS))]
+
+        return RollupStore._totals(len(hourly_data), total), days
+
+    @staticmethod
+    def _totals(hours: int, sums: Sequence[float]) -> Totals:
+        # Volumes have three decimal places, rounding drops floating point noise of the sums
+        return Totals(
+            hours=hours,
+            import_before=round(sums[0], 3),
+            export_before=round(sums[1], 3),
+            import_after=round(sums[2], 3),
+            export_after=round(sums[3], 3),
+            net_after=round(sums[2] - sums[3], 3),
+        )
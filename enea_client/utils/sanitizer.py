@@ -2,17 +2,83 @@ from __future__ import annotations
 
 import logging
 import re
+from itertools import islice
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import TextIO
 
 logger = logging.getLogger(__name__)
 
+PLACEHOLDER = '"---"'
+PLACEHOLDER_LINE_PATTERN = re.compile(r'^.*"---".*\n?', flags=re.MULTILINE)
+# Same matches as (\u0000|"="|""\u0000) and (?<=\d),(?=\d), but starting with a literal lets the regex engine
+# skip quickly to candidate positions
+UNWANTED_PATTERN = re.compile(r'\u0000|"(?:="|"\u0000)')
+DECIMAL_COMMA_PATTERN = re.compile(r",(?<=\d,)(?=\d)")
+
 class Sanitizer:
     @staticmethod
     def call(data: str) -> str:
+        return "".join(Sanitizer.stream(Sanitizer.chunks(data), block_size=1))
+
+    @staticmethod
+    def stream(pieces: Iterable[str], block_size: int = 1024) -> Iterator[str]:
+        """Sanitize text in one pass, joining block_size pieces at a time.
+
+        Every piece has to end with "\\n" (except the last one), e.g. lines of a file opened with newline="\\n"
+        or Sanitizer.chunks. None of the patterns spans a line break, so sanitizing block by block gives the same
+        result as sanitizing the whole data, while only one block is held in memory.
+        """
+        iterator = iter(pieces)
+
+        while True:
+            block = list(islice(iterator, block_size))
+
+            if not block:
+                return
+
+            yield Sanitizer._sanitize_block("".join(block))
+
+    @staticmethod
+    def chunks(data: str, size: int = 65536) -> Iterator[str]:
+        """Split data into pieces of at least size characters, each ending with a full line."""
+        start = 0
+
+        while start < len(data):
+            end = data.find("\n", start + size) + 1 or len(data)
+            yield data[start:end]
+            start = end
+
+    @staticmethod
+    def align(chunks: Iterable[str]) -> Iterator[str]:
+        """Re-split arbitrary text chunks into pieces ending with a full line."""
+        remainder = ""
+
+        for chunk in chunks:
+            text = remainder + chunk
+            end = text.rfind("\n") + 1
+            remainder = text[end:]
+
+            if end:
+                yield text[:end]
+
+        if remainder:
+            yield remainder
+
+    @staticmethod
+    def write(pieces: Iterable[str], output: TextIO, block_size: int = 1024) -> None:
+        output.writelines(Sanitizer.stream(pieces, block_size))
+
+    @staticmethod
+    def _sanitize_block(block: str) -> str:
         # Drop lines containing "---"
-        data = re.sub(r'^.*"---".*\n?', "", data, flags=re.MULTILINE)
+        if PLACEHOLDER in block:
+            block = PLACEHOLDER_LINE_PATTERN.sub("", block)
 
         # Remove unwanted characters: null bytes and specific patterns
-        data = re.sub(r'(\u0000|"="|""\u0000)', "", data)
+        block = UNWANTED_PATTERN.sub("", block)
 
         # Replace commas in numbers with dots (e.g., 1,23 -> 1.23)
-        return re.sub(r"(?<=\d),(?=\d)", ".", data)
+        return DECIMAL_COMMA_PATTERN.sub(".", block)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import http.client as http_client
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from enea_client.utils.connection import create_connection
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from enea_client.utils.metrics import Metrics
+    from enea_client.utils.request_scheduler import RequestScheduler
+
+logger = logging.getLogger(__name__)
+
+# Timings of the latest requests kept by a session, long-running sessions do not grow without bound
+MAX_TIMINGS = 100
+
+@dataclass
+class RequestTiming:
+    method: str
+    path: str
+    status: int
+    elapsed: float
+
+class Session:
+    """Single keep-alive HTTP/1.1 connection shared by consecutive requests.
+
+    With a scheduler, requests wait for their rate limit slot and are retried on connection errors
+    and transient statuses. With metrics, connecting and waiting for response headers are recorded
+    as the connect, tls and request stages.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: int,
+        scheduler: RequestScheduler | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.timings: deque[RequestTiming] = deque(maxlen=MAX_TIMINGS)
+        self._connection: http_client.HTTPConnection | None = None
+
+    @contextmanager
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Generator[http_client.HTTPResponse, None, None]:
+        started_at = time.perf_counter()
+        response = self._schedule(method, path, body, headers or {})
+
+        try:
+            yield response
+        finally:
+            # Drain the body so the connection can be reused by the next request
+            response.read()
+            response.close()
+
+            timing = RequestTiming(method, path, response.status, time.perf_counter() - started_at)
+            self.timings.append(timing)
+            logger.debug("Request %s %s: status - %s, time - %.3fs", method, path, timing.status, timing.elapsed)
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _schedule(self, method: str, path: str, body: str | None, headers: dict[str, str]) -> http_client.HTTPResponse:
+        if self.scheduler is None:
+            return self._send(method, path, body, headers)
+
+        delays = self.scheduler.delays()
+
+        while True:
+            self.scheduler.wait()
+
+            try:
+                response = self._send(method, path, body, headers)
+            except (OSError, http_client.HTTPException) as error:
+                delay = next(delays, None)
+
+                if delay is None:
+                    raise
+
+                self.close()
+                logger.warning("Request %s %s failed: %s, retrying in %.1fs", method, path, error, delay)
+            else:
+                delay = next(delays, None) if self.scheduler.should_retry(response.status) else None
+
+                if delay is None:
+                    return response
+
+                response.read()
+                response.close()
+                delay = max(delay, min(self._retry_after(response), self.scheduler.max_backoff))
+                logger.warning(
+                    "Request %s %s failed: status - %s, retrying in %.1fs", method, path, response.status, delay,
+                )
+
+            time.sleep(delay)
+
+    @staticmethod
+    def _retry_after(response: http_client.HTTPResponse) -> float:
+        """Delay requested by the server in seconds, dates are not supported."""
+        retry_after = response.getheader("Retry-After", "")
+
+        return float(retry_after) if retry_after.isdigit() else 0.0
+
+    def _send(self, method: str, path: str, body: str | None, headers: dict[str, str]) -> http_client.HTTPResponse:
+        if self._connection is None:
+            self._connection = create_connection(self.url, self.timeout, self.metrics)
+
+        # An open socket means the connection is being reused and the server may have dropped it meanwhile
+        reused = self._connection.sock is not None
+
+        try:
+            # Connect first, so the request stage covers only sending the request and waiting for the headers
+            if not reused:
+                self._connection.connect()
+
+            started_at = time.perf_counter()
+            self._connection.request(method, path, body=body, headers=headers)
+            response = self._connection.getresponse()
+        except ConnectionError:
+            self.close()
+
+            if not reused:
+                raise
+
+            logger.debug("Connection closed by server, reconnecting")
+            return self._send(method, path, body, headers)
+
+        if self.metrics is not None:
+            self.metrics.record("request", time.perf_counter() - started_at)
+
+        return response
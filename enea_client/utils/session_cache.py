@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TypedDict
+
+logger = logging.getLogger(__name__)
+
+class CachedSession(TypedDict):
+    cookie: str
+    expires_at: float
+
+class SessionCache:
+    """Signed session cookies kept across runs, per login and portal URL, in a file readable only by its owner."""
+
+    # Used when the portal does not set an expiry on the cookie
+    DEFAULT_TTL = 3600
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+    def get(self, key: str) -> str | None:
+        """Cookie cached under key, unless it has expired."""
+        with self._lock:
+            cached_session = self._load().get(key)
+
+        if cached_session is None or cached_session["expires_at"] <= time.time():
+            return None
+
+        return cached_session["cookie"]
+
+    def set(self, key: str, cookie: str) -> None:
+        with self._lock:
+            sessions = self._load()
+            sessions[key] = CachedSession(cookie=cookie, expires_at=self.expires_at(cookie))
+            self._save(sessions)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            sessions = self._load()
+
+            if sessions.pop(key, None) is not None:
+                self._save(sessions)
+
+    @staticmethod
+    def expires_at(cookie: str, now: float | None = None) -> float:
+        """Expiry of a Set-Cookie value from its Max-Age or Expires attribute."""
+        now = time.time() if now is None else now
+        attributes = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (attribute.partition("=") for attribute in cookie.split(";")[1:])
+        }
+
+        try:
+            if "max-age" in attributes:
+                return now + int(attributes["max-age"])
+
+            if "expires" in attributes:
+                return parsedate_to_datetime(attributes["expires"]).timestamp()
+        except (TypeError, ValueError):
+            logger.debug("Ignoring invalid cookie expiry: %s", cookie)
+
+        return now + SessionCache.DEFAULT_TTL
+
+    def _load(self) -> dict[str, CachedSession]:
+        if not self.path.exists():
+            return {}
+
+        try:
+            sessions: dict[str, CachedSession] = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            logger.warning("Ignoring corrupted session cache: %s", self.path)
+            return {}
+
+        return sessions
+
+    def _save(self, sessions: dict[str, CachedSession]) -> None:
+        temporary_path = self.path.with_name(f".{self.path.name}.tmp")
+
+        # Created with owner-only permissions, so the cookie is never readable by others
+        descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        with os.fdopen(descriptor, "w", encoding="utf-8") as temporary_file:
+            json.dump(sessions, temporary_file, indent=2, sort_keys=True)
+
+        temporary_path.chmod(0o600)
+        temporary_path.replace(self.path)
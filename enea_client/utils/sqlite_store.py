@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+from itertools import repeat
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from enea_client.utils.parser import HourlyData
+
+if TYPE_CHECKING:
+    from datetime import tzinfo
+
+    from enea_client.config import Config
+
+logger = logging.getLogger(__name__)
+
+class SqliteStore:
+    """Hourly data in a SQLite database, one row per POD and hour, keyed by (pod, timestamp).
+
+    Rows are upserted, so saving a month again replaces its hours instead of duplicating them.
+    """
+
+    FILE_NAME = "enea_client.sqlite"
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS hourly ("
+        "pod TEXT NOT NULL, "
+        "timestamp INTEGER NOT NULL, "
+        "import_before REAL NOT NULL, "
+        "export_before REAL NOT NULL, "
+        "import_after REAL NOT NULL, "
+        "export_after REAL NOT NULL, "
+        "PRIMARY KEY (pod, timestamp)"
+        ") WITHOUT ROWID"
+    )
+
+    @staticmethod
+    def call(config: Config, hourly_data: HourlyData) -> Path:
+        path = SqliteStore.path(config)
+
+        logger.info("Saving %s hours to: %s", len(hourly_data), path)
+
+        connection = SqliteStore.connect(path)
+
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO hourly VALUES (?, ?, ?, ?, ?, ?)",
+                    zip(repeat(config.enea_pod_guid), hourly_data.timestamps, *hourly_data.columns()),
+                )
+        finally:
+            connection.close()
+
+        return path
+
+    @staticmethod
+    def read(path: Path, pod: str, start: int, end: int, timezone: tzinfo) -> HourlyData:
+        """Hours of the POD starting in [start, end)."""
+        hourly_data = HourlyData(timezone)
+        connection = SqliteStore.connect(path)
+
+        try:
+            rows = connection.execute(
+                "SELECT timestamp, import_before, export_before, import_after, export_after FROM hourly "
+                "WHERE pod = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+                (pod, start, end),
+            )
+
+            for timestamp, import_before, export_before, import_after, export_after in rows:
+                hourly_data.append(timestamp, (import_before, export_before, import_after, export_after))
+        finally:
+            connection.close()
+
+        return hourly_data
+
+    @staticmethod
+    def connect(path: Path) -> sqlite3.Connection:
+        # Months downloaded concurrently wait for each other's transactions instead of failing
+        connection = sqlite3.connect(path, timeout=60)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(SqliteStore.SCHEMA)
+
+        return connection
+
+    @staticmethod
+    def path(config: Config) -> Path:
+        return Path(config.output_dir) / SqliteStore.FILE_NAME
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_PATTERN = re.compile(r'^"?(\d{4}-\d{2}-\d{2} \d{2}:\d{2})')
+
+class MonthState(TypedDict):
+    last_timestamp: str
+    sha256: str
+
+class StateStore:
+    """Index of downloaded months with their last hour and content hash, kept per POD."""
+
+    FILE_NAME = ".enea_client_state.json"
+
+    def __init__(self, output_dir: str) -> None:
+        self.path = Path(output_dir) / self.FILE_NAME
+        self._lock = threading.Lock()
+        self._state: dict[str, dict[str, MonthState]] = {}
+
+        if self.path.exists():
+            try:
+                self._state = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring corrupted state file: %s", self.path)
+
+    def get(self, pod_guid: str, date: str) -> MonthState | None:
+        with self._lock:
+            return self._state.get(pod_guid, {}).get(date)
+
+    def set(self, pod_guid: str, date: str, month_state: MonthState) -> None:
+        with self._lock:
+            self._state.setdefault(pod_guid, {})[date] = month_state
+
+    def save(self) -> None:
+        with self._lock:
+            temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+            temporary_path.write_text(json.dumps(self._state, indent=2, sort_keys=True), encoding="utf-8")
+            temporary_path.replace(self.path)
+
+    @staticmethod
+    def month_state(data: str) -> MonthState:
+        return MonthState(
+            last_timestamp=StateStore.last_timestamp(data),
+            sha256=hashlib.sha256(data.encode("utf-8")).hexdigest(),
+        )
+
+    @staticmethod
+    def last_timestamp(data: str) -> str:
+        for line in reversed(data.splitlines()):
+            match = TIMESTAMP_PATTERN.match(line)
+
+            if match:
+                return match.group(1)
+
+        return ""
+
+class MonthStateBuilder:
+    """Computes the month state of data passing through tap, without keeping the whole data."""
+
+    TAIL_SIZE = 4096
+
+    def __init__(self) -> None:
+        self._sha256 = hashlib.sha256()
+        self._tail = ""
+
+    def tap(self, pieces: Iterable[str]) -> Iterator[str]:
+        for piece in pieces:
+            self._sha256.update(piece.encode("utf-8"))
+            self._tail = (self._tail + piece)[-self.TAIL_SIZE:]
+
+            yield piece
+
+    def month_state(self) -> MonthState:
+        return MonthState(
+            last_timestamp=StateStore.last_timestamp(self._tail),
+            sha256=self._sha256.hexdigest(),
+        )
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import io
+import logging
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from enea_client.utils.state_store import TIMESTAMP_PATTERN
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import tzinfo
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+HOUR = 3600
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+ISO_COLUMN = '"Data (ISO 8601)"'
+
+# (UTC start, UTC end, UTC offset) of a period with a constant offset, all in seconds
+Segment = tuple[int, int, int]
+
+class TimeNormalizer:
+    """Convert local "YYYY-MM-DD HH:59" hour labels to unambiguous UTC timestamps.
+
+    UTC offsets come from a per month transition table, built with a few zoneinfo lookups per month instead of
+    one per row. Labels of the repeated hour on the DST fall day map to the earlier hour on first occurrence and
+    to the later hour on the second one. Labels in the spring forward gap do not exist and map to None.
+    """
+
+    def __init__(self, timezone: tzinfo) -> None:
+        self.timezone = timezone
+        self._tables: dict[tuple[int, int], list[Segment]] = {}
+        self._seen_ambiguous: set[str] = set()
+
+    def normalize(self, label: str) -> tuple[int, int] | None:
+        """Return (epoch seconds of the start of the hour, UTC offset in seconds) for the hour label."""
+        year, month, day, hour = int(label[0:4]), int(label[5:7]), int(label[8:10]), int(label[11:13])
+        local = (date(year, month, day).toordinal() - EPOCH_ORDINAL) * DAY + hour * HOUR
+
+        candidates = [
+            (local - offset, offset)
+            for start, end, offset in self.table(year, month)
+            if start <= local - offset < end
+        ]
+
+        if not candidates:
+            return None
+
+        if len(candidates) > 1 and label in self._seen_ambiguous:
+            return candidates[1]
+
+        if len(candidates) > 1:
+            self._seen_ambiguous.add(label)
+
+        return candidates[0]
+
+    def table(self, year: int, month: int) -> list[Segment]:
+        """Periods with a constant UTC offset covering the month, with one day of margin on both sides."""
+        if (year, month) not in self._tables:
+            next_month = date(year + month // 12, month % 12 + 1, 1)
+            start = (date(year, month, 1).toordinal() - EPOCH_ORDINAL - 1) * DAY
+            end = (next_month.toordinal() - EPOCH_ORDINAL + 1) * DAY
+
+            segments = []
+            segment_start, offset = start, self._offset(start)
+
+            # Offsets are compared once per day, transitions are located with a binary search
+            for day_start in range(start, end, DAY):
+                day_end = day_start + DAY
+                day_end_offset = self._offset(day_end)
+
+                if day_end_offset != offset:
+                    transition = self._find_transition(day_start, day_end, offset)
+                    segments.append((segment_start, transition, offset))
+                    segment_start, offset = transition, day_end_offset
+
+            segments.append((segment_start, end, offset))
+            self._tables[year, month] = segments
+
+        return self._tables[year, month]
+
+    def isoformat(self, label: str) -> str:
+        """ISO 8601 start of the hour with its UTC offset, or an empty string for a nonexistent hour."""
+        normalized = self.normalize(label)
+
+        if normalized is None:
+            logger.warning("Nonexistent local hour: %s", label)
+            return ""
+
+        timestamp, offset = normalized
+        local = datetime(1970, 1, 1) + timedelta(seconds=timestamp + offset) # noqa: DTZ001
+        sign = "-" if offset < 0 else "+"
+
+        return f"{local:%Y-%m-%dT%H:%M}{sign}{abs(offset) // HOUR:02d}:{abs(offset) % HOUR // 60:02d}"
+
+    def stream(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Append an ISO 8601 timestamp column to sanitized CSV given as pieces ending with full lines."""
+        header: list[str] = []
+        rows_started = False
+
+        for piece in pieces:
+            lines: list[str] = []
+
+            for line in io.StringIO(piece, newline="\n"):
+                match = TIMESTAMP_PATTERN.match(line)
+
+                if not match:
+                    (lines if rows_started else header).append(line)
+                    continue
+
+                if not rows_started:
+                    rows_started = True
+                    lines.extend(self._extend_header(header))
+
+                content = line.rstrip("\n")
+                lines.append(f'{content};"{self.isoformat(match.group(1))}"{line[len(content):]}')
+
+            yield "".join(lines)
+
+        # Data without rows is passed through unchanged
+        if not rows_started:
+            yield "".join(header)
+
+    def _extend_header(self, header: list[str]) -> list[str]:
+        if not header:
+            return []
+
+        content = header[-1].rstrip("\n")
+
+        return [*header[:-1], f"{content};{ISO_COLUMN}{header[-1][len(content):]}"]
+
+    def _offset(self, timestamp: int) -> int:
+        utc_offset = datetime.fromtimestamp(timestamp, self.timezone).utcoffset() or timedelta(0)
+
+        return int(utc_offset.total_seconds())
+
+    def _find_transition(self, start: int, end: int, offset: int) -> int:
+        """First second in (start, end] with a UTC offset different from offset."""
+        while end - start > 1:
+            middle = (start + end) // 2
+
+            if self._offset(middle) == offset:
+                start = middle
+            else:
+                end = middle
+
+        return end
@@ -21,4 +21,5 @@ def config(tmp_path: Path, httpserver: HTTPServer) -> Config:
         enea_pod_guid="test-pod-guid-123",
         enea_url=httpserver.url_for(""),
         output_dir=str(tmp_path),
+        retries=0,
     )
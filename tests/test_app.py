@@ -1,18 +1,35 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import TYPE_CHECKING
+import threading
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
 from unittest.mock import Mock, patch
 
-from enea_client.app import App
+import pytest
+
+from enea_client.app import App, DateResult
+from enea_client.client import ResponseError
+from enea_client.utils.binary_store import BinaryStore
+from enea_client.utils.completeness_index import CompletenessIndex
+from enea_client.utils.file_store import StoreResult
+from enea_client.utils.plugins import Plugin
+from enea_client.utils.rollup_store import RollupStore
+from enea_client.utils.sqlite_store import SqliteStore
+from enea_client.utils.state_store import StateStore
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from pytest import LogCaptureFixture
 
     from enea_client.config import Config
 
 
-@patch("enea_client.app.subprocess")
+@patch("subprocess.run")
 @patch("enea_client.app.FileStore")
 @patch("enea_client.app.Sanitizer")
 @patch("enea_client.app.Client")
@@ -20,21 +37,21 @@ def test_app_call_success_with_post_process(
     mock_client_class: Mock,
     mock_sanitizer: Mock,
     mock_file_store: Mock,
-    mock_subprocess: Mock,
+    mock_subprocess_run: Mock,
     config: Config,
     caplog: LogCaptureFixture,
 ) -> None:
     # Setup authenticated client with data
     mock_client = Mock()
     mock_client.authenticate.return_value = True
-    mock_client.get_data.return_value = {"test": "data"}
+    mock_client.get_data.return_value = "test data"
     mock_client_class.return_value = mock_client
 
     # Mock sanitizer to return processed data
-    mock_sanitizer.call.return_value = {"sanitized": "data"}
+    mock_sanitizer.call.return_value = "sanitized data"
 
     # Mock file store to return file path
-    mock_file_store.call.return_value = "/path/to/file.json"
+    mock_file_store.call.return_value = StoreResult(Path("/path/to/file.json"), changed=True)
 
     # Set up config with post-process script
     config.post_process_script = "/path/to/script.sh"
@@ -47,14 +64,14 @@ def test_app_call_success_with_post_process(
     # Verify key behaviors
     mock_client.authenticate.assert_called_once()
     mock_client.get_data.assert_called_once()
-    mock_sanitizer.call.assert_called_once_with({"test": "data"})
-    mock_file_store.call.assert_called_once_with(config, config.dates[0], {"sanitized": "data"})
+    mock_sanitizer.call.assert_called_once_with("test data")
+    mock_file_store.call.assert_called_once_with(config, config.dates[0], "sanitized data")
 
     # Verify post-processing script execution
-    mock_subprocess.run.assert_called_once_with(["/path/to/script.sh", "/path/to/file.json"], check=True)
+    mock_subprocess_run.assert_called_once_with(["/path/to/script.sh", "/path/to/file.json"], check=True)
 
     # Verify logging
-    assert "Running post-processing script: /path/to/script.sh, with ['/path/to/file.json'] files" in caplog.text
+    assert "Running post-processing script: /path/to/script.sh, with [PosixPath('/path/to/file.json')]" in caplog.text
 
 @patch("enea_client.app.Client")
 def test_app_call_authentication_failure(mock_client_class: Mock, config: Config) -> None:
@@ -90,3 +107,478 @@ def test_app_call_data_retrieval_failure(mock_client_class: Mock, config: Config
 
     # Verify error was logged
     assert "Failed to retrieve data" in caplog.text
+
+@patch("subprocess.run")
+@patch("enea_client.app.FileStore")
+@patch("enea_client.app.Sanitizer")
+@patch("enea_client.app.Client")
+def test_app_call_concurrent_keeps_order_and_reports_failures(
+    mock_client_class: Mock,
+    mock_sanitizer: Mock,
+    mock_file_store: Mock,
+    mock_subprocess_run: Mock,
+    config: Config,
+    caplog: LogCaptureFixture,
+) -> None:
+    responses = {
+        "01.2025": "data-01",
+        "02.2025": None,
+        "03.2025": OSError("timed out"),
+        # A page that is not JSON, e.g. of a maintenance break
+        "04.2025": json.JSONDecodeError("Expecting value", "<html>", 0),
+        "05.2025": "data-05",
+    }
+
+    def get_data(date: str, _pod_guid: str) -> str | None:
+        response = responses[date]
+
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.get_data.side_effect = get_data
+    mock_client_class.return_value = mock_client
+
+    mock_sanitizer.call.side_effect = lambda data: data
+    mock_file_store.call.side_effect = lambda _config, date, _data: StoreResult(
+        Path(f"/path/to/{date}.csv"), changed=True,
+    )
+
+    config.dates = list(responses)
+    config.concurrency = 4
+    config.post_process_script = "/path/to/script.sh"
+
+    with caplog.at_level(logging.ERROR):
+        App(config).call()
+
+    assert mock_client.get_data.call_count == 5
+    mock_client.close.assert_called_once()
+
+    # Post-processing receives the successful files in the order of config.dates
+    mock_subprocess_run.assert_called_once_with(
+        ["/path/to/script.sh", "/path/to/01.2025.csv", "/path/to/05.2025.csv"], check=True,
+    )
+
+    assert "Failed to retrieve data for date: 02.2025" in caplog.text
+    assert "Failed to retrieve data for date: 03.2025, error - timed out" in caplog.text
+    assert "Failed to retrieve data for date: 04.2025, error - Expecting value" in caplog.text
+    assert "Failed dates: 02.2025, 03.2025, 04.2025" in caplog.text
+
+@patch("subprocess.run")
+@patch("enea_client.app.Client")
+def test_app_call_sync(
+    mock_client_class: Mock,
+    mock_subprocess_run: Mock,
+    config: Config,
+    caplog: LogCaptureFixture,
+) -> None:
+    responses = {
+        "08.2025": "".join(
+            f'"2025-08-{day:02d} {hour:02d}:59";"0,507";"0";"0,507";"0"\n' for day in range(1, 32) for hour in range(24)
+        ),
+        "09.2025": '"2025-09-15 23:59";"0,507";"0";"0,507";"0"\n',
+    }
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.get_data.side_effect = lambda date, _pod_guid: responses[date]
+    mock_client_class.return_value = mock_client
+
+    config.dates = list(responses)
+    config.sync = True
+    config.post_process_script = "/path/to/script.sh"
+
+    # First run downloads and saves everything
+    App(config).call()
+
+    mock_subprocess_run.assert_called_once_with(
+        ["/path/to/script.sh", f"{config.output_dir}/08.2025.csv", f"{config.output_dir}/09.2025.csv"], check=True,
+    )
+
+    # Second run skips the complete closed month and does not rewrite the unchanged one
+    mock_client.get_data.reset_mock()
+    mock_subprocess_run.reset_mock()
+
+    with caplog.at_level(logging.INFO):
+        App(config).call()
+
+    mock_client.get_data.assert_called_once_with("09.2025", config.enea_pod_guid)
+    mock_subprocess_run.assert_not_called()
+    assert "Skipping complete month: 08.2025" in caplog.text
+    assert f"File unchanged: {config.output_dir}/09.2025.csv" in caplog.text
+
+    # Third run picks up new hours of the incomplete month
+    mock_subprocess_run.reset_mock()
+    responses["09.2025"] += '"2025-09-16 00:59";"0,503";"0";"0,503";"0"\n'
+
+    App(config).call()
+
+    mock_subprocess_run.assert_called_once_with(["/path/to/script.sh", f"{config.output_dir}/09.2025.csv"], check=True)
+
+    # Without the state, files with identical content are neither rewritten nor passed on
+    (Path(config.output_dir) / ".enea_client_state.json").unlink()
+    mock_subprocess_run.reset_mock()
+
+    App(config).call()
+
+    assert mock_client.get_data.call_count == 4
+    mock_subprocess_run.assert_not_called()
+
+    # A closed month with gaps in the completeness index is downloaded again, even if its last hour is stored
+    responses["08.2025"] = responses["08.2025"].replace('"2025-08-15 12:59";"0,507";"0";"0,507";"0"\n', "")
+    (Path(config.output_dir) / ".enea_client_state.json").unlink()
+    App(config).call()
+    mock_client.get_data.reset_mock()
+
+    App(config).call()
+
+    assert mock_client.get_data.call_count == 2
+    # Instead of being replayed from the response cache
+    mock_client.response_cache.delete.assert_any_call(config.enea_pod_guid, "month", "08.2025")
+
+@patch.object(App, "_today", return_value=date(2025, 9, 3))
+@patch("enea_client.app.Client")
+def test_app_call_delta(mock_client_class: Mock, _mock_today: Mock, config: Config, caplog: LogCaptureFixture) -> None:
+    month_rows = [f'"2025-09-01 {hour:02d}:59";"0,5";"0";"0,5";"0"' for hour in range(24)]
+    day_rows = {
+        "02.09.2025": [f'"2025-09-02 {hour:02d}:59";"0,5";"0";"0,5";"0"' for hour in range(24)],
+        "03.09.2025": ['"2025-09-03 00:59";"0,5";"0";"0,5";"0"'],
+    }
+
+    def get_data(date: str, _pod_guid: str, duration: str = "month") -> str:
+        rows = month_rows if duration == "month" else day_rows[date]
+
+        return "\n".join(['Data;"header"', *rows])
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.get_data.side_effect = get_data
+    mock_client_class.return_value = mock_client
+
+    config.delta = True
+    file_path = Path(config.output_dir) / "09.2025.csv"
+
+    # Without a stored month the whole month is downloaded
+    App(config).call()
+
+    mock_client.get_data.assert_called_once_with("09.2025", config.enea_pod_guid)
+
+    # Only missing days are downloaded and merged into the month file
+    mock_client.get_data.reset_mock()
+    App(config).call()
+
+    assert [call.args[0] for call in mock_client.get_data.call_args_list] == ["02.09.2025", "03.09.2025"]
+    assert file_path.read_text(encoding="utf-8").count('"0.5"') == 2 * 49
+
+    # A gap in the stored data falls back to the full month
+    mock_client.get_data.reset_mock()
+    day_rows["03.09.2025"] = []
+    file_path.write_text('Data;"header"\n"2025-09-02 00:59";"0.5";"0";"0.5";"0"', encoding="utf-8")
+
+    with caplog.at_level(logging.INFO):
+        App(config).call()
+
+    assert [call.args[0] for call in mock_client.get_data.call_args_list] == ["02.09.2025", "03.09.2025", "09.2025"]
+    assert "Falling back to full month download for date: 09.2025" in caplog.text
+
+@pytest.mark.parametrize(("month_data", "expected_calls"), [
+    ('Data;"header"\n', ["09.2025"]),
+    ('Data;"header"\n"2025-09-01 10:59";"0.5";"0";"0.5";"0"', ["01.09.2025", "09.2025"]),
+])
+@patch.object(App, "_today", return_value=date(2025, 9, 1))
+@patch("enea_client.app.Client")
+def test_app_call_delta_fallback(
+    mock_client_class: Mock,
+    _mock_today: Mock,
+    config: Config,
+    month_data: str,
+    expected_calls: list[str],
+) -> None:
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    # Failed day downloads fall back to the full month as well
+    mock_client.get_data.side_effect = lambda _date, _pod_guid, duration="month": (
+        'Data;"header"\n' if duration == "month" else None
+    )
+    mock_client_class.return_value = mock_client
+
+    config.delta = True
+    (Path(config.output_dir) / "09.2025.csv").write_text(month_data, encoding="utf-8")
+
+    App(config).call()
+
+    assert [call.args[0] for call in mock_client.get_data.call_args_list] == expected_calls
+
+@patch("enea_client.app.Client")
+def test_app_call_stream(mock_client_class: Mock, config: Config, caplog: LogCaptureFixture) -> None:
+    responses: dict[str, list[str] | Exception | None] = {
+        "08.2025": [
+            'Data;"header"\n\u0000"=""2025-08-31 22',
+            ':59"""\u0000;"0,507";"---"\n',
+            '"2025-08-31 23:59";"0,5"',
+        ],
+        "09.2025": None,
+        "10.2025": ResponseError("Error: message - {'success': 0}"),
+    }
+
+    @contextmanager
+    def open_data(date: str, _pod_guid: str) -> Iterator[Iterator[str] | None]:
+        response = responses[date]
+
+        def chunks() -> Iterator[str]:
+            if isinstance(response, Exception):
+                raise response
+
+            yield from response or []
+
+        yield None if response is None else chunks()
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.open_data.side_effect = open_data
+    mock_client_class.return_value = mock_client
+
+    config.dates = list(responses)
+    config.stream = True
+    config.sync = True
+
+    with caplog.at_level(logging.INFO):
+        App(config).call()
+
+    mock_client.get_data.assert_not_called()
+    file_path = Path(config.output_dir) / "08.2025.csv"
+    assert file_path.read_text(encoding="utf-8") == 'Data;"header"\n"2025-08-31 23:59";"0.5"'
+    assert not (Path(config.output_dir) / "10.2025.csv").exists()
+    assert "Failed to retrieve data for date: 09.2025" in caplog.text
+    assert "Failed to retrieve data for date: 10.2025, error - Error: message - {'success': 0}" in caplog.text
+
+    # The sync state is updated from the streamed data
+    state_store = StateStore(config.output_dir)
+    month_state = state_store.get(config.enea_pod_guid, "08.2025")
+    assert month_state is not None
+    assert month_state["last_timestamp"] == "2025-08-31 23:59"
+
+    # Without sync every streamed file counts as changed, but identical content is not written again
+    config.sync = False
+    config.post_process_script = "/path/to/script.sh"
+    modified_time = file_path.stat().st_mtime_ns
+
+    with patch("subprocess.run") as mock_subprocess_run:
+        App(config).call()
+
+    mock_subprocess_run.assert_called_once_with(["/path/to/script.sh", str(file_path)], check=True)
+    assert file_path.stat().st_mtime_ns == modified_time
+    assert not list(Path(config.output_dir).glob(".*.tmp"))
+
+@pytest.mark.parametrize("stream", [False, True])
+@patch("enea_client.app.Client")
+def test_app_call_normalize_timestamps(mock_client_class: Mock, config: Config, stream: bool) -> None: # noqa: FBT001
+    data = 'Data;"header"\n"2025-10-26 02:59";"0,5"\n"2025-10-26 02:59";"0,25"'
+
+    @contextmanager
+    def open_data(_date: str, _pod_guid: str) -> Iterator[Iterator[str]]:
+        yield iter([data])
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.get_data.return_value = data
+    mock_client.open_data.side_effect = open_data
+    mock_client_class.return_value = mock_client
+
+    config.dates = ["10.2025"]
+    config.normalize_timestamps = True
+    config.stream = stream
+
+    App(config).call()
+
+    assert (Path(config.output_dir) / "10.2025.csv").read_text(encoding="utf-8") == (
+        'Data;"header";"Data (ISO 8601)"\n'
+        '"2025-10-26 02:59";"0.5";"2025-10-26T02:00+02:00"\n'
+        '"2025-10-26 02:59";"0.25";"2025-10-26T02:00+01:00"'
+    )
+
+@pytest.mark.parametrize("stream", [False, True])
+@patch("enea_client.app.Client")
+def test_app_call_home_assistant(
+    mock_client_class: Mock, config: Config, caplog: LogCaptureFixture, stream: bool, # noqa: FBT001
+) -> None:
+    data = 'Data;"header"\n"2025-10-26 02:59";"0,5";"0";"0,25";"0"\n"2025-10-26 02:59";"1";"0";"0,75";"0"'
+
+    @contextmanager
+    def open_data(_date: str, _pod_guid: str) -> Iterator[Iterator[str]]:
+        yield iter([data])
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.get_data.return_value = data
+    mock_client.open_data.side_effect = open_data
+    mock_client_class.return_value = mock_client
+
+    config.dates = ["10.2025"]
+    config.stream = stream
+    config.home_assistant_config_dir = config.output_dir
+
+    App(config).call()
+
+    assert (Path(config.output_dir) / "enea_client.csv").read_text(encoding="utf-8").splitlines()[1:3] == [
+        "sensor.grid_import_energy,kWh,2025-10-26 00:00,0.25",
+        "sensor.grid_export_energy,kWh,2025-10-26 00:00,0.0",
+    ]
+
+    home_assistant_patch = patch("enea_client.utils.home_assistant.HomeAssistant")
+
+    with home_assistant_patch as mock_home_assistant_class, caplog.at_level(logging.ERROR):
+        mock_home_assistant_class.return_value.call.return_value = False
+        App(config).call()
+
+    mock_home_assistant_class.return_value.close.assert_called_once_with()
+    assert "Home Assistant import failed" in caplog.text
+
+@pytest.mark.parametrize("stream", [False, True])
+@patch("enea_client.app.Client")
+def test_app_call_output_formats(
+    mock_client_class: Mock, config: Config, caplog: LogCaptureFixture, stream: bool, # noqa: FBT001
+) -> None:
+    data = 'Data;"header"\n"2025-10-01 00:59";"0,5";"0";"0,25";"0"\n"2025-10-01 01:59";"1";"0";"0,75";"0"'
+
+    @contextmanager
+    def open_data(_date: str, _pod_guid: str) -> Iterator[Iterator[str]]:
+        yield iter([data])
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.get_data.return_value = data
+    mock_client.open_data.side_effect = open_data
+    mock_client_class.return_value = mock_client
+
+    config.dates = ["10.2025"]
+    config.stream = stream
+    config.output_formats = ["sqlite", "binary"]
+
+    App(config).call()
+
+    assert (Path(config.output_dir) / "10.2025.csv").exists()
+    assert len(SqliteStore.read(SqliteStore.path(config), config.enea_pod_guid, 0, 2**40, config.enea_timezone)) == 2
+    assert BinaryStore.read(BinaryStore.path(config), config.enea_timezone).import_after.tolist() == [0.25, 0.75]
+
+    # Rollups and the completeness index are kept by sync runs only
+    assert not (Path(config.output_dir) / RollupStore.FILE_NAME).exists()
+    assert not (Path(config.output_dir) / CompletenessIndex.FILE_NAME).exists()
+
+    SqliteStore.path(config).unlink()
+    SqliteStore.path(config).mkdir()
+
+    with caplog.at_level(logging.ERROR):
+        App(config).call()
+
+    assert "Failed to save sqlite output for date: 10.2025, error - " in caplog.text
+
+    # In sync mode outputs are not saved again for unchanged content, even without a sync state
+    config.sync = True
+    App(config).call()
+
+    # Rollups are updated from the parsed data
+    rollup_store = RollupStore(config.output_dir)
+    month_rollup = rollup_store.get(config.enea_pod_guid, "10.2025", Path(config.output_dir) / "10.2025.csv")
+    assert month_rollup is not None
+    assert month_rollup["total"]["import_after"] == 1.0
+
+    (Path(config.output_dir) / StateStore.FILE_NAME).unlink()
+    BinaryStore.path(config).unlink()
+    App(config).call()
+
+    assert not BinaryStore.path(config).exists()
+
+@pytest.mark.parametrize("stream", [False, True])
+@patch("subprocess.run")
+@patch("enea_client.app.Client")
+def test_app_call_metrics(
+    mock_client_class: Mock,
+    _mock_subprocess_run: Mock,
+    config: Config,
+    stream: bool, # noqa: FBT001
+) -> None:
+    data = 'Data;"header"\n"2025-09-01 00:59";"0,5"\n"2025-09-01 01:59";"0,25"'
+
+    @contextmanager
+    def open_data(_date: str, _pod_guid: str) -> Iterator[Iterator[str]]:
+        yield iter([data])
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.get_data.return_value = data
+    mock_client.open_data.side_effect = open_data
+    mock_client_class.return_value = mock_client
+
+    config.stream = stream
+    config.post_process_script = "/path/to/script.sh"
+    config.metrics_file = str(Path(config.output_dir) / "metrics.json")
+    config.prometheus_file = str(Path(config.output_dir) / "enea_client.prom")
+
+    app = App(config)
+    app.call()
+
+    # The client records the network stages into the metrics of the app
+    assert mock_client_class.call_args.kwargs["metrics"] is app.metrics
+
+    summary = json.loads(Path(config.metrics_file).read_text(encoding="utf-8"))
+    assert summary["dates"] == {config.enea_pod_guid: {"09.2025": {"rows": 2}}}
+    assert {"write", "post_process"} <= set(summary["stages"])
+    assert ("sanitize" in summary["stages"]) is not stream
+    assert 'enea_client_month_rows{pod="test-pod-guid-123",date="09.2025"} 2' in Path(
+        config.prometheus_file,
+    ).read_text(encoding="utf-8")
+
+class RecordingPlugin(Plugin):
+    """Records the months it receives with their first hourly value."""
+
+    instances: ClassVar[list[RecordingPlugin]] = []
+
+    def __init__(self, config: Config) -> None:
+        super().__init__(config)
+        self.received: list[tuple[str, float | None]] = []
+        self.first_received = threading.Event()
+        type(self).instances.append(self)
+
+    def call(self, results: Iterator[DateResult]) -> None:
+        for result in results:
+            import_after = result.hourly_data.import_after[0] if result.hourly_data is not None else None
+            self.received.append((result.date, import_after))
+            self.first_received.set()
+
+@patch("subprocess.run")
+@patch("enea_client.app.Client")
+def test_app_call_plugins(mock_client_class: Mock, mock_subprocess_run: Mock, config: Config) -> None:
+    def get_data(date: str, _pod_guid: str) -> str:
+        # The plugin receives the first month while the second one is downloading
+        if date == "10.2025":
+            assert RecordingPlugin.instances[-1].first_received.wait(timeout=5)
+
+        return f'"2025-{date[:2]}-01 00:59";"0,5";"0";"0,25";"0"\n'
+
+    mock_client = Mock()
+    mock_client.authenticate.return_value = True
+    mock_client.get_data.side_effect = get_data
+    mock_client_class.return_value = mock_client
+
+    config.dates = ["09.2025", "10.2025"]
+    config.post_process_script = "/path/to/script.sh"
+    config.plugins = [f"{__name__}:RecordingPlugin"]
+
+    App(config).call()
+
+    assert RecordingPlugin.instances[-1].received == [("09.2025", 0.25), ("10.2025", 0.25)]
+    mock_subprocess_run.assert_called_once_with(
+        ["/path/to/script.sh", f"{config.output_dir}/09.2025.csv", f"{config.output_dir}/10.2025.csv"], check=True,
+    )
+
+    # Errors of plugins fail the run once all plugins are done
+    mock_subprocess_run.side_effect = OSError("script failed")
+
+    with pytest.raises(OSError, match="script failed"):
+        App(config).call()
+
+    assert RecordingPlugin.instances[-1].received == [("09.2025", 0.25), ("10.2025", 0.25)]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from werkzeug import Response
+
+from enea_client.async_client import AsyncClient
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+    from pytest_httpserver import HTTPServer
+    from werkzeug import Request
+
+    from enea_client.config import Config
+
+
+def expect_login(httpserver: HTTPServer, signed_cookie: str = "SESSION=signed") -> None:
+    httpserver.expect_oneshot_request("/logowanie", method="GET").respond_with_data(
+        '<input type="hidden" name="token" value="token-123">',
+        headers={"Set-Cookie": "SESSION=unsigned; Path=/; HttpOnly"},
+    )
+    httpserver.expect_oneshot_request(
+        "/logowanie", method="POST", data="email=test%40example.com&password=test_password&token=token-123",
+    ).respond_with_data("", status=HTTPStatus.FOUND, headers={"Set-Cookie": signed_cookie})
+
+def test_async_client_concurrent_get_data(httpserver: HTTPServer, config: Config) -> None:
+    def respond(request: Request) -> Response:
+        assert request.headers["Cookie"] == "SESSION=signed"
+
+        return Response(json.dumps({"success": 1, "data": f"data {request.form['date']}"}))
+
+    expect_login(httpserver)
+    httpserver.expect_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_handler(respond)
+
+    async def fetch() -> list[str | None]:
+        client = AsyncClient(config, pool_size=2)
+
+        assert await client.authenticate() is True
+
+        try:
+            return list(await asyncio.gather(*(client.get_data(f"{month:02d}.2025") for month in range(1, 13))))
+        finally:
+            await client.close()
+
+    assert asyncio.run(fetch()) == [f"data {month:02d}.2025" for month in range(1, 13)]
+
+def test_async_client_reauthenticates_expired_session(httpserver: HTTPServer, config: Config) -> None:
+    httpserver.expect_oneshot_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_data(
+        "", status=HTTPStatus.FOUND, headers={"Location": "/logowanie"},
+    )
+    expect_login(httpserver, "SESSION=renewed")
+    httpserver.expect_oneshot_request(
+        "/meter/summaryBalancingChart/csv", method="POST", headers={"Cookie": "SESSION=renewed"},
+        data="duration=day&date=01.09.2025&pointOfDeliveryId=other-pod",
+    ).respond_with_json({"success": 1, "data": "data"})
+
+    async def fetch() -> str | None:
+        client = AsyncClient(config)
+        client.signed_cookie = "SESSION=expired"
+
+        try:
+            data = await client.get_data("01.09.2025", "other-pod", "day")
+
+            # A session renewed by another task meanwhile is not renewed again
+            await client._reauthenticate("SESSION=expired") # noqa: SLF001
+            return data
+        finally:
+            await client.close()
+
+    assert asyncio.run(fetch()) == "data"
+    assert len(httpserver.log) == 4
+
+def test_async_client_errors(httpserver: HTTPServer, config: Config, caplog: LogCaptureFixture) -> None:
+    httpserver.expect_oneshot_request("/logowanie", method="GET").respond_with_data("", status=500)
+    httpserver.expect_oneshot_request("/logowanie", method="GET").respond_with_data("no token")
+    expect_login(httpserver)
+    httpserver.expect_oneshot_request("/logowanie", method="GET").respond_with_data(
+        '<input type="hidden" name="token" value="token-123">', headers={"Set-Cookie": "SESSION=unsigned"},
+    )
+    httpserver.expect_oneshot_request("/logowanie", method="POST").respond_with_data("Unauthorized", status=401)
+    httpserver.expect_oneshot_request("/meter/summaryBalancingChart/csv").respond_with_data("", status=500)
+    httpserver.expect_oneshot_request("/meter/summaryBalancingChart/csv").respond_with_json({"success": 0})
+
+    async def run() -> list[object]:
+        client = AsyncClient(config)
+
+        try:
+            return [
+                await client.authenticate(),
+                await client.authenticate(),
+                await client.authenticate(),
+                await client.authenticate(),
+                await client.get_data("09.2025"),
+                await client.get_data("09.2025"),
+            ]
+        finally:
+            await client.close()
+
+    with caplog.at_level(logging.ERROR):
+        assert asyncio.run(run()) == [False, False, True, False, None, None]
+
+    assert "Error: status - 500, reason - INTERNAL SERVER ERROR" in caplog.text
+    assert "Error: No cookie" in caplog.text
+    assert "Error: status - 401, reason - UNAUTHORIZED" in caplog.text
+    assert "Error: message - {'success': 0}" in caplog.text
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import http.client as http_client
+import logging
+from contextlib import suppress
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from enea_client.utils.async_session import AsyncSession
+from enea_client.utils.request_scheduler import RequestScheduler
+from enea_client.utils.session import MAX_TIMINGS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from pytest import LogCaptureFixture
+
+
+async def serve(
+    responses: list[bytes | None],
+    test: Callable[[str, list[tuple[str, bytes]]], Awaitable[None]],
+) -> None:
+    """Serve canned raw responses in order, None closes the connection without responding.
+
+    The connection is also closed after the last response.
+    """
+    requests: list[tuple[str, bytes]] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with suppress(asyncio.IncompleteReadError):
+            await respond(reader, writer)
+
+        writer.close()
+
+    async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while responses:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = next(
+                (int(line.split(b":")[1]) for line in head.split(b"\r\n") if line.startswith(b"Content-Length")), 0,
+            )
+            requests.append((head.decode(), await reader.readexactly(length)))
+            response = responses.pop(0)
+
+            if response is None:
+                break
+
+            writer.write(response)
+            await writer.drain()
+
+    server = await asyncio.start_server(handle, "localhost", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async with server:
+        await test(f"http://localhost:{port}", requests)
+
+def test_async_session_keep_alive_and_framing(caplog: LogCaptureFixture) -> None:
+    responses: list[bytes | None] = [
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok",
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3;x=y\r\nabc\r\n2\r\nde\r\n0\r\nTrailer: 1\r\n\r\n",
+        b"HTTP/1.1 204 No Content\r\n\r\n",
+        b"HTTP/1.1 200\r\nConnection: close\r\n\r\nuntil close",
+    ]
+
+    async def test(url: str, requests: list[tuple[str, bytes]]) -> None:
+        session = AsyncSession(url, 5)
+
+        with caplog.at_level(logging.DEBUG):
+            assert (await session.request("GET", "/")).body == b"ok"
+
+            response = await session.request("POST", "/data", body="a=1", headers={"Cookie": "SESSION=signed"})
+            assert response.body == b"abcde"
+            assert response.getheader("Transfer-Encoding") == "chunked"
+
+            assert (await session.request("HEAD", "/")).status == HTTPStatus.NO_CONTENT
+
+            response = await session.request("GET", "/")
+            assert (response.status, response.reason, response.body) == (200, "", b"until close")
+
+        await session.close()
+
+        assert requests[1][0].startswith("POST /data HTTP/1.1\r\nHost: localhost\r\n")
+        assert "Cookie: SESSION=signed\r\nContent-Length: 3\r\n" in requests[1][0]
+        assert requests[1][1] == b"a=1"
+        assert [timing.status for timing in session.timings] == [200, 200, 204, 200]
+        # Only the latest timings are kept
+        assert session.timings.maxlen == MAX_TIMINGS
+        assert "Request GET /: status - 200, time - " in caplog.text
+
+    asyncio.run(serve(responses, test))
+
+def test_async_session_reconnects_dropped_connection(caplog: LogCaptureFixture) -> None:
+    responses: list[bytes | None] = [
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok",
+        None,
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nagain",
+    ]
+
+    async def test(url: str, _requests: list[tuple[str, bytes]]) -> None:
+        session = AsyncSession(url, 5)
+
+        with caplog.at_level(logging.DEBUG):
+            assert (await session.request("GET", "/")).body == b"ok"
+            assert (await session.request("GET", "/")).body == b"again"
+
+        await session.close()
+
+        assert "Connection closed by server, reconnecting" in caplog.text
+
+    asyncio.run(serve(responses, test))
+
+def test_async_session_errors() -> None:
+    responses: list[bytes | None] = [
+        b"garbage\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nshort",
+    ]
+
+    async def test(url: str, _requests: list[tuple[str, bytes]]) -> None:
+        session = AsyncSession(url, 5)
+
+        with pytest.raises(http_client.BadStatusLine):
+            await session.request("GET", "/")
+
+        with pytest.raises(http_client.IncompleteRead):
+            await session.request("GET", "/")
+
+        await session.close()
+
+    asyncio.run(serve(responses, test))
+
+def test_async_session_limits_concurrent_requests() -> None:
+    responses: list[bytes | None] = [b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"] * 6
+
+    async def test(url: str, _requests: list[tuple[str, bytes]]) -> None:
+        session = AsyncSession(url, 5, pool_size=2)
+        connect = session._connect # noqa: SLF001
+
+        with patch.object(session, "_connect", side_effect=connect) as mock_connect:
+            results = await asyncio.gather(*(session.request("GET", "/") for _ in range(6)))
+
+        await session.close()
+
+        assert [response.body for response in results] == [b"ok"] * 6
+        assert mock_connect.call_count == 2
+
+    asyncio.run(serve(responses, test))
+
+@patch("enea_client.utils.async_session.asyncio.sleep", new_callable=AsyncMock)
+def test_async_session_retries(mock_sleep: AsyncMock, caplog: LogCaptureFixture) -> None:
+    responses: list[bytes | None] = [
+        b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok",
+        b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 0\r\n\r\n",
+        b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 0\r\n\r\n",
+    ]
+
+    async def test(url: str, _requests: list[tuple[str, bytes]]) -> None:
+        session = AsyncSession(url, 5, scheduler=RequestScheduler(retries=1))
+
+        with caplog.at_level(logging.WARNING):
+            assert (await session.request("GET", "/")).body == b"ok"
+            assert (await session.request("GET", "/")).status == HTTPStatus.INTERNAL_SERVER_ERROR
+
+        await session.close()
+
+        assert "Request GET / failed: status - 503, retrying in " in caplog.text
+
+    asyncio.run(serve(responses, test))
+
+    # Connection errors are retried too, until retries run out
+    session = AsyncSession("http://localhost:1", 5, scheduler=RequestScheduler(retries=2))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(session.request("GET", "/"))
+
+    assert caplog.text.count("Request GET / failed: ConnectionRefusedError") == 2
+    assert mock_sleep.await_count == 11
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+
+from enea_client.app import DateResult
+from enea_client.batch import Batch
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+
+    from enea_client.config import Config
+    from enea_client.utils.metrics import Metrics
+    from enea_client.utils.request_scheduler import RequestScheduler
+
+
+def write_batch_config(tmp_path: Path, batch_config: dict[str, object]) -> str:
+    path = tmp_path / "batch.json"
+    path.write_text(json.dumps(batch_config), encoding="utf-8")
+
+    return str(path)
+
+def test_batch_load(config: Config, tmp_path: Path) -> None:
+    path = write_batch_config(tmp_path, {
+        "output_dir": str(tmp_path / "output"),
+        "parallelism": 2,
+        "post_process_script": "/path/to/script.sh",
+        "accounts": [
+            {"login": "first@example.com", "password": "first", "pods": ["pod-1", "pod-2"]},
+            {"login": "second@example.com", "password": "second", "pods": ["pod-3"]},
+        ],
+    })
+
+    config.output_dir = ""
+    batch = Batch.load(path, config)
+
+    assert batch.parallelism == 2
+    assert batch.post_process_script == "/path/to/script.sh"
+    assert [[pod_config.enea_pod_guid for pod_config in account] for account in batch.accounts] == [
+        ["pod-1", "pod-2"],
+        ["pod-3"],
+    ]
+
+    pod_config = batch.accounts[0][1]
+    assert pod_config.enea_login == "first@example.com"
+    assert pod_config.enea_password == "first" # noqa: S105
+    assert pod_config.output_dir == str(tmp_path / "output" / "pod-2")
+    assert pod_config.dates == config.dates
+    # Only the post-processing script runs, once for all PODs
+    assert pod_config.post_process_script is None
+
+def test_batch_load_dates_from_file(config: Config, tmp_path: Path) -> None:
+    config.dates = []
+    path = write_batch_config(tmp_path, {
+        "dates": ["02.2026", "12.2025..01.2026"],
+        "accounts": [{"login": "first@example.com", "password": "first", "pods": ["pod-1"]}],
+    })
+
+    batch = Batch.load(path, config)
+
+    assert batch.accounts[0][0].dates == ["12.2025", "01.2026", "02.2026"]
+    assert batch.accounts[0][0].output_dir == str(Path(config.output_dir) / "pod-1")
+
+def test_batch_load_prefers_command_line(config: Config, tmp_path: Path) -> None:
+    config.post_process_script = "/path/to/other.sh"
+    path = write_batch_config(tmp_path, {
+        "output_dir": str(tmp_path / "output"),
+        "dates": ["01.2026"],
+        "post_process_script": "/path/to/script.sh",
+        "accounts": [{"login": "first@example.com", "password": "first", "pods": ["pod-1"]}],
+    })
+
+    batch = Batch.load(path, config)
+
+    assert batch.post_process_script == "/path/to/other.sh"
+    assert batch.accounts[0][0].output_dir == str(Path(config.output_dir) / "pod-1")
+    assert batch.accounts[0][0].dates == config.dates
+
+def test_batch_load_without_dates(config: Config, tmp_path: Path) -> None:
+    config.dates = []
+    path = write_batch_config(tmp_path, {
+        "accounts": [{"login": "first@example.com", "password": "first", "pods": ["pod-1", "pod-2"]}],
+    })
+
+    batch = Batch.load(path, config, require_dates=False)
+
+    assert [pod_config.output_dir for pod_config in batch.accounts[0]] == [
+        str(Path(config.output_dir) / pod_guid) for pod_guid in ("pod-1", "pod-2")
+    ]
+    assert batch.accounts[0][0].dates == []
+
+@pytest.mark.parametrize(("batch_config", "message"), [
+    (None, "Cannot read batch config"),
+    ({"output_dir": "/output"}, "requires output_dir and dates"),
+    ({"output_dir": "/output", "dates": ["01.2026"], "accounts": [{"pods": ["pod-1"]}]}, "requires login"),
+    ({"output_dir": "/output", "dates": ["2026-01"], "accounts": []}, "Invalid date expression: 2026-01"),
+    ({"output_dir": "/output", "dates": ["01.2026"], "parallelism": 0}, "parallelism to be a positive integer, got 0"),
+    ({"output_dir": "/output", "dates": ["01.2026"], "parallelism": "2"}, "positive integer, got '2'"),
+    ({"output_dir": "/output", "dates": ["01.2026"], "parallelism": True}, "positive integer, got True"),
+])
+def test_batch_load_invalid(
+    config: Config,
+    tmp_path: Path,
+    batch_config: dict[str, object] | None,
+    message: str,
+) -> None:
+    config.dates = []
+    config.output_dir = ""
+    path = str(tmp_path / "missing.json") if batch_config is None else write_batch_config(tmp_path, batch_config)
+
+    with pytest.raises(ValueError, match=message):
+        Batch.load(path, config)
+
+@patch("enea_client.batch.ScriptPlugin")
+@patch("enea_client.batch.App")
+@patch("enea_client.batch.Client")
+def test_batch_call(
+    mock_client_class: Mock,
+    mock_app_class: Mock,
+    mock_script_plugin_class: Mock,
+    config: Config,
+    tmp_path: Path,
+    caplog: LogCaptureFixture,
+) -> None:
+    path = write_batch_config(tmp_path, {
+        "output_dir": str(tmp_path / "output"),
+        "parallelism": 2,
+        "post_process_script": "/path/to/script.sh",
+        "accounts": [
+            {"login": "first@example.com", "password": "first", "pods": ["pod-1", "pod-2"]},
+            {"login": "second@example.com", "password": "second", "pods": ["pod-3"]},
+            {"login": "third@example.com", "password": "third", "pods": ["pod-4"]},
+        ],
+    })
+
+    config.output_dir = ""
+    clients = {}
+    schedulers = set()
+    metrics = set()
+
+    def create_client(pod_config: Config, scheduler: RequestScheduler, client_metrics: Metrics) -> Mock:
+        schedulers.add(id(scheduler))
+        metrics.add(id(client_metrics))
+        client = Mock(metrics=client_metrics)
+        client.authenticate.return_value = pod_config.enea_login != "third@example.com"
+        clients[pod_config.enea_login] = client
+
+        return client
+
+    mock_client_class.side_effect = create_client
+    mock_app_class.side_effect = lambda pod_config, _metrics: Mock(
+        download=Mock(return_value=[DateResult("09.2025", Path(pod_config.output_dir) / "09.2025.csv", changed=True)]),
+    )
+
+    with caplog.at_level(logging.INFO):
+        Batch.load(path, config).call()
+
+    # Every account authenticates once, regardless of the number of PODs
+    assert len(clients) == 3
+    for client in clients.values():
+        client.authenticate.assert_called_once()
+        client.close.assert_called_once()
+
+    # All accounts share one rate limit and one run summary
+    assert len(schedulers) == 1
+    assert len(metrics) == 1
+
+    assert (tmp_path / "output" / "pod-1").is_dir()
+    assert not (tmp_path / "output" / "pod-4").exists()
+
+    mock_script_plugin_class.run.assert_called_once_with("/path/to/script.sh", [
+        tmp_path / "output" / "pod-1" / "09.2025.csv",
+        tmp_path / "output" / "pod-2" / "09.2025.csv",
+        tmp_path / "output" / "pod-3" / "09.2025.csv",
+    ])
+
+    assert "Authentication failed for: third@example.com" in caplog.text
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from enea_client.utils.binary_store import RECORD, BinaryStore
+from enea_client.utils.parser import HourlyData
+from enea_client.utils.time_normalizer import HOUR
+
+if TYPE_CHECKING:
+    from enea_client.config import Config
+
+TIMEZONE = ZoneInfo("Europe/Warsaw")
+START = 1759269600 # 2025-10-01 00:00 in Europe/Warsaw
+
+
+def hourly_data(first_hour: int, hours: int, volume: float) -> HourlyData:
+    result = HourlyData(TIMEZONE)
+
+    for hour in range(first_hour, first_hour + hours):
+        result.append(START + hour * HOUR, (volume, 0.0, volume, float(hour)))
+
+    return result
+
+def test_binary_store_call_appends_and_merges(config: Config) -> None:
+    path = BinaryStore.call(config, hourly_data(0, 3, 0.5))
+
+    assert path.name == "test-pod-guid-123.bin"
+    assert BinaryStore.last_timestamp(path) == START + 2 * HOUR
+
+    # Later hours are appended, a torn trailing record is dropped first
+    with path.open("ab") as file:
+        file.write(b"torn")
+
+    BinaryStore.call(config, hourly_data(3, 2, 1.0))
+
+    assert path.stat().st_size == 5 * RECORD.size
+
+    # Saving hours again replaces them instead of duplicating them
+    BinaryStore.call(config, hourly_data(1, 2, 2.0))
+    BinaryStore.call(config, HourlyData(TIMEZONE))
+
+    result = BinaryStore.read(path, TIMEZONE)
+
+    assert list(result.timestamps) == [START + hour * HOUR for hour in range(5)]
+    assert [result.volumes(index)[0] for index in range(5)] == [0.5, 2.0, 2.0, 1.0, 1.0]
+    assert sorted(item.name for item in path.parent.iterdir()) == [path.name]
+
+def test_binary_store_read_range(config: Config) -> None:
+    path = BinaryStore.path(config)
+
+    assert len(BinaryStore.read(path, TIMEZONE)) == 0
+    assert BinaryStore.last_timestamp(path) is None
+
+    BinaryStore.call(config, hourly_data(0, 48, 0.5))
+
+    result = BinaryStore.read(path, TIMEZONE, START + 10 * HOUR, START + 12 * HOUR + 1)
+
+    assert list(result.timestamps) == [START + 10 * HOUR, START + 11 * HOUR, START + 12 * HOUR]
+    assert result.volumes(2) == (0.5, 0.0, 0.5, 12.0)
+    assert len(BinaryStore.read(path, TIMEZONE, START + 48 * HOUR)) == 0
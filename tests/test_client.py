@@ -2,12 +2,20 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import zlib
+from datetime import date
 from http import HTTPStatus
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
-from enea_client.client import Client
+import pytest
+
+from enea_client.client import Client, ResponseError
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from pytest import LogCaptureFixture
     from pytest_httpserver import HTTPServer
 
@@ -36,6 +44,63 @@ def test_client_aithenticate_success(httpserver: HTTPServer, config: Config) ->
     client = Client(config)
     assert client.authenticate() is True
     assert client.signed_cookie == "SESSION=signed; Path=/; HttpOnly"
+    assert [timing.path for timing in client.session.timings] == ["/logowanie", "/logowanie"]
+    assert client.metrics.summary()["stages"]["auth"]["count"] == 1
+
+    client.close()
+
+def test_client_authenticate_session_cache(
+    httpserver: HTTPServer, config: Config, tmp_path: Path, caplog: LogCaptureFixture,
+) -> None:
+    config.session_cache = str(tmp_path / "session.json")
+
+    httpserver.expect_oneshot_request("/logowanie", method="GET").respond_with_data(
+        '<input type="hidden" name="token" value="token-123">',
+        headers={"Set-Cookie": "SESSION=unsigned; Path=/; HttpOnly"},
+    )
+    httpserver.expect_oneshot_request("/logowanie", method="POST").respond_with_data(
+        "", status=HTTPStatus.FOUND, headers={"Set-Cookie": "SESSION=signed; Path=/; HttpOnly"},
+    )
+
+    client = Client(config)
+    assert client.authenticate() is True
+    client.close()
+
+    # The next run validates the cached cookie with a single request instead of logging in
+    httpserver.expect_oneshot_request(
+        "/", method="GET", headers={"Cookie": "SESSION=signed; Path=/; HttpOnly"},
+    ).respond_with_data("")
+
+    client = Client(config)
+
+    with caplog.at_level(logging.INFO):
+        assert client.authenticate() is True
+
+    assert client.signed_cookie == "SESSION=signed; Path=/; HttpOnly"
+    assert [timing.path for timing in client.session.timings] == ["/"]
+    assert "Reusing cached session" in caplog.text
+    client.close()
+
+    # A rejected cookie falls back to logging in
+    httpserver.expect_oneshot_request("/", method="GET").respond_with_data(
+        "", status=HTTPStatus.FOUND, headers={"Location": "/logowanie"},
+    )
+    httpserver.expect_oneshot_request("/logowanie", method="GET").respond_with_data(
+        '<input type="hidden" name="token" value="token-456">',
+        headers={"Set-Cookie": "SESSION=unsigned; Path=/; HttpOnly"},
+    )
+    httpserver.expect_oneshot_request("/logowanie", method="POST").respond_with_data(
+        "", status=HTTPStatus.FOUND, headers={"Set-Cookie": "SESSION=renewed; Path=/; HttpOnly"},
+    )
+
+    client = Client(config)
+    assert client.authenticate() is True
+    assert client.signed_cookie == "SESSION=renewed; Path=/; HttpOnly"
+    assert [timing.path for timing in client.session.timings] == ["/", "/logowanie", "/logowanie"]
+    client.close()
+
+    assert client.session_cache is not None
+    assert client.session_cache.get(f"{config.enea_login} {config.enea_url}") == "SESSION=renewed; Path=/; HttpOnly"
 
 def test_client_authenticate_session_none(config: Config, httpserver: HTTPServer) -> None:
     config.enea_url = httpserver.url_for("")
@@ -125,6 +190,42 @@ def test_client_get_data_success(config: Config, httpserver: HTTPServer) -> None
     result = client.get_data(config.dates[0])
     assert result == data
 
+    summary = client.metrics.summary()
+    assert list(summary["stages"]) == ["body_read", "connect", "json_decode", "request"]
+    response_size = len(json.dumps({"success": 1, "data": data}))
+    assert summary["dates"][config.enea_pod_guid][config.dates[0]]["bytes"] == response_size
+
+def test_client_get_data_reauthenticates_expired_session(
+    config: Config, httpserver: HTTPServer, tmp_path: Path,
+) -> None:
+    config.session_cache = str(tmp_path / "session.json")
+
+    httpserver.expect_oneshot_request(
+        "/meter/summaryBalancingChart/csv", method="POST", headers={"Cookie": "SESSION=expired"},
+    ).respond_with_data("", status=HTTPStatus.FOUND, headers={"Location": "/logowanie"})
+    httpserver.expect_oneshot_request("/logowanie", method="GET").respond_with_data(
+        '<input type="hidden" name="token" value="token-123">',
+        headers={"Set-Cookie": "SESSION=unsigned; Path=/; HttpOnly"},
+    )
+    httpserver.expect_oneshot_request("/logowanie", method="POST").respond_with_data(
+        "", status=HTTPStatus.FOUND, headers={"Set-Cookie": "SESSION=signed"},
+    )
+    httpserver.expect_oneshot_request(
+        "/meter/summaryBalancingChart/csv", method="POST", headers={"Cookie": "SESSION=signed"},
+    ).respond_with_json({"success": 1, "data": "data"})
+
+    client = Client(config)
+    client.signed_cookie = "SESSION=expired"
+
+    assert client.get_data(config.dates[0]) == "data"
+    assert client.signed_cookie == "SESSION=signed"
+
+    # A session renewed by another thread meanwhile is not renewed again
+    client._reauthenticate("SESSION=expired") # noqa: SLF001
+    assert len(httpserver.log) == 4
+
+    client.close()
+
 def test_client_get_data_http_error(config: Config, httpserver: HTTPServer, caplog: LogCaptureFixture) -> None:
     config.enea_url = httpserver.url_for("")
 
@@ -168,3 +269,169 @@ def test_client_get_data_success_not_success(config: Config, httpserver: HTTPSer
 
     assert result is None
     assert "Error: message - {'success': 0, 'error': 'Authentication failed'}" in caplog.text
+
+def test_client_uses_session_per_thread(config: Config) -> None:
+    client = Client(config)
+    sessions = []
+
+    thread = threading.Thread(target=lambda: sessions.append(client.session))
+    thread.start()
+    thread.join()
+
+    assert client.session is client.session
+    assert sessions[0] is not client.session
+
+    client.close()
+
+def test_client_open_data_success(config: Config, httpserver: HTTPServer) -> None:
+    data = '\u0000"=""2025-09-01 00:59"""\u0000;"0,507";"0";"0,507";"0"\n' * 100
+
+    httpserver.expect_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_data(
+        json.dumps({"success": 1, "data": data}),
+        status=HTTPStatus.OK,
+        headers={"Content-Type": "application/json"},
+    )
+
+    client = Client(config)
+
+    with client.open_data(config.dates[0]) as chunks:
+        assert chunks is not None
+        assert "".join(chunks) == data
+
+    summary = client.metrics.summary()
+    assert summary["stages"]["body_read"]["count"] == 1
+    response_size = len(json.dumps({"success": 1, "data": data}))
+    assert summary["dates"][config.enea_pod_guid][config.dates[0]]["bytes"] == response_size
+
+def test_client_open_data_http_error(config: Config, httpserver: HTTPServer, caplog: LogCaptureFixture) -> None:
+    httpserver.expect_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_data(
+        "Internal Server Error",
+        status=HTTPStatus.INTERNAL_SERVER_ERROR,
+    )
+
+    client = Client(config)
+
+    with caplog.at_level(logging.ERROR), client.open_data(config.dates[0]) as chunks:
+        assert chunks is None
+
+    assert "Error: status - 500, reason - INTERNAL SERVER ERROR" in caplog.text
+
+def test_client_open_data_not_success(config: Config, httpserver: HTTPServer) -> None:
+    httpserver.expect_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_data(
+        '{"success":0,"error":"Authentication failed"}',
+        status=HTTPStatus.OK,
+        headers={"Content-Type": "application/json"},
+    )
+
+    client = Client(config)
+
+    with client.open_data(config.dates[0]) as chunks:
+        assert chunks is not None
+
+        with pytest.raises(ResponseError, match="Authentication failed"):
+            list(chunks)
+
+def test_client_get_data_response_cache(
+    config: Config, httpserver: HTTPServer, tmp_path: Path, caplog: LogCaptureFixture,
+) -> None:
+    config.response_cache = str(tmp_path / "responses")
+    data = '\u0000"=""2025-09-01 00:59"""\u0000;"0,507";"0";"0,507";"0"\n'
+
+    httpserver.expect_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_data(
+        json.dumps({"success": 1, "data": data}),
+        headers={"Content-Type": "application/json"},
+    )
+
+    client = Client(config)
+    assert client.get_data("09.2025") == data
+    assert client.get_data("05.09.2025", duration="day") == data
+    assert len(httpserver.log) == 2
+
+    # Months and days past the settle window are read from the cache
+    client = Client(config)
+
+    with caplog.at_level(logging.INFO):
+        assert client.get_data("09.2025") == data
+        assert client.get_data("05.09.2025", duration="day") == data
+
+    assert len(httpserver.log) == 2
+    assert "Using cached response for date: 09.2025" in caplog.text
+    assert "bytes" not in client.metrics.summary()["dates"].get(config.enea_pod_guid, {}).get("09.2025", {})
+
+    # Periods that may still change are downloaded again
+    with patch.object(Client, "_today", return_value=date(2025, 10, 14)):
+        assert client.get_data("09.2025") == data
+
+    assert len(httpserver.log) == 3
+
+def test_client_get_data_response_cache_skips_failures(config: Config, httpserver: HTTPServer, tmp_path: Path) -> None:
+    config.response_cache = str(tmp_path / "responses")
+
+    httpserver.expect_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_data(
+        '{"success":0,"error":"Authentication failed"}',
+        headers={"Content-Type": "application/json"},
+    )
+
+    client = Client(config)
+    assert client.get_data("09.2025") is None
+    assert client.response_cache is not None
+    assert client.response_cache.get(config.enea_pod_guid, "month", "09.2025") is None
+
+def test_client_offline(config: Config, httpserver: HTTPServer, tmp_path: Path, caplog: LogCaptureFixture) -> None:
+    config.response_cache = str(tmp_path / "responses")
+    config.offline = True
+    data = '\u0000"=""2025-09-01 00:59"""\u0000;"0,507";"0";"0,507";"0"\n'
+
+    client = Client(config)
+    assert client.response_cache is not None
+    client.response_cache.set(
+        config.enea_pod_guid, "month", "10.2026", zlib.compress(json.dumps({"success": 1, "data": data}).encode()),
+    )
+
+    with caplog.at_level(logging.INFO):
+        assert client.authenticate() is True
+        # Offline, periods within the settle window are read from the cache too
+        assert client.get_data("10.2026") == data
+        assert client.get_data("09.2025") is None
+
+        with client.open_data("10.2026") as chunks:
+            assert chunks is not None
+            assert "".join(chunks) == data
+
+        with client.open_data("09.2025") as chunks:
+            assert chunks is None
+
+    assert httpserver.log == []
+    assert "Offline, responses are read from the cache" in caplog.text
+    assert "Response not cached for date: 09.2025" in caplog.text
+
+def test_client_open_data_response_cache(config: Config, httpserver: HTTPServer, tmp_path: Path) -> None:
+    config.response_cache = str(tmp_path / "responses")
+    data = '\u0000"=""2025-09-01 00:59"""\u0000;"0,507";"0";"0,507";"0"\n' * 100
+
+    httpserver.expect_oneshot_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_data(
+        '{"success":0,"error":"Authentication failed"}',
+        headers={"Content-Type": "application/json"},
+    )
+    httpserver.expect_request("/meter/summaryBalancingChart/csv", method="POST").respond_with_data(
+        json.dumps({"success": 1, "data": data}),
+        headers={"Content-Type": "application/json"},
+    )
+
+    client = Client(config)
+
+    # Failed responses are not cached
+    with client.open_data("09.2025") as chunks, pytest.raises(ResponseError):
+        list(chunks or [])
+
+    with client.open_data("09.2025") as chunks:
+        assert "".join(chunks or []) == data
+
+    # The streamed response is replayed from the cache
+    with client.open_data("09.2025") as chunks:
+        assert "".join(chunks or []) == data
+
+    # Only bytes received from the portal are counted
+    assert len(httpserver.log) == 2
+    response_size = len('{"success":0,"error":"Authentication failed"}') + len(json.dumps({"success": 1, "data": data}))
+    assert client.metrics.summary()["dates"][config.enea_pod_guid]["09.2025"]["bytes"] == response_size
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from enea_client.utils.compactor import Compactor
+from enea_client.utils.file_store import FileStore
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+
+    from enea_client.config import Config
+
+HEADER = 'Data;"Wolumen\nenergii"\n'
+
+def store_months(config: Config, months: dict[str, list[str]]) -> None:
+    for date, timestamps in months.items():
+        rows = "".join(f'"{timestamp}";"0.5";"0";"0.5";"0"\n' for timestamp in timestamps)
+        FileStore.call(config, date, HEADER + rows)
+
+def test_compactor_call_by_year(config: Config) -> None:
+    store_months(config, {
+        "12.2024": ["2024-12-31 22:59", "2024-12-31 23:59"],
+        "10.2025": ["2025-10-26 01:59", "2025-10-26 02:59", "2025-10-26 02:59", "2025-10-26 03:59"],
+        "09.2025": ["2025-09-01 00:59", "2025-09-30 23:59"],
+    })
+
+    paths = Compactor.call(config, "year")
+
+    # Compacted files are kept apart from the month files
+    assert paths == [Path(config.output_dir) / "compacted" / name for name in ("2024.csv", "2025.csv")]
+    # Rows are sorted across months and both hours of the DST change are kept
+    assert paths[1].read_text(encoding="utf-8") == HEADER + "".join(
+        f'"{timestamp}";"0.5";"0";"0.5";"0"\n'
+        for timestamp in (
+            "2025-09-01 00:59",
+            "2025-09-30 23:59",
+            "2025-10-26 01:59",
+            "2025-10-26 02:59",
+            "2025-10-26 02:59",
+            "2025-10-26 03:59",
+        )
+    )
+
+    manifest = Compactor.load_manifest(str(paths[1].parent))
+    assert sorted(manifest["2025.csv"]["sources"]) == ["09.2025", "10.2025"]
+    assert manifest["2025.csv"]["months"]["10.2025"] == {
+        "first_timestamp": "2025-10-26 01:59",
+        "last_timestamp": "2025-10-26 03:59",
+        "offset": len(HEADER) + 2 * 39,
+        "length": 4 * 39,
+        "rows": 4,
+    }
+
+    # Months are read straight from their byte range
+    assert Compactor.read_month(paths[1], "09.2025") == (
+        '"2025-09-01 00:59";"0.5";"0";"0.5";"0"\n"2025-09-30 23:59";"0.5";"0";"0.5";"0"\n'
+    )
+    assert Compactor.read_month(paths[1], "08.2025") is None
+    assert Compactor.read_month(paths[1].parent / "2023.csv", "01.2023") is None
+
+def test_compactor_call_by_pod_deduplicates(config: Config, caplog: LogCaptureFixture) -> None:
+    store_months(config, {"09.2025": ["2025-09-30 22:59", "2025-09-30 23:59"]})
+    # A month file with a row of the previous month and without a trailing line break
+    FileStore.call(config, "10.2025", HEADER + '"2025-09-30 23:59";"9";"9";"9";"9"\n"2025-10-01 00:59";"1";"0";"1";"0"')
+    # Rows of hours skipped by DST are left out
+    FileStore.call(config, "03.2025", '"2025-03-30 01:59";"1";"0";"1";"0"\n"2025-03-30 02:59";"1";"0";"1";"0"\n')
+
+    with caplog.at_level(logging.WARNING):
+        paths = Compactor.call(config, "pod")
+
+    assert [path.name for path in paths] == [f"{config.enea_pod_guid}.csv"]
+    # Headers come from the first month, rows of an hour from the earlier month are kept
+    assert paths[0].read_text(encoding="utf-8") == (
+        '"2025-03-30 01:59";"1";"0";"1";"0"\n'
+        '"2025-09-30 22:59";"0.5";"0";"0.5";"0"\n'
+        '"2025-09-30 23:59";"0.5";"0";"0.5";"0"\n'
+        '"2025-10-01 00:59";"1";"0";"1";"0"\n'
+    )
+    assert "Skipping row of a nonexistent hour: 2025-03-30 02:59" in caplog.text
+
+def test_compactor_call_skips_unchanged_months(config: Config, caplog: LogCaptureFixture) -> None:
+    store_months(config, {"09.2025": ["2025-09-01 00:59"]})
+    path = Compactor.call(config, "year")[0]
+
+    with patch.object(Compactor, "compact") as mock_compact, caplog.at_level(logging.INFO):
+        Compactor.call(config, "year")
+
+    mock_compact.assert_not_called()
+    assert f"Compacted file up to date: {path}" in caplog.text
+
+    # Changed month files and removed compacted files are compacted again
+    store_months(config, {"09.2025": ["2025-09-01 00:59", "2025-09-01 01:59"]})
+    Compactor.call(config, "year")
+    assert Compactor.load_manifest(str(path.parent))["2025.csv"]["months"]["09.2025"]["rows"] == 2
+
+    path.unlink()
+    Compactor.call(config, "year")
+    assert path.exists()
+
+def test_compactor_ignores_corrupted_manifest(config: Config, caplog: LogCaptureFixture) -> None:
+    manifest_path = Path(config.output_dir) / "compacted" / Compactor.MANIFEST_FILE_NAME
+    manifest_path.parent.mkdir()
+    manifest_path.write_text("{", encoding="utf-8")
+    store_months(config, {"09.2025": ["2025-09-01 00:59"]})
+
+    with caplog.at_level(logging.WARNING):
+        Compactor.call(config, "year")
+
+    assert "Ignoring corrupted manifest" in caplog.text
+    assert json.loads(manifest_path.read_text(encoding="utf-8"))
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from enea_client.utils.completeness_index import CompletenessBuilder, CompletenessIndex, count_bits, month_hours
+from enea_client.utils.sanitizer import Sanitizer
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+
+    from enea_client.config import Config
+
+RAW_DATA = (
+    '\u0000"=""2025-09-01 00:59"""\u0000;"0,5";"0";"0,5";"0"\n'
+    '\u0000"=""2025-09-01 01:59"""\u0000;"---";"---";"---";"---"\n'
+    '\u0000"=""2025-09-02 05:59"""\u0000;"0,25";"0";"0,25";"0"\n'
+)
+
+def build(config: Config, date: str, raw_data: str) -> CompletenessBuilder:
+    completeness_builder = CompletenessBuilder(date, config.enea_timezone)
+    pieces = Sanitizer.stream(completeness_builder.tap_raw([raw_data]), block_size=1)
+    "".join(completeness_builder.tap(pieces))
+
+    return completeness_builder
+
+def test_month_hours(config: Config) -> None:
+    assert month_hours("09.2025", config.enea_timezone)[1] == 720
+    # Months with a DST change have an hour less or more
+    assert month_hours("03.2025", config.enea_timezone)[1] == 743
+    assert month_hours("10.2025", config.enea_timezone)[1] == 745
+
+def test_completeness_builder(config: Config) -> None:
+    completeness_builder = build(config, "09.2025", RAW_DATA)
+
+    assert completeness_builder.present[0] == 0b1
+    assert completeness_builder.placeholder[0] == 0b10
+    assert count_bits(completeness_builder.present) == 2
+    assert count_bits(completeness_builder.placeholder) == 1
+
+    # Hours outside of the month and labels of hours skipped by DST are ignored
+    completeness_builder.scan('"2025-10-01 00:59";"0,5";"0";"0,5";"0"\n"2025-03-30 02:59";"0,5";"0";"0,5";"0"\n')
+    assert count_bits(completeness_builder.present) == 2
+
+    month_completeness = completeness_builder.month_completeness()
+    assert month_completeness["hours"] == 720
+    assert len(month_completeness["present"]) == 120
+
+def test_completeness_index_status(config: Config) -> None:
+    completeness_index = CompletenessIndex(config.output_dir)
+
+    assert completeness_index.is_complete(config.enea_pod_guid, "09.2025") is None
+    assert completeness_index.status(config.enea_pod_guid, "09.2025", config.enea_timezone, date(2025, 9, 3)) is None
+
+    completeness_index.set(config.enea_pod_guid, "09.2025", build(config, "09.2025", RAW_DATA).month_completeness())
+
+    # Hours up to the end of yesterday are published, later ones are pending
+    assert completeness_index.status(config.enea_pod_guid, "09.2025", config.enea_timezone, date(2025, 9, 3)) == {
+        "hours": 720,
+        "present": 2,
+        "placeholder": 1,
+        "missing": 45,
+        "pending": 672,
+        "coverage": 0.0417,
+        "incomplete_days": ["2025-09-01", "2025-09-02"],
+    }
+    month_status = completeness_index.status(config.enea_pod_guid, "09.2025", config.enea_timezone, date(2025, 11, 1))
+    assert month_status is not None
+    assert (month_status["missing"], month_status["pending"]) == (717, 0)
+
+    # Nothing of the month is published before its first day is over
+    month_status = completeness_index.status(config.enea_pod_guid, "09.2025", config.enea_timezone, date(2025, 9, 1))
+    assert month_status is not None
+    assert (month_status["missing"], month_status["coverage"]) == (0, 1.0)
+
+    assert completeness_index.is_complete(config.enea_pod_guid, "09.2025") is False
+
+    raw_data = "".join(
+        f'\u0000"=""2025-09-{day:02d} {hour:02d}:59"""\u0000;"0,5";"0";"0,5";"0"\n'
+        for day in range(1, 31)
+        for hour in range(24)
+    )
+    completeness_index.set(config.enea_pod_guid, "09.2025", build(config, "09.2025", raw_data).month_completeness())
+
+    assert completeness_index.is_complete(config.enea_pod_guid, "09.2025") is True
+
+def test_completeness_index_save(config: Config) -> None:
+    completeness_index = CompletenessIndex(config.output_dir)
+    month_completeness = build(config, "09.2025", RAW_DATA).month_completeness()
+    completeness_index.set(config.enea_pod_guid, "09.2025", month_completeness)
+    completeness_index.save()
+
+    completeness_index = CompletenessIndex(config.output_dir)
+    assert completeness_index.get(config.enea_pod_guid, "09.2025") == month_completeness
+
+    # Unchanged indexes are not rewritten
+    completeness_index.path.unlink()
+    completeness_index.set(config.enea_pod_guid, "09.2025", month_completeness)
+    completeness_index.save()
+    assert not completeness_index.path.exists()
+
+def test_completeness_index_report(config: Config, caplog: LogCaptureFixture) -> None:
+    completeness_index = CompletenessIndex(config.output_dir)
+
+    for month in ("10.2025", "09.2025"):
+        completeness_index.set(config.enea_pod_guid, month, build(config, month, RAW_DATA).month_completeness())
+
+    completeness_index.save()
+
+    # Without dates all indexed months are reported
+    config.dates = []
+    report = json.loads(CompletenessIndex.report(config, date(2025, 9, 3)))
+
+    assert list(report) == ["09.2025", "10.2025"]
+    assert report["09.2025"]["placeholder"] == 1
+    assert report["10.2025"]["pending"] == 745
+
+    config.dates = ["08.2025", "09.2025"]
+
+    with caplog.at_level(logging.WARNING):
+        assert list(json.loads(CompletenessIndex.report(config, date(2025, 9, 3)))) == ["09.2025"]
+
+    assert "Month not in the completeness index: 08.2025" in caplog.text
+
+def test_completeness_index_ignores_corrupted_file(config: Config, caplog: LogCaptureFixture) -> None:
+    (Path(config.output_dir) / CompletenessIndex.FILE_NAME).write_text("{", encoding="utf-8")
+
+    with caplog.at_level(logging.WARNING):
+        completeness_index = CompletenessIndex(config.output_dir)
+
+    assert "Ignoring corrupted completeness index" in caplog.text
+    assert completeness_index.dates(config.enea_pod_guid) == []
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+from enea_client.daemon import Daemon
+from enea_client.utils.completeness_index import CompletenessBuilder, CompletenessIndex
+from enea_client.utils.state_store import MonthState, StateStore
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+
+    from enea_client.config import Config
+
+
+def store_last_timestamps(config: Config, last_timestamps: dict[str, str]) -> None:
+    state_store = StateStore(config.output_dir)
+
+    for month, last_timestamp in last_timestamps.items():
+        state_store.set(config.enea_pod_guid, month, MonthState(last_timestamp=last_timestamp, sha256=""))
+
+    state_store.save()
+
+def test_daemon_window(config: Config) -> None:
+    assert Daemon.window(date(2025, 10, 15)) == ["09.2025", "10.2025"]
+    assert Daemon.window(date(2026, 1, 1)) == ["12.2025", "01.2026"]
+    assert len(Daemon(config).pending_dates()) <= 2
+
+def test_daemon_pending_dates(config: Config) -> None:
+    daemon = Daemon(config)
+
+    with patch.object(daemon, "_today", return_value=date(2025, 10, 15)):
+        assert daemon.pending_dates() == ["09.2025", "10.2025"]
+
+        # Hours up to the end of yesterday are expected
+        store_last_timestamps(config, {"09.2025": "2025-09-30 23:59", "10.2025": "2025-10-13 23:59"})
+        assert daemon.pending_dates() == ["10.2025"]
+
+        store_last_timestamps(config, {"10.2025": "2025-10-14 23:59"})
+        assert daemon.pending_dates() == []
+
+        # Months with gaps stay pending until the portal fills them
+        completeness_builder = CompletenessBuilder("09.2025", config.enea_timezone)
+        completeness_builder.scan('"2025-09-30 23:59";"0,5";"0";"0,5";"0"\n')
+        completeness_index = CompletenessIndex(config.output_dir)
+        completeness_index.set(config.enea_pod_guid, "09.2025", completeness_builder.month_completeness())
+        completeness_index.save()
+        assert daemon.pending_dates() == ["09.2025"]
+
+    # On the first day of a month only the previous month can have new hours
+    with patch.object(daemon, "_today", return_value=date(2025, 11, 1)):
+        assert daemon.pending_dates() == ["10.2025"]
+
+@patch("enea_client.daemon.App")
+def test_daemon_poll(mock_app_class: Mock, config: Config, caplog: LogCaptureFixture) -> None:
+    config.dates = []
+    daemon = Daemon(config)
+    client = Mock(signed_cookie="")
+    client.authenticate.return_value = False
+
+    with caplog.at_level(logging.INFO), patch.object(daemon, "pending_dates", return_value=[]):
+        daemon.poll(client)
+
+    assert "No new hours expected" in caplog.text
+    client.authenticate.assert_not_called()
+
+    with caplog.at_level(logging.ERROR), patch.object(daemon, "pending_dates", return_value=["10.2025"]):
+        daemon.poll(client)
+
+        assert "Authentication failed" in caplog.text
+        mock_app_class.assert_not_called()
+
+        # The session is kept between polls
+        client.signed_cookie = "SESSION=signed"
+        daemon.poll(client)
+        daemon.poll(client)
+
+    client.authenticate.assert_called_once()
+    assert mock_app_class.call_count == 2
+
+    app_config, metrics = mock_app_class.call_args.args
+    assert app_config.dates == ["10.2025"]
+    assert metrics is daemon.metrics
+    assert app_config.sync is True
+    mock_app_class.return_value.process.assert_called_with(client)
+
+@patch("enea_client.daemon.Client")
+def test_daemon_call_until_stopped(mock_client_class: Mock, config: Config, caplog: LogCaptureFixture) -> None:
+    config.poll_interval = 0
+    daemon = Daemon(config)
+    polls = []
+
+    def poll(client: Mock) -> None:
+        polls.append(client)
+
+        if len(polls) == 1:
+            msg = "disk full"
+            raise OSError(msg)
+
+        if len(polls) == 3:
+            daemon.stop()
+
+    # A failed poll does not stop the daemon
+    with patch.object(daemon, "poll", side_effect=poll), caplog.at_level(logging.ERROR):
+        daemon.call()
+
+    assert polls == [mock_client_class.return_value] * 3
+    assert "Poll failed" in caplog.text
+    assert "OSError: disk full" in caplog.text
+    mock_client_class.return_value.close.assert_called_once_with()
@@ -1,6 +1,9 @@
 import logging
+from collections.abc import Iterator
 from pathlib import Path
+from unittest.mock import Mock, patch
 
+import pytest
 from pytest import LogCaptureFixture
 
 from enea_client.config import Config
@@ -14,14 +17,86 @@ def test_file_store_successful_write(config: Config, caplog: LogCaptureFixture)
         result = FileStore.call(config, "09.2025", test_data)
 
     # Check that file was created and returned
-    assert result is not None
-    assert isinstance(result, Path)
-    assert result.exists()
-    assert result.name == "09.2025.csv"
+    assert result.changed
+    assert isinstance(result.path, Path)
+    assert result.path.exists()
+    assert result.path.name == "09.2025.csv"
 
     # Check file contents
-    assert result.read_text(encoding="utf-8") == test_data
+    assert result.path.read_text(encoding="utf-8") == test_data
 
     # Check logging
-    assert f"Saving file to: {result}" in caplog.text
+    assert f"Saving file to: {result.path}" in caplog.text
 
+def test_file_store_skips_identical_content(config: Config, caplog: LogCaptureFixture) -> None:
+    path = FileStore.call(config, "09.2025", "data").path
+    modified_time = path.stat().st_mtime_ns
+
+    with caplog.at_level(logging.INFO):
+        result = FileStore.call(config, "09.2025", "data")
+
+    assert not result.changed
+    assert path.stat().st_mtime_ns == modified_time
+    assert f"File unchanged: {path}" in caplog.text
+    assert sorted(item.name for item in Path(config.output_dir).iterdir()) == ["09.2025.csv"]
+
+    # Same size with different content is written
+    assert FileStore.call(config, "09.2025", "date").changed
+    assert path.read_text(encoding="utf-8") == "date"
+
+@patch("enea_client.utils.file_store.os.fsync")
+def test_file_store_fsync(mock_fsync: Mock, config: Config) -> None:
+    config.fsync = True
+
+    assert FileStore.call(config, "09.2025", "data").changed
+
+    # The file content and the directory entry
+    assert mock_fsync.call_count == 2
+
+
+def test_file_store_write_stream(config: Config) -> None:
+    result = FileStore.write_stream(config, "09.2025", iter(["test,data\n", "1,2,3\n"]))
+
+    assert result.path == Path(config.output_dir) / "09.2025.csv"
+    assert result.path.read_text(encoding="utf-8") == "test,data\n1,2,3\n"
+    assert sorted(path.name for path in Path(config.output_dir).iterdir()) == ["09.2025.csv"]
+
+def test_file_store_write_stream_compares_before_writing(config: Config, caplog: LogCaptureFixture) -> None:
+    path = FileStore.write_stream(config, "09.2025", iter(["test,data\n", "1,2,3\n"])).path
+
+    # Identical content never opens a temporary file
+    with patch.object(FileStore, "_write") as mock_write, caplog.at_level(logging.INFO):
+        result = FileStore.write_stream(config, "09.2025", iter(["test,", "data\n1,2,3\n"]))
+
+    assert not result.changed
+    mock_write.assert_not_called()
+    assert f"File unchanged: {path}" in caplog.text
+
+    # The matching part is copied from the existing file, then the stream is written
+    assert FileStore.write_stream(config, "09.2025", iter(["test,data\n", "4,5,6\n", "7,8,9\n"])).changed
+    assert path.read_text(encoding="utf-8") == "test,data\n4,5,6\n7,8,9\n"
+
+    # A stream shorter than the file replaces it
+    assert FileStore.write_stream(config, "09.2025", iter(["test,data\n"])).changed
+    assert path.read_text(encoding="utf-8") == "test,data\n"
+    assert sorted(item.name for item in Path(config.output_dir).iterdir()) == ["09.2025.csv"]
+
+def test_file_store_write_stream_failure_keeps_previous_file(config: Config) -> None:
+    FileStore.call(config, "09.2025", "previous")
+
+    def failing_pieces() -> Iterator[str]:
+        yield "partial"
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        FileStore.write_stream(config, "09.2025", failing_pieces())
+
+    assert FileStore.path(config, "09.2025").read_text(encoding="utf-8") == "previous"
+    assert sorted(path.name for path in Path(config.output_dir).iterdir()) == ["09.2025.csv"]
+
+def test_file_store_write_stream_open_failure(config: Config) -> None:
+    # The original error is raised, not one of removing a temporary file that was never created
+    with patch.object(Path, "open", side_effect=PermissionError), pytest.raises(PermissionError):
+        FileStore.write_stream(config, "09.2025", iter(["data"]))
+
+    assert list(Path(config.output_dir).iterdir()) == []
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import logging
+import socket
+from pathlib import Path
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from enea_client.utils.home_assistant import HomeAssistant
+from enea_client.utils.parser import Parser
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+    from pytest_httpserver import HTTPServer
+
+    from enea_client.config import Config
+
+DATA = (
+    'Data;"header"\n'
+    '"2025-10-26 02:59";"0.5";"0";"0.25";"0"\n'
+    '"2025-10-26 02:59";"1";"0";"0.75";"0.125"\n'
+)
+
+
+def test_home_assistant_call_without_url(config: Config) -> None:
+    config.home_assistant_config_dir = config.output_dir
+    hourly_data = Parser.call(DATA, ZoneInfo("Europe/Warsaw"))
+    home_assistant = HomeAssistant(config)
+
+    assert home_assistant.call([hourly_data]) is True
+    home_assistant.close()
+
+    # The repeated DST hour is written as two distinct UTC hours
+    assert (Path(config.output_dir) / "enea_client.csv").read_text(encoding="utf-8") == (
+        "statistic_id,unit,start,delta\n"
+        "sensor.grid_import_energy,kWh,2025-10-26 00:00,0.25\n"
+        "sensor.grid_export_energy,kWh,2025-10-26 00:00,0.0\n"
+        "sensor.grid_import_energy,kWh,2025-10-26 01:00,0.75\n"
+        "sensor.grid_export_energy,kWh,2025-10-26 01:00,0.125\n"
+    )
+
+def test_home_assistant_call_upload(httpserver: HTTPServer, config: Config, caplog: LogCaptureFixture) -> None:
+    config.home_assistant_config_dir = config.output_dir
+    config.home_assistant_file_name = "energy.csv"
+    config.home_assistant_url = httpserver.url_for("")
+    config.home_assistant_token = "token" # noqa: S105
+    home_assistant = HomeAssistant(config)
+
+    httpserver.expect_oneshot_request(
+        HomeAssistant.IMPORT_PATH,
+        method="POST",
+        headers={"Authorization": "Bearer token"},
+    ).respond_with_data("[]")
+
+    assert home_assistant.call([]) is True
+    assert json.loads(httpserver.log[0][0].data)["filename"] == "energy.csv"
+    assert json.loads(httpserver.log[0][0].data)["timezone_identifier"] == "UTC"
+
+    httpserver.expect_oneshot_request(HomeAssistant.IMPORT_PATH, method="POST").respond_with_data(
+        "Unauthorized", status=401,
+    )
+
+    with caplog.at_level(logging.ERROR):
+        assert home_assistant.call([]) is False
+
+    home_assistant.close()
+
+    assert "Error: status - 401, reason - UNAUTHORIZED" in caplog.text
+    assert (Path(config.output_dir) / "energy.csv").read_text(encoding="utf-8") == "statistic_id,unit,start,delta\n"
+
+def test_home_assistant_call_upload_connection_error(config: Config, caplog: LogCaptureFixture) -> None:
+    # A port nothing listens on
+    with socket.socket() as unused_socket:
+        unused_socket.bind(("127.0.0.1", 0))
+        port = unused_socket.getsockname()[1]
+
+    config.home_assistant_config_dir = config.output_dir
+    config.home_assistant_url = f"http://127.0.0.1:{port}"
+    home_assistant = HomeAssistant(config)
+
+    with caplog.at_level(logging.ERROR):
+        assert home_assistant.call([]) is False
+
+    home_assistant.close()
+
+    assert "Cannot connect to Home Assistant, error - " in caplog.text
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from enea_client.utils.json_stream import JsonStream
+
+
+def test_json_stream_yields_field_in_chunks() -> None:
+    data = 'Data;"header"\n\u0000"=""2025-09-01 00:59"""\u0000;"0,507"\nzażółć 😀 "quoted" \\ end'
+    body = json.dumps({"meta": {"pages": [1, 2]}, "data": data, "success": 1}, indent=2).encode()
+
+    json_stream = JsonStream(io.BytesIO(body), chunk_size=3)
+    chunks = list(json_stream)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == data
+    assert json_stream.values == {"meta": {"pages": [1, 2]}, "success": 1}
+    assert json_stream.bytes_read == len(body)
+
+def test_json_stream_non_ascii_output() -> None:
+    body = json.dumps({"success": 1.5, "data": "zażółć 😀"}, ensure_ascii=False).encode()
+
+    json_stream = JsonStream(io.BytesIO(body), chunk_size=1)
+
+    assert "".join(json_stream) == "zażółć 😀"
+    assert json_stream.values == {"success": 1.5}
+
+@pytest.mark.parametrize(("body", "expected_data", "expected_values"), [
+    ("{}", "", {}),
+    ('{"success": 0, "error": "Authentication failed"}', "", {"success": 0, "error": "Authentication failed"}),
+    ('{"data": null}', "", {"data": None}),
+])
+def test_json_stream_without_streamed_field(body: str, expected_data: str, expected_values: dict[str, object]) -> None:
+    json_stream = JsonStream(io.BytesIO(body.encode()), chunk_size=2)
+
+    assert "".join(json_stream) == expected_data
+    assert json_stream.values == expected_values
+
+@pytest.mark.parametrize(("body", "message"), [
+    ("", "Expected '{'"),
+    ('{"success" 1}', "Expected ':'"),
+    ('{"success": 1 "data": ""}', "Expected ','"),
+    ('{"data": "abc', "Unterminated JSON string"),
+    ('{"data": "a\\x"}', "Unterminated JSON string"),
+    ('{"data": "a\\xyzabc"}', "Invalid JSON string escape"),
+    ('{"data": "a\x01b"}', "Invalid control character"),
+    ("{1: 2}", "Invalid JSON key"),
+    ('{"success": tru}', "Invalid JSON value"),
+])
+def test_json_stream_invalid(body: str, message: str) -> None:
+    json_stream = JsonStream(io.BytesIO(body.encode()), chunk_size=2)
+
+    with pytest.raises(ValueError, match=message):
+        list(json_stream)
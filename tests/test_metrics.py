@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from enea_client.utils.metrics import Metrics
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def test_metrics_stages_and_dates() -> None:
+    metrics = Metrics()
+
+    with metrics.stage("sanitize"):
+        pass
+
+    metrics.record("sanitize", 0.5)
+    metrics.add("bytes", 100, "pod-1", "09.2025")
+    metrics.add("bytes", 50, "pod-1", "09.2025")
+
+    rows = "".join(metrics.count_rows(['Data;"header"\n"2025-09-01 00:59";"0.5"\n', '"2025-09-01 01:59";"0.5"\n'],
+                                      "pod-1", "09.2025"))
+
+    summary = metrics.summary()
+    assert summary["stages"]["sanitize"]["count"] == 2
+    assert summary["stages"]["sanitize"]["seconds"] >= 0.5
+    assert summary["dates"] == {"pod-1": {"09.2025": {"bytes": 150, "rows": 2}}}
+    assert rows.count("\n") == 3
+
+    metrics.reset()
+    assert metrics.summary()["stages"] == {}
+
+def test_metrics_timed_excludes_consumer() -> None:
+    metrics = Metrics()
+
+    def items() -> Iterator[str]:
+        yield "first"
+        yield "second"
+
+    with patch("enea_client.utils.metrics.time.perf_counter", side_effect=[0.0, 1.0, 1.0, 2.0, 5.0, 6.0]):
+        assert list(metrics.timed("body_read", items())) == ["first", "second"]
+
+    assert metrics.summary()["stages"]["body_read"] == {"count": 1, "seconds": 3.0}
+
+def test_metrics_save(tmp_path: Path) -> None:
+    metrics = Metrics()
+    metrics.record("request", 0.25)
+    metrics.add("bytes", 100, "pod-1", "09.2025")
+
+    summary_file = tmp_path / "summary.json"
+    prometheus_file = tmp_path / "enea_client.prom"
+    metrics.save(str(summary_file), str(prometheus_file))
+
+    summary = json.loads(summary_file.read_text(encoding="utf-8"))
+    assert summary["stages"] == {"request": {"count": 1, "seconds": 0.25}}
+
+    prometheus = prometheus_file.read_text(encoding="utf-8")
+    assert 'enea_client_stage_duration_seconds{stage="request"} 0.25\n' in prometheus
+    assert 'enea_client_stage_count{stage="request"} 1\n' in prometheus
+    assert 'enea_client_month_bytes{pod="pod-1",date="09.2025"} 100\n' in prometheus
+    assert "# TYPE enea_client_month_rows gauge\n" in prometheus
+    assert "enea_client_month_rows{" not in prometheus
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["enea_client.prom", "summary.json"]
+
+    # Nothing is written without files
+    metrics.save(None, None)
@@ -0,0 +1,52 @@
+import logging
+from datetime import date
+
+import pytest
+from pytest import LogCaptureFixture
+
+from enea_client.utils.month import format_month, is_closed, last_hour, parse_month, plan_dates
+
+
+def test_parse_and_format_month() -> None:
+    assert parse_month("09.2025") == (2025, 9)
+    assert format_month(2025, 9) == "09.2025"
+
+def test_is_closed() -> None:
+    assert is_closed("12.2025", date(2026, 1, 1)) is True
+    assert is_closed("01.2026", date(2026, 1, 31)) is False
+    assert is_closed("02.2026", date(2026, 1, 31)) is False
+
+def test_last_hour() -> None:
+    assert last_hour("02.2024") == "2024-02-29 23:59"
+    assert last_hour("09.2025") == "2025-09-30 23:59"
+
+def test_plan_dates(caplog: LogCaptureFixture) -> None:
+    today = date(2026, 2, 10)
+
+    assert plan_dates(["01.2026", "11.2025..01.2026", " 12.2025"], today) == ["11.2025", "12.2025", "01.2026"]
+    assert plan_dates(["last:3"], today) == ["12.2025", "01.2026", "02.2026"]
+    assert plan_dates(["last:1200"], today)[0] == "03.1926"
+    assert plan_dates(["last:1", "since:2025-12-31"], today) == ["12.2025", "01.2026", "02.2026"]
+    assert plan_dates(["12.2024..01.2025"], today) == ["12.2024", "01.2025"]
+    assert plan_dates([], today) == []
+
+    with caplog.at_level(logging.INFO):
+        assert plan_dates(["01.2026..04.2026"], today) == ["01.2026", "02.2026"]
+
+    assert "Skipping future months: 03.2026, 04.2026" in caplog.text
+
+@pytest.mark.parametrize(("expression", "message"), [
+    ("13.2025", "expected MM.YYYY"),
+    ("9.2025", "expected MM.YYYY"),
+    ("01.2025..", "expected MM.YYYY"),
+    ("03.2025..01.2025", "the range ends before it starts"),
+    ("last:0", "expected last:N"),
+    ("last:x", "expected last:N"),
+    ("last:1201", "expected last:N with N from 1 to 1200"),
+    ("last:99999999", "expected last:N with N from 1 to 1200"),
+    ("since:2025-13-01", "expected since:YYYY-MM-DD"),
+    ("since:2026-03-01", "the date is after the current month"),
+])
+def test_plan_dates_invalid(expression: str, message: str) -> None:
+    with pytest.raises(ValueError, match=f"Invalid date expression: {expression}, {message}"):
+        plan_dates([expression], date(2026, 2, 10))
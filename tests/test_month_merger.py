@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import date
+from zoneinfo import ZoneInfo
+
+from enea_client.utils.month_merger import MonthMerger
+
+TIMEZONE = ZoneInfo("Europe/Warsaw")
+HEADER = 'Data;"Wolumen energii elektrycznej pobranej z\nsieci przed bilansowaniem godzinowym"'
+
+
+def day_data(day: str, hours: int = 24) -> str:
+    rows = [f'"{day} {hour:02d}:59";"0.5";"0";"0.5";"0"' for hour in range(hours)]
+
+    return "\n".join([HEADER, *rows])
+
+def test_month_merger_appends_and_replaces_days() -> None:
+    month_data = "\n".join([day_data("2025-09-01"), *day_data("2025-09-02", 10).splitlines()[2:]]) + "\n"
+
+    result = MonthMerger.call(month_data, [day_data("2025-09-02"), day_data("2025-09-03", 5)], TIMEZONE)
+
+    assert result is not None
+    assert result.startswith(HEADER + '\n"2025-09-01 00:59"')
+    assert result.endswith('"2025-09-03 04:59";"0.5";"0";"0.5";"0"\n')
+    assert result.count("2025-09-02 ") == 24
+    assert result.count("2025-09-03 ") == 5
+
+def test_month_merger_keeps_footer() -> None:
+    month_data = day_data("2025-09-01") + "\nSuma;12;0;12;0\n"
+
+    result = MonthMerger.call(month_data, [day_data("2025-09-02", 5)], TIMEZONE)
+
+    assert result is not None
+    assert result.endswith('"2025-09-02 04:59";"0.5";"0";"0.5";"0"\nSuma;12;0;12;0\n')
+
+    # The footer of the newest download replaces the older one
+    result = MonthMerger.call(month_data, [day_data("2025-09-02", 5) + "\nSuma;14,5;0;14,5;0"], TIMEZONE)
+
+    assert result is not None
+    assert result.endswith('"2025-09-02 04:59";"0.5";"0";"0.5";"0"\nSuma;14,5;0;14,5;0\n')
+    assert result.count("Suma") == 1
+
+def test_month_merger_detects_gaps() -> None:
+    month_data = day_data("2025-09-01")
+
+    # Missing day
+    assert MonthMerger.call(month_data, [day_data("2025-09-03")], TIMEZONE) is None
+
+    # Missing hours before the newest day
+    assert MonthMerger.call(month_data, [day_data("2025-09-02", 20), day_data("2025-09-03")], TIMEZONE) is None
+
+    # Month file not starting on the first day
+    assert MonthMerger.call(day_data("2025-09-02"), [], TIMEZONE) is None
+
+def test_month_merger_without_rows() -> None:
+    assert MonthMerger.call(HEADER, [HEADER], TIMEZONE) == HEADER
+
+def test_month_merger_hours_in_day() -> None:
+    assert MonthMerger.hours_in_day(date(2025, 3, 30), TIMEZONE) == 23
+    assert MonthMerger.hours_in_day(date(2025, 9, 1), TIMEZONE) == 24
+    assert MonthMerger.hours_in_day(date(2025, 10, 26), TIMEZONE) == 25
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from enea_client.utils.parser import HourlyData, Parser
+from enea_client.utils.time_normalizer import HOUR
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+
+TIMEZONE = ZoneInfo("Europe/Warsaw")
+DATA = (
+    'Data;"Wolumen energii elektrycznej pobranej z\n'
+    'sieci przed bilansowaniem godzinowym";"Wolumen"\n'
+    '"2025-09-30 22:59";"0.5";"0";"0.5";"0"\n'
+    '"2025-09-30 23:59";"1.5";"0.25";"1.25";"0"\n'
+    '"2025-10-01 00:59";"0.75";"1";"0";"0.25"\n'
+    '"2025-10-01 02:59";"1";"0";"1";"0"'
+)
+
+
+def epoch(year: int, month: int, day: int, hour: int) -> int:
+    return int(datetime(year, month, day, hour, tzinfo=TIMEZONE).timestamp())
+
+def test_parser_call() -> None:
+    hourly_data = Parser.call(DATA, TIMEZONE)
+
+    assert len(hourly_data) == 4
+    assert hourly_data.timestamps.typecode == "q"
+    assert hourly_data.import_before.typecode == "d"
+    assert list(hourly_data.timestamps) == [
+        epoch(2025, 9, 30, 22), epoch(2025, 9, 30, 23), epoch(2025, 10, 1, 0), epoch(2025, 10, 1, 2),
+    ]
+    assert hourly_data.volumes(1) == (1.5, 0.25, 1.25, 0.0)
+
+def test_parser_call_lines_and_invalid_rows(caplog: LogCaptureFixture) -> None:
+    lines = [
+        '"2025-09-30 22:59";"0.5";"0";"0.5";"0"\n',
+        '"2025-09-30 23:59";"n/a";"0";"0";"0"\n',
+        '"2025-10-01 00:59";"1"\n',
+    ]
+
+    with caplog.at_level(logging.WARNING):
+        hourly_data = Parser.call(lines, TIMEZONE)
+
+    assert len(hourly_data) == 1
+    assert 'Skipping invalid row: "2025-09-30 23:59";"n/a";"0";"0";"0"' in caplog.text
+    assert 'Skipping invalid row: "2025-10-01 00:59";"1"' in caplog.text
+
+def test_hourly_data_index() -> None:
+    hourly_data = Parser.call(DATA, TIMEZONE)
+
+    assert hourly_data.index(epoch(2025, 9, 30, 23)) == 1
+    assert hourly_data.index(epoch(2025, 10, 1, 2)) == 3
+    assert hourly_data.index(epoch(2025, 10, 1, 1)) is None
+    assert hourly_data.index(epoch(2025, 10, 2, 1)) is None
+    assert HourlyData(TIMEZONE).index(0) is None
+
+def test_hourly_data_slice() -> None:
+    hourly_data = Parser.call(DATA, TIMEZONE)
+
+    result = hourly_data.slice(epoch(2025, 9, 30, 23), epoch(2025, 10, 1, 2))
+
+    assert list(result.timestamps) == [epoch(2025, 9, 30, 23), epoch(2025, 10, 1, 0)]
+    assert list(result.export_after) == [0.0, 0.25]
+    assert result.index(epoch(2025, 10, 1, 0)) == 1
+
+def test_hourly_data_sums() -> None:
+    hourly_data = Parser.call(DATA, TIMEZONE)
+
+    assert hourly_data.sum_by_day() == {
+        "2025-09-30": (2.0, 0.25, 1.75, 0.0),
+        "2025-10-01": (1.75, 1.0, 1.0, 0.25),
+    }
+    assert hourly_data.sum_by_month() == {
+        "09.2025": (2.0, 0.25, 1.75, 0.0),
+        "10.2025": (1.75, 1.0, 1.0, 0.25),
+    }
+
+def test_hourly_data_extend() -> None:
+    hourly_data = Parser.call(DATA, TIMEZONE)
+    other = HourlyData(TIMEZONE)
+    other.append(epoch(2025, 10, 1, 3), (1.0, 2.0, 3.0, 4.0))
+
+    hourly_data.extend(other)
+
+    assert len(hourly_data) == 5
+    assert hourly_data.index(hourly_data.timestamps[3] + HOUR) == 4
+    assert hourly_data.volumes(4) == (1.0, 2.0, 3.0, 4.0)
+
+def test_parser_call_dst_transitions(caplog: LogCaptureFixture) -> None:
+    fall_day = "\n".join(
+        f'"2025-10-26 {hour:02d}:59";"1";"0";"1";"0"' for hour in [0, 1, 2, 2, *range(3, 24)]
+    )
+    spring_day = "\n".join(f'"2025-03-30 {hour:02d}:59";"1";"0";"1";"0"' for hour in range(24))
+
+    fall_data = Parser.call(fall_day, TIMEZONE)
+
+    assert len(fall_data) == 25
+    assert all(later - earlier == HOUR for earlier, later in zip(fall_data.timestamps, fall_data.timestamps[1:]))
+    assert fall_data.sum_by_day() == {"2025-10-26": (25.0, 0.0, 25.0, 0.0)}
+
+    with caplog.at_level(logging.WARNING):
+        spring_data = Parser.call(spring_day, TIMEZONE)
+
+    assert len(spring_data) == 23
+    assert 'Skipping row with nonexistent local hour: "2025-03-30 02:59"' in caplog.text
+
+def test_parser_tap() -> None:
+    pieces = ['Data;"header"\n"2025-09-30 22:59";"0.5";"0";"0.5";"0"\n', '"2025-09-30 23:59";"1.5";"0.25";"1.25";"0"']
+    hourly_data = HourlyData(TIMEZONE)
+
+    assert list(Parser.tap(pieces, hourly_data)) == pieces
+    assert list(hourly_data.timestamps) == [epoch(2025, 9, 30, 22), epoch(2025, 9, 30, 23)]
+    assert hourly_data.volumes(1) == (1.5, 0.25, 1.25, 0.0)
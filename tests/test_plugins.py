@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+
+from enea_client.app import DateResult
+from enea_client.utils.metrics import Metrics
+from enea_client.utils.plugins import Plugin, PluginRunner, ScriptPlugin, load_plugin, load_plugins
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pytest import LogCaptureFixture
+
+    from enea_client.config import Config
+
+class CollectingPlugin(Plugin):
+    def __init__(self, config: Config) -> None:
+        super().__init__(config)
+        self.dates: list[str] = []
+
+    def call(self, results: Iterator[DateResult]) -> None:
+        self.dates.extend(result.date for result in results)
+
+class FailingPlugin(Plugin):
+    def call(self, results: Iterator[DateResult]) -> None:
+        next(results)
+        msg = "plugin failed"
+        raise ValueError(msg)
+
+def test_load_plugins(config: Config) -> None:
+    assert load_plugins(config) == []
+
+    config.post_process_script = "/path/to/script.sh"
+    config.plugins = [f"{__name__}:CollectingPlugin"]
+    plugins = load_plugins(config)
+
+    # The post-processing script runs first
+    assert [type(plugin) for plugin in plugins] == [ScriptPlugin, CollectingPlugin]
+    assert plugins[1].config is config
+
+def test_load_plugin_from_entry_point() -> None:
+    entry_points = [
+        EntryPoint("collecting", f"{__name__}:FailingPlugin", "other.plugins"),
+        EntryPoint("collecting", f"{__name__}:CollectingPlugin", "enea_client.plugins"),
+    ]
+
+    with patch("importlib.metadata.distributions", return_value=[Mock(entry_points=entry_points)]):
+        assert load_plugin("collecting") is CollectingPlugin
+
+        with pytest.raises(ValueError, match="Unknown plugin: missing, expected an entry point"):
+            load_plugin("missing")
+
+@pytest.mark.parametrize("name", ["enea_client.missing:Plugin", f"{__name__}:MissingPlugin"])
+def test_load_plugin_invalid_module_path(name: str) -> None:
+    with pytest.raises(ValueError, match=re.escape(f"Cannot load plugin {name}")):
+        load_plugin(name)
+
+def test_plugin_requires_call(config: Config) -> None:
+    with pytest.raises(TypeError, match="abstract"):
+        Plugin(config) # type: ignore[abstract]
+
+def test_plugin_runner(config: Config, caplog: LogCaptureFixture) -> None:
+    metrics = Metrics()
+    collecting_plugin = CollectingPlugin(config)
+    plugin_runner = PluginRunner([FailingPlugin(config), collecting_plugin], metrics)
+
+    for date in ("09.2025", "10.2025"):
+        plugin_runner.put(DateResult(date, Path(config.output_dir) / f"{date}.csv"))
+
+    # A failing plugin does not stop the others, its error is raised once all are done
+    with caplog.at_level(logging.ERROR), pytest.raises(ValueError, match="plugin failed"):
+        plugin_runner.close()
+
+    assert collecting_plugin.dates == ["09.2025", "10.2025"]
+    assert "Plugin failed: FailingPlugin, error - plugin failed" in caplog.text
+    assert metrics.stages["post_process"]["count"] == 2
+
+def test_plugin_runner_times_plugin_calls_only(config: Config) -> None:
+    metrics = Metrics()
+    plugin_runner = PluginRunner([CollectingPlugin(config)], metrics)
+
+    # Waiting for results is not counted as post-processing
+    time.sleep(0.2)
+    plugin_runner.put(DateResult("09.2025", Path(config.output_dir) / "09.2025.csv"))
+    time.sleep(0.2)
+    plugin_runner.close()
+
+    assert metrics.stages["post_process"]["count"] == 1
+    assert metrics.stages["post_process"]["seconds"] < 0.2
+
+@patch("subprocess.run")
+def test_script_plugin_call(mock_subprocess_run: Mock, config: Config, caplog: LogCaptureFixture) -> None:
+    config.post_process_script = "/path/to/script.sh"
+    results = [
+        DateResult("08.2025", Path("08.2025.csv")),
+        DateResult("09.2025", Path("09.2025.csv"), changed=True),
+        DateResult("10.2025"),
+    ]
+
+    # Only changed files are passed to the script
+    with caplog.at_level(logging.INFO):
+        ScriptPlugin(config).call(iter(results))
+
+    mock_subprocess_run.assert_called_once_with(["/path/to/script.sh", "09.2025.csv"], check=True)
+    assert "Running post-processing script: /path/to/script.sh" in caplog.text
+
+    mock_subprocess_run.reset_mock()
+    ScriptPlugin(config).call(iter(results[:1]))
+    mock_subprocess_run.assert_not_called()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+from enea_client.utils.request_scheduler import RequestScheduler
+
+if TYPE_CHECKING:
+    from enea_client.config import Config
+
+
+def test_request_scheduler_delays() -> None:
+    scheduler = RequestScheduler(retries=6, backoff=1, max_backoff=10)
+    delays = list(scheduler.delays())
+
+    # Full jitter within an exponentially growing, capped backoff
+    assert len(delays) == 6
+    assert all(0 <= delay <= min(10, 2 ** attempt) for attempt, delay in enumerate(delays))
+    assert list(RequestScheduler().delays()) == []
+
+def test_request_scheduler_should_retry() -> None:
+    scheduler = RequestScheduler()
+
+    assert scheduler.should_retry(429)
+    assert scheduler.should_retry(503)
+    assert not scheduler.should_retry(200)
+    assert not scheduler.should_retry(404)
+
+@patch("enea_client.utils.request_scheduler.time.sleep")
+@patch("enea_client.utils.request_scheduler.time.monotonic", return_value=100.0)
+def test_request_scheduler_wait(_mock_monotonic: Mock, mock_sleep: Mock) -> None:
+    scheduler = RequestScheduler(requests_per_second=4)
+
+    for _ in range(3):
+        scheduler.wait()
+
+    # The first request goes out immediately, the next ones get consecutive slots
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [0.25, 0.5]
+
+    RequestScheduler().wait()
+    assert mock_sleep.call_count == 2
+
+def test_request_scheduler_from_config(config: Config) -> None:
+    config.retries = 5
+    config.retry_backoff = 0.5
+    config.requests_per_second = 2
+
+    scheduler = RequestScheduler.from_config(config)
+
+    assert (scheduler.retries, scheduler.backoff, scheduler.interval) == (5, 0.5, 0.5)
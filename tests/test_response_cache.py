@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import io
+import logging
+import zlib
+from datetime import date
+from typing import TYPE_CHECKING
+
+import pytest
+
+from enea_client.utils.response_cache import RecordingReader, ResponseCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import LogCaptureFixture
+
+def test_response_cache_set_get_delete(tmp_path: Path) -> None:
+    response_cache = ResponseCache(str(tmp_path / "responses"))
+
+    assert response_cache.get("pod-1", "month", "09.2025") is None
+
+    response_cache.set("pod-1", "month", "09.2025", zlib.compress(b'{"success": 1}'))
+
+    assert response_cache.get("pod-1", "month", "09.2025") == b'{"success": 1}'
+    assert response_cache.get("pod-2", "month", "09.2025") is None
+    assert response_cache.file_path("pod-1", "month", "09.2025").name == "month-09.2025.json.zz"
+    assert not list((tmp_path / "responses").glob("*/.*.tmp"))
+
+    response_cache.delete("pod-1", "month", "09.2025")
+    response_cache.delete("pod-1", "month", "09.2025")
+    assert response_cache.get("pod-1", "month", "09.2025") is None
+
+def test_response_cache_ignores_corrupted_file(tmp_path: Path, caplog: LogCaptureFixture) -> None:
+    response_cache = ResponseCache(str(tmp_path))
+    response_cache.set("pod-1", "month", "09.2025", b"not compressed")
+
+    with caplog.at_level(logging.WARNING):
+        assert response_cache.get("pod-1", "month", "09.2025") is None
+
+    assert "Ignoring corrupted cached response" in caplog.text
+
+@pytest.mark.parametrize(("duration", "date_label", "settle_days", "expected"), [
+    ("month", "09.2025", 14, True),
+    ("month", "09.2025", 15, False),
+    ("month", "10.2025", 0, False),
+    ("day", "30.09.2025", 14, True),
+    ("day", "01.10.2025", 14, False),
+])
+def test_response_cache_is_settled(
+    duration: str,
+    date_label: str,
+    settle_days: int,
+    expected: bool, # noqa: FBT001
+) -> None:
+    assert ResponseCache.is_settled(duration, date_label, date(2025, 10, 15), settle_days) is expected
+
+def test_recording_reader() -> None:
+    body = b"response body" * 100
+    reader = RecordingReader(io.BytesIO(body))
+
+    assert reader.read(10) + reader.read(10000) == body
+    assert zlib.decompress(reader.compressed()) == body
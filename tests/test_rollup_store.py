@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from enea_client.utils.parser import Parser
+from enea_client.utils.rollup_store import RollupStore
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+
+    from enea_client.config import Config
+
+DATA = (
+    'Data;"header"\n'
+    '"2025-09-01 00:59";"0.5";"0";"0.5";"0"\n'
+    '"2025-09-01 12:59";"0.1";"1.2";"0";"1.1"\n'
+    '"2025-09-02 00:59";"0.25";"0";"0.25";"0"\n'
+)
+
+def test_rollup_store_rollup(config: Config) -> None:
+    total, days = RollupStore.rollup(Parser.call(DATA, config.enea_timezone))
+
+    assert total == {
+        "hours": 3,
+        "import_before": 0.85,
+        "export_before": 1.2,
+        "import_after": 0.75,
+        "export_after": 1.1,
+        "net_after": -0.35,
+    }
+    assert days["2025-09-01"]["hours"] == 2
+    assert days["2025-09-01"]["net_after"] == -0.6
+    assert days["2025-09-02"]["import_after"] == 0.25
+
+def test_rollup_store_refresh(config: Config) -> None:
+    file_path = Path(config.output_dir) / "09.2025.csv"
+    file_path.write_text(DATA, encoding="utf-8")
+
+    with patch("enea_client.utils.rollup_store.Parser.call", wraps=Parser.call) as mock_parser_call:
+        month_rollups = RollupStore(config.output_dir).refresh(config, ["08.2025", "09.2025"])
+
+        # Months without files are left out
+        assert list(month_rollups) == ["09.2025"]
+        assert month_rollups["09.2025"]["total"]["hours"] == 3
+
+        # Cached rollups of unchanged files are reused by later runs
+        assert RollupStore(config.output_dir).refresh(config, ["09.2025"]) == month_rollups
+        assert mock_parser_call.call_count == 1
+
+        # A changed file is parsed again
+        file_path.write_text(DATA + '"2025-09-02 01:59";"1";"0";"1";"0"\n', encoding="utf-8")
+        month_rollups = RollupStore(config.output_dir).refresh(config, ["09.2025"])
+
+        assert month_rollups["09.2025"]["total"]["hours"] == 4
+        assert mock_parser_call.call_count == 2
+
+    # A rollup of a removed file is outdated
+    rollup_store = RollupStore(config.output_dir)
+    file_path.unlink()
+    assert rollup_store.get(config.enea_pod_guid, "09.2025", file_path) is None
+
+def test_rollup_store_refresh_with_hourly_data(config: Config) -> None:
+    file_path = Path(config.output_dir) / "09.2025.csv"
+    file_path.write_text(DATA, encoding="utf-8")
+    hourly_data = Parser.call(DATA, config.enea_timezone)
+
+    with patch("enea_client.utils.rollup_store.Parser.call") as mock_parser_call:
+        month_rollups = RollupStore(config.output_dir).refresh(config, ["09.2025"], {"09.2025": hourly_data})
+
+    mock_parser_call.assert_not_called()
+    assert month_rollups["09.2025"]["total"]["import_after"] == 0.75
+
+def test_rollup_store_summary(config: Config) -> None:
+    for date in ("10.2025", "09.2025", "12.2024"):
+        (Path(config.output_dir) / f"{date}.csv").write_text(DATA, encoding="utf-8")
+
+    (Path(config.output_dir) / "enea_client.csv").write_text(DATA, encoding="utf-8")
+
+    # Without dates all stored months are summarized
+    config.dates = []
+    summary = json.loads(RollupStore.summary(config))
+
+    assert list(summary) == ["12.2024", "09.2025", "10.2025"]
+    assert summary["09.2025"]["total"]["net_after"] == -0.35
+    assert list(summary["09.2025"]["days"]) == ["2025-09-01", "2025-09-02"]
+
+    config.dates = ["09.2025"]
+    assert list(json.loads(RollupStore.summary(config))) == ["09.2025"]
+
+def test_rollup_store_ignores_corrupted_file(config: Config, caplog: LogCaptureFixture) -> None:
+    (Path(config.output_dir) / RollupStore.FILE_NAME).write_text("{", encoding="utf-8")
+    (Path(config.output_dir) / "09.2025.csv").write_text(DATA, encoding="utf-8")
+
+    with caplog.at_level(logging.WARNING):
+        month_rollups = RollupStore(config.output_dir).refresh(config, ["09.2025"])
+
+    assert "Ignoring corrupted rollups file" in caplog.text
+    assert month_rollups["09.2025"]["total"]["hours"] == 3
+    assert json.loads((Path(config.output_dir) / RollupStore.FILE_NAME).read_text(encoding="utf-8"))
+    assert not list(Path(config.output_dir).glob(".*.tmp"))
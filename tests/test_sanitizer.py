@@ -1,3 +1,5 @@
+import io
+
 from enea_client.utils.sanitizer import Sanitizer
 
 
@@ -21,3 +23,31 @@ def test_sanitizer_call() -> None:
     )
 
     assert result == expected
+
+def test_sanitizer_stream_matches_call() -> None:
+    data = (
+        'Data;"Wolumen energii elektrycznej pobranej z\n'
+        'sieci przed bilansowaniem godzinowym"\n'
+        '\u0000"=""2025-09-01 00:59"""\u0000;"0,507";"0";"0,507";"0"\n'
+        '\u0000"=""2025-09-01 01:59"""\u0000;"---";"---";"---";"---"\n'
+        '\u0000"=""2025-09-01 02:59"""\u0000;"0,561";"0";"0,561";"0"'
+    )
+
+    for block_size in (1, 2, 1024):
+        assert "".join(Sanitizer.stream(io.StringIO(data, newline="\n"), block_size)) == Sanitizer.call(data)
+
+    assert "".join(Sanitizer.stream(Sanitizer.chunks(data, size=10), block_size=1)) == Sanitizer.call(data)
+
+def test_sanitizer_write() -> None:
+    output = io.StringIO()
+
+    Sanitizer.write(['"2025-09-01 00:59";"0,507"\n', 'another "---" line to remove\n'], output)
+
+    assert output.getvalue() == '"2025-09-01 00:59";"0.507"\n'
+
+def test_sanitizer_align() -> None:
+    chunks = ['Data;"he', 'ader"\n"2025', '-09-01 00:59";"0,5"\n"2025-09-01 01:59"', ';"0,6"']
+
+    pieces = list(Sanitizer.align(chunks))
+
+    assert pieces == ['Data;"header"\n', '"2025-09-01 00:59";"0,5"\n', '"2025-09-01 01:59";"0,6"']
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+
+from enea_client.utils.connection import TimedHTTPSConnection
+from enea_client.utils.metrics import Metrics
+from enea_client.utils.request_scheduler import RequestScheduler
+from enea_client.utils.session import Session
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from pytest import LogCaptureFixture
+    from pytest_httpserver import HTTPServer
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: list[int] = []  # noqa: RUF012
+    drop_after_response = False
+
+    def setup(self) -> None:
+        super().setup()
+        self.connections.append(self.client_address[1])
+
+    def do_GET(self) -> None:
+        body = b"ok"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        # Simulate a server silently dropping an idle keep-alive connection
+        self.close_connection = self.drop_after_response
+
+    def log_message(self, format: str, *args: object) -> None: # noqa: A002
+        pass
+
+
+@pytest.fixture
+def keep_alive_url() -> Generator[str, None, None]:
+    KeepAliveHandler.connections = []
+    KeepAliveHandler.drop_after_response = False
+
+    server = ThreadingHTTPServer(("localhost", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+
+    yield f"http://localhost:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+def test_session_reuses_connection(keep_alive_url: str, caplog: LogCaptureFixture) -> None:
+    session = Session(keep_alive_url, 5)
+
+    with caplog.at_level(logging.DEBUG):
+        for _ in range(3):
+            with session.request("GET", "/") as response:
+                assert response.status == HTTPStatus.OK
+                assert response.read() == b"ok"
+
+    session.close()
+
+    assert len(KeepAliveHandler.connections) == 1
+    assert [timing.path for timing in session.timings] == ["/", "/", "/"]
+    assert all(timing.status == HTTPStatus.OK for timing in session.timings)
+    assert all(timing.elapsed >= 0 for timing in session.timings)
+    assert "Request GET /: status - 200, time - " in caplog.text
+
+def test_session_keeps_latest_timings(keep_alive_url: str) -> None:
+    with patch("enea_client.utils.session.MAX_TIMINGS", 2):
+        session = Session(keep_alive_url, 5)
+
+    for path in ("/first", "/second", "/third"):
+        with session.request("GET", path):
+            pass
+
+    session.close()
+
+    assert [timing.path for timing in session.timings] == ["/second", "/third"]
+
+def test_session_reconnects_when_server_closes_connection(keep_alive_url: str, caplog: LogCaptureFixture) -> None:
+    KeepAliveHandler.drop_after_response = True
+    session = Session(keep_alive_url, 5)
+
+    with caplog.at_level(logging.DEBUG):
+        for _ in range(2):
+            with session.request("GET", "/") as response:
+                assert response.status == HTTPStatus.OK
+
+    session.close()
+
+    assert len(KeepAliveHandler.connections) == 2
+    assert "Connection closed by server, reconnecting" in caplog.text
+
+def test_session_raises_on_fresh_connection_failure() -> None:
+    session = Session("http://localhost:1", 5)
+
+    with pytest.raises(ConnectionError), session.request("GET", "/"):
+        pass
+
+    session.close()
+
+@patch("enea_client.utils.session.time.sleep")
+def test_session_retries_transient_statuses(
+    mock_sleep: Mock, httpserver: HTTPServer, caplog: LogCaptureFixture,
+) -> None:
+    httpserver.expect_oneshot_request("/").respond_with_data("", status=503, headers={"Retry-After": "7"})
+    httpserver.expect_oneshot_request("/").respond_with_data("", status=502)
+    httpserver.expect_oneshot_request("/").respond_with_data("ok")
+    session = Session(httpserver.url_for(""), 5, RequestScheduler(retries=3, backoff=0.5))
+
+    with caplog.at_level(logging.WARNING), session.request("GET", "/") as response:
+        assert response.status == HTTPStatus.OK
+        assert response.read() == b"ok"
+
+    # Retry-After is honoured, other delays stay within the backoff of the attempt
+    assert mock_sleep.call_args_list[0].args[0] == 7
+    assert 0 <= mock_sleep.call_args_list[1].args[0] <= 1
+    assert "Request GET / failed: status - 503, retrying in 7.0s" in caplog.text
+
+    # Out of retries the last response is returned
+    httpserver.expect_oneshot_request("/").respond_with_data("", status=500)
+    httpserver.expect_oneshot_request("/").respond_with_data("", status=500)
+    session.scheduler = RequestScheduler(retries=1)
+
+    with session.request("GET", "/") as response:
+        assert response.status == HTTPStatus.INTERNAL_SERVER_ERROR
+
+    # Other statuses are not retried
+    httpserver.expect_oneshot_request("/").respond_with_data("", status=404)
+
+    with session.request("GET", "/") as response:
+        assert response.status == HTTPStatus.NOT_FOUND
+
+    session.close()
+    assert len(httpserver.log) == 6
+
+@patch("enea_client.utils.session.time.sleep")
+def test_session_retries_connection_errors(mock_sleep: Mock, caplog: LogCaptureFixture) -> None:
+    session = Session("http://localhost:1", 5, RequestScheduler(retries=2))
+
+    with caplog.at_level(logging.WARNING), pytest.raises(ConnectionError), session.request("GET", "/"):
+        pass
+
+    assert mock_sleep.call_count == 2
+    assert "Request GET / failed: [Errno 111] Connection refused, retrying in " in caplog.text
+
+def test_session_records_metrics(keep_alive_url: str) -> None:
+    metrics = Metrics()
+    session = Session(keep_alive_url, 5, metrics=metrics)
+
+    for _ in range(2):
+        with session.request("GET", "/") as response:
+            assert response.status == HTTPStatus.OK
+
+    session.close()
+
+    stages = metrics.summary()["stages"]
+    assert stages["connect"]["count"] == 1
+    assert stages["request"]["count"] == 2
+    assert "tls" not in stages
+
+def test_timed_https_connection_records_tls_apart_from_connect(keep_alive_url: str) -> None:
+    # A context that skips the handshake, so the TLS stage is measured over the plain test server
+    context = Mock()
+    context.wrap_socket.side_effect = lambda sock, **_kwargs: sock
+    connection = TimedHTTPSConnection("localhost", int(keep_alive_url.rsplit(":", 1)[1]), context=context)
+    connection.metrics = Metrics()
+
+    connection.connect()
+    connection.close()
+
+    stages = connection.metrics.summary()["stages"]
+    assert stages["connect"]["count"] == 1
+    assert stages["tls"]["count"] == 1
+    assert stages["tls"]["seconds"] >= 0
+    context.wrap_socket.assert_called_once()
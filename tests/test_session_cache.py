@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import logging
+import stat
+import time
+from typing import TYPE_CHECKING
+
+from enea_client.utils.session_cache import SessionCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import LogCaptureFixture
+
+
+def test_session_cache_set_get_delete(tmp_path: Path) -> None:
+    path = tmp_path / "session.json"
+    session_cache = SessionCache(str(path))
+
+    assert session_cache.get("login") is None
+
+    session_cache.set("login", "SESSION=signed; Path=/; HttpOnly")
+    session_cache.set("expired", "SESSION=expired; Max-Age=0")
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert SessionCache(str(path)).get("login") == "SESSION=signed; Path=/; HttpOnly"
+    assert session_cache.get("expired") is None
+
+    session_cache.delete("login")
+    session_cache.delete("missing")
+
+    assert session_cache.get("login") is None
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["session.json"]
+
+def test_session_cache_expires_at() -> None:
+    now = time.time()
+
+    assert SessionCache.expires_at("SESSION=signed; Max-Age=60", now) == now + 60
+    assert SessionCache.expires_at("SESSION=signed; expires=Wed, 21 Oct 2026 07:28:00 GMT", now) == 1792567680
+    assert SessionCache.expires_at("SESSION=signed; Path=/", now) == now + SessionCache.DEFAULT_TTL
+    assert SessionCache.expires_at("SESSION=signed; Max-Age=soon", now) == now + SessionCache.DEFAULT_TTL
+
+def test_session_cache_corrupted(tmp_path: Path, caplog: LogCaptureFixture) -> None:
+    path = tmp_path / "session.json"
+    path.write_text("{", encoding="utf-8")
+
+    with caplog.at_level(logging.WARNING):
+        assert SessionCache(str(path)).get("login") is None
+
+    assert f"Ignoring corrupted session cache: {path}" in caplog.text
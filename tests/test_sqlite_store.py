@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from enea_client.utils.parser import HourlyData
+from enea_client.utils.sqlite_store import SqliteStore
+from enea_client.utils.time_normalizer import HOUR
+
+if TYPE_CHECKING:
+    from enea_client.config import Config
+
+TIMEZONE = ZoneInfo("Europe/Warsaw")
+START = 1759269600 # 2025-10-01 00:00 in Europe/Warsaw
+
+
+def hourly_data(hours: int, volume: float) -> HourlyData:
+    result = HourlyData(TIMEZONE)
+
+    for hour in range(hours):
+        result.append(START + hour * HOUR, (volume, 0.0, volume, float(hour)))
+
+    return result
+
+def test_sqlite_store_call_upserts(config: Config) -> None:
+    path = SqliteStore.call(config, hourly_data(3, 0.5))
+
+    # Saving the month again replaces its hours instead of duplicating them
+    assert SqliteStore.call(config, hourly_data(4, 1.5)) == path
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM hourly").fetchone() == (4,)
+
+    config.enea_pod_guid = "other-pod"
+    SqliteStore.call(config, hourly_data(2, 2.0))
+
+    result = SqliteStore.read(path, "test-pod-guid-123", START + HOUR, START + 3 * HOUR, TIMEZONE)
+
+    assert list(result.timestamps) == [START + HOUR, START + 2 * HOUR]
+    assert result.volumes(1) == (1.5, 0.0, 1.5, 2.0)
+    assert len(SqliteStore.read(path, "other-pod", START, START + 10 * HOUR, TIMEZONE)) == 2
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules that only the stages of a run need
+HEAVY_MODULES = ("enea_client.app", "http.client", "ssl", "json", "zoneinfo", "subprocess", "sqlite3")
+
+def imported_modules(*args: str) -> set[str]:
+    """Names of the modules imported by python -X importtime with args.
+
+    Only the names are compared, import times vary from run to run.
+    """
+    result = subprocess.run( # noqa: S603
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        check=False,
+        cwd=Path(__file__).parent.parent,
+        text=True,
+    )
+
+    return {
+        line.rpartition("|")[2].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+
+@pytest.mark.parametrize("args", [["--help"], ["--dates", "09.2025"]])
+def test_startup_defers_heavy_modules(args: list[str]) -> None:
+    # Help and invalid arguments are handled before the application is imported
+    modules = imported_modules("-m", "enea_client", *args)
+
+    assert {"argparse", "enea_client.choices"} <= modules
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+
+def test_startup_app_defers_modules_of_optional_stages() -> None:
+    modules = imported_modules("-c", "import enea_client.app")
+
+    assert "http.client" in modules
+    assert [
+        name for name in (
+            "subprocess",
+            "sqlite3",
+            "concurrent.futures",
+            "enea_client.utils.home_assistant",
+            "enea_client.utils.sqlite_store",
+            "enea_client.utils.binary_store",
+            "enea_client.utils.plugins",
+        )
+        if name in modules
+    ] == []
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from enea_client.utils.state_store import MonthStateBuilder, StateStore
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import LogCaptureFixture
+
+
+def test_state_store_save_and_load(tmp_path: Path) -> None:
+    state_store = StateStore(str(tmp_path))
+    month_state = StateStore.month_state('Data;"header"\n"2025-09-01 00:59";"0.507"\n"2025-09-01 01:59";"0.503"\n')
+
+    assert state_store.get("pod", "09.2025") is None
+
+    state_store.set("pod", "09.2025", month_state)
+    state_store.save()
+
+    assert (tmp_path / StateStore.FILE_NAME).exists()
+    assert StateStore(str(tmp_path)).get("pod", "09.2025") == month_state
+    assert month_state["last_timestamp"] == "2025-09-01 01:59"
+    assert len(month_state["sha256"]) == 64
+
+def test_state_store_corrupted_file(tmp_path: Path, caplog: LogCaptureFixture) -> None:
+    (tmp_path / StateStore.FILE_NAME).write_text("{", encoding="utf-8")
+
+    with caplog.at_level(logging.WARNING):
+        state_store = StateStore(str(tmp_path))
+
+    assert state_store.get("pod", "09.2025") is None
+    assert "Ignoring corrupted state file" in caplog.text
+
+def test_state_store_last_timestamp_without_rows() -> None:
+    assert StateStore.last_timestamp('Data;"header"\n') == ""
+
+def test_month_state_builder_matches_month_state() -> None:
+    pieces = ['Data;"header"\n', '"2025-09-01 00:59";"0.507"\n', '"2025-09-01 01:59";"0.503"\n']
+    month_state_builder = MonthStateBuilder()
+
+    assert list(month_state_builder.tap(pieces)) == pieces
+    assert month_state_builder.month_state() == StateStore.month_state("".join(pieces))
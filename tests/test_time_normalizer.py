@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from enea_client.utils.time_normalizer import TimeNormalizer
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+
+TIMEZONE = ZoneInfo("Europe/Warsaw")
+
+
+def utc(year: int, month: int, day: int, hour: int) -> int:
+    return int(datetime(year, month, day, hour, tzinfo=timezone.utc).timestamp())
+
+def test_time_normalizer_table() -> None:
+    time_normalizer = TimeNormalizer(TIMEZONE)
+
+    assert [offset for _, _, offset in time_normalizer.table(2025, 9)] == [7200]
+    assert time_normalizer.table(2025, 10) == [
+        (utc(2025, 9, 30, 0), utc(2025, 10, 26, 1), 7200),
+        (utc(2025, 10, 26, 1), utc(2025, 11, 2, 0), 3600),
+    ]
+    assert [offset for _, _, offset in time_normalizer.table(2025, 12)] == [3600]
+
+def test_time_normalizer_repeated_hour() -> None:
+    time_normalizer = TimeNormalizer(TIMEZONE)
+
+    assert time_normalizer.normalize("2025-10-26 01:59") == (utc(2025, 10, 25, 23), 7200)
+    assert time_normalizer.normalize("2025-10-26 02:59") == (utc(2025, 10, 26, 0), 7200)
+    assert time_normalizer.normalize("2025-10-26 02:59") == (utc(2025, 10, 26, 1), 3600)
+    assert time_normalizer.normalize("2025-10-26 03:59") == (utc(2025, 10, 26, 2), 3600)
+
+def test_time_normalizer_missing_hour(caplog: LogCaptureFixture) -> None:
+    time_normalizer = TimeNormalizer(TIMEZONE)
+
+    assert time_normalizer.normalize("2025-03-30 01:59") == (utc(2025, 3, 30, 0), 3600)
+    assert time_normalizer.normalize("2025-03-30 02:59") is None
+    assert time_normalizer.normalize("2025-03-30 03:59") == (utc(2025, 3, 30, 1), 7200)
+
+    with caplog.at_level(logging.WARNING):
+        assert time_normalizer.isoformat("2025-03-30 02:59") == ""
+
+    assert "Nonexistent local hour: 2025-03-30 02:59" in caplog.text
+
+def test_time_normalizer_isoformat() -> None:
+    assert TimeNormalizer(TIMEZONE).isoformat("2026-01-01 00:59") == "2026-01-01T00:00+01:00"
+    assert TimeNormalizer(ZoneInfo("America/St_Johns")).isoformat("2026-01-01 00:59") == "2026-01-01T00:00-03:30"
+
+def test_time_normalizer_stream() -> None:
+    pieces = [
+        'Data;"Wolumen energii elektrycznej pobranej z\n',
+        'sieci przed bilansowaniem godzinowym";"Wolumen"\n"2025-10-26 02:59";"0.5"\n',
+        '"2025-10-26 02:59";"0.25"\n"2025-10-26 03:59";"0"',
+    ]
+
+    assert "".join(TimeNormalizer(TIMEZONE).stream(pieces)) == (
+        'Data;"Wolumen energii elektrycznej pobranej z\n'
+        'sieci przed bilansowaniem godzinowym";"Wolumen";"Data (ISO 8601)"\n'
+        '"2025-10-26 02:59";"0.5";"2025-10-26T02:00+02:00"\n'
+        '"2025-10-26 02:59";"0.25";"2025-10-26T02:00+01:00"\n'
+        '"2025-10-26 03:59";"0";"2025-10-26T03:00+01:00"'
+    )
+
+def test_time_normalizer_stream_without_header_or_rows() -> None:
+    assert "".join(TimeNormalizer(TIMEZONE).stream(['"2026-01-01 00:59";"0.5"\n'])) == (
+        '"2026-01-01 00:59";"0.5";"2026-01-01T00:00+01:00"\n'
+    )
+    assert "".join(TimeNormalizer(TIMEZONE).stream(['Data;"header"\n'])) == 'Data;"header"\n'